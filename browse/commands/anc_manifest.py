@@ -0,0 +1,40 @@
+"""Fills the ancillary file lists of papers ahead of requests.
+
+See `browse.services.dissemination.anc_manifest`."""
+from typing import List, Optional, TextIO
+
+import click
+from flask import Blueprint, current_app
+
+from browse.services.dissemination import get_article_store
+from browse.services.documents import get_doc_service
+
+bp = Blueprint("anc_manifest", __name__)
+
+
+@bp.cli.command("backfill", short_help="records ancillary file lists in ANCILLARY_MANIFEST_PATH")
+@click.argument("ids", nargs=-1)
+@click.option("--ids-file", type=click.File("r"), default=None,
+              help="File with an arXiv id on each line.")
+def backfill(ids: List[str], ids_file: Optional[TextIO]) -> None:
+    """Lists the ancillary files of the papers IDS and records them.
+
+    IDS are arXiv ids, with a version for a version other than the latest.
+    Papers without ancillary files are skipped."""
+    if not current_app.config.get("ANCILLARY_MANIFEST_PATH"):
+        raise ValueError("ANCILLARY_MANIFEST_PATH must be set.")
+    ids = list(ids)
+    if ids_file is not None:
+        ids.extend(line.strip() for line in ids_file if line.strip())
+    if not ids:
+        raise ValueError("ids must not be empty.")
+
+    store = get_article_store()
+    listed = 0
+    for arxiv_id, docmeta in get_doc_service().get_abs_many(ids).items():
+        if isinstance(docmeta, Exception):
+            print(f"Skipped {arxiv_id}: {docmeta}")
+            continue
+        if store.get_ancillary_files(docmeta):
+            listed += 1
+    print(f"Recorded ancillary files of {listed} papers.")
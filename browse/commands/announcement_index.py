@@ -0,0 +1,47 @@
+"""Builds the index of /new, /recent and catchup listings.
+
+See `browse.services.database.announcement_index`."""
+from datetime import date
+from typing import List, Optional
+
+import click
+from flask import Blueprint, current_app
+
+from arxiv.taxonomy.definitions import ARCHIVES, CATEGORIES, GROUPS
+
+from browse.services.database.catchup import get_latest_announce_day, rebuild_catchup
+from browse.services.database.listings import rebuild_announcements
+
+bp = Blueprint("announcement_index", __name__)
+
+
+@bp.cli.command("rebuild", short_help="builds the listings of the latest mailing into ANNOUNCEMENT_INDEX_PATH")
+@click.argument("subjects", nargs=-1)
+@click.option("--catchup-day", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Day of the catchup listings to build, defaults to the latest mailing.")
+def rebuild(subjects: List[str], catchup_day: Optional[date]) -> None:
+    """Builds the new, recent and catchup listings of the latest mailing for SUBJECTS.
+
+    SUBJECTS are archives and categories like `math` or `cs.AI`, all active
+    ones if not given. Run this after each publish."""
+    if not current_app.config.get("ANNOUNCEMENT_INDEX_PATH"):
+        raise ValueError("ANNOUNCEMENT_INDEX_PATH must be set.")
+
+    all_subjects = not subjects
+    if all_subjects:
+        subjects = [id for id, subject in {**ARCHIVES, **CATEGORIES}.items()
+                    if subject.is_active and id == subject.canonical_id]
+    day = catchup_day.date() if catchup_day else get_latest_announce_day()  # type: ignore
+    catchup_subjects = [ARCHIVES.get(id) or CATEGORIES.get(id) for id in subjects]
+    if all_subjects:
+        catchup_subjects += [group for group in GROUPS.values() if group.is_active]
+
+    for id in subjects:
+        rebuild_announcements(id)
+    built = 0
+    if day:
+        built = sum(rebuild_catchup(subject, day) for subject in catchup_subjects if subject)
+    print(f"Built the listings of the latest mailing for {len(subjects)} subjects"
+          f" and {built} catchup listings of {day}.")
+    if day and not built:
+        print(f"The mailing of {day} is not written yet, its catchup listings are built by each request.")
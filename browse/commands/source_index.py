@@ -0,0 +1,30 @@
+"""Builds the index of source file locations.
+
+See `browse.services.dissemination.source_index`."""
+from typing import List
+
+import click
+from flask import Blueprint, current_app
+
+from browse.services.dissemination.source_index import SqliteSourceIndex, build_source_index
+from browse.services.global_object_store import get_global_object_store
+
+bp = Blueprint("source_index", __name__)
+
+
+@bp.cli.command("build", short_help="records source file locations in SOURCE_INDEX_PATH")
+@click.argument("prefixes", nargs=-1)
+def build(prefixes: List[str]) -> None:
+    """Scans the source store under PREFIXES and records the source files found.
+
+    PREFIXES are key prefixes like `ftp/arxiv/papers/2101/` or `orig/arxiv/papers/2101/`."""
+    if not prefixes:
+        raise ValueError("prefixes must not be empty.")
+    path = current_app.config.get("SOURCE_INDEX_PATH")
+    if not path:
+        raise ValueError("SOURCE_INDEX_PATH must be set.")
+
+    index = SqliteSourceIndex(path)
+    objstore = get_global_object_store(current_app.config["SOURCE_STORAGE_PREFIX"], "_source_store")
+    count = build_source_index(index, objstore, prefixes)
+    print(f"Recorded {count} source locations, {len(index)} in index.")
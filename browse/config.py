@@ -48,6 +48,17 @@ class Settings(arxiv_base.Settings):
     SQLALCHEMY_MAX_OVERFLOW: Optional[int] = 0
     """Ignored under sqlite."""
 
+    WARM_UP_ON_START: bool = False
+    """Warm up the doc, listing and dissemination services, the DB connection
+    pool and the templates in `create_web_app()`, before the app takes
+    traffic.
+
+    The time of each part of the startup is logged, and the `/ready` route
+    answers 503 until the warm up is done and worked."""
+
+    WARM_UP_DB_CONNECTIONS: int = 2
+    """Number of connections to open in each DB pool during the warm up."""
+
     BROWSE_DISABLE_DATABASE: bool = False
     """Disable DB queries even if other SQLAlchemy config are defined
     This, for example, could be used in conjunction with the
@@ -79,6 +90,32 @@ class Settings(arxiv_base.Settings):
 
     The cache-control: max-age to set for /abs pages. Max for this in the RFC is one year."""
 
+    ABS_NON_CRITICAL_TIMEOUT: float = 2.0
+    """Deadline in seconds for each of the non-critical /abs lookups.
+
+    The DBLP, trackback, ancillary file and DataCite lookups for the abs page are
+    run concurrently. Any lookup that takes longer than this is dropped and the
+    page is rendered with its default value."""
+
+    FAN_OUT_MAX_WORKERS: int = 16
+    """Size of the per-process thread pool used for concurrent lookups.
+
+    Set to 0 to run the lookups serially on the request thread."""
+
+    FAN_OUT_MAX_ABANDONED: int = 4
+    """Max number of lookups of one name, like the DBLP lookup of the abs page,
+    that may still be running after missing their deadline.
+
+    Past this the lookup is not run and its default is used until some of them
+    finish, so a hung dependency can't take all the threads of the pool."""
+
+    ABS_MANY_MAX_IN_FLIGHT: int = 4
+    """Max number of .abs files one bulk metadata lookup of the file system
+    `DocMetadataService` reads at once on the fan-out thread pool.
+
+    Author and proceedings pages can list hundreds of papers, this keeps one
+    such page from taking all the threads of the pool."""
+
     FILE_CACHE_MAX_AGE: int = 365 * DAY
     """PDF, src, e-print cache in seconds.
 
@@ -130,6 +167,80 @@ class Settings(arxiv_base.Settings):
     This can start with gs:// to use Google Storage.
     Ex gs://arxiv-production-data/ftp."""
 
+    LISTING_MONTH_CACHE_SIZE: int = 64
+    """Max number of parsed monthly listing files to keep in each process for the
+    month and year pages of `fs_listing`. 0 to disable.
+
+    Entries are checked against the listing file's updated time before use."""
+
+    LISTING_MONTH_CACHE_TTL: Optional[int] = None
+    """Max age in seconds of a parsed monthly listing file in the cache."""
+
+    LISTING_MONTH_CACHE_DIR: str = ""
+    """Dir to save parsed monthly listing files in so they are shared by the
+    worker processes and kept across restarts. Empty to only cache in memory."""
+
+    LISTING_YEAR_CACHE_SIZE: int = 32
+    """Max number of year listings and year counts, per archive or category, made
+    from the parsed monthly listing files to keep in each process.
+
+    These keep their months in memory even after they drop out of the monthly
+    listing cache, so this should be small."""
+
+    LISTING_NEW_CACHE_BYTES: int = 128 * 1024 * 1024
+    """Max bytes of parsed new and pastweek listing files, for archives and
+    categories, to keep in each process for `fs_listing`. 0 to disable.
+
+    The size of a file is estimated from the text of its items. Entries are
+    checked against the listing file's updated time before use."""
+
+    LISTING_NEW_CACHE_TTL: Optional[int] = None
+    """Max age in seconds of a parsed new or pastweek listing file in the cache."""
+
+    LISTING_PAGE_BOUNDARY_CACHE_SIZE: int = 1024
+    """Max number of month and year listings, per archive or category, to keep
+    page boundaries for in each process for `db_listing`. 0 to disable.
+
+    With the boundary of a page its items are found by paper id rather than by
+    skipping all the earlier items, so deep pages cost the same as the first."""
+
+    LISTING_PAGE_BOUNDARY_CACHE_TTL: Optional[int] = None
+    """Max age in seconds of the page boundaries of a listing."""
+
+    ANNOUNCEMENT_INDEX_PATH: str = ""
+    """Path to a SQLite file of the /new, /recent and catchup listings of each
+    mailing for `db_listing`, shared by the worker processes.
+
+    Listings missing from it are built by the first request for them. Run
+    `flask announcement_index rebuild` after each publish to build the new
+    mailing ahead of requests. Empty to keep the index in memory in each
+    process."""
+
+    ANNOUNCEMENT_INDEX_TTL: Optional[int] = None
+    """Max age in seconds of a listing in the announcement index before it is
+    built again. None to keep it until the next mailing or rebuild."""
+
+    ANNOUNCEMENT_INDEX_CATCHUP_MAILINGS: int = 10
+    """Number of mailings of each subject to keep catchup listings of in the
+    announcement index. The catchup listings of older mailings are removed
+    when a new one is built, so the index does not grow without bound."""
+
+    INSTITUTION_IP_INDEX_TTL: int = 10 * 60
+    """Seconds between reloads of the in-process index of member institution IP
+    ranges used for the institutional banner.
+
+    A reload is done by one request while the others use the previous index.
+    0 to disable the index and query the DB for each lookup."""
+
+    LATEXML_STATUS_CACHE_SIZE: int = 20000
+    """Max number of paper versions to keep the LaTeXML conversion status and
+    publish time of in each process, for the HTML links and headers of abs and
+    listing pages. 0 to disable and query the latexml DB for each lookup."""
+
+    LATEXML_STATUS_CACHE_TTL: Optional[int] = 5 * 60
+    """Max age in seconds of an entry in the LaTeXML status cache, and so how
+    long a finished conversion may take to show up."""
+
     DOCUMENT_ABSTRACT_SERVICE: PyObject = 'browse.services.documents.fs_docs'  # type: ignore
     """Implementation to use for abstracts.
 
@@ -139,6 +250,25 @@ class Settings(arxiv_base.Settings):
     - `browse.services.documents.db_docs`: DocMetadata using the database.
     """
 
+    DOC_METADATA_CACHE_SIZE: int = 10000
+    """Max number of `DocMetadata` to keep in the per-process cache.
+
+    The cache is shared across requests. With the file system service it is
+    checked against the .abs file's modified time before use. Set to 0 to
+    disable."""
+
+    DOC_METADATA_CACHE_TTL: Optional[int] = 60 * 60
+    """Max age in seconds of an entry in the `DocMetadata` cache.
+
+    The DB service does not check its entries against the DB, so this is how
+    long a new or updated version may be served stale. With None the DB
+    service does not use the cache."""
+
+    AUTHOR_PARSE_CACHE_SIZE: int = 4096
+    """Max number of parsed author lists to keep in each process, shared by the
+    author links, meta tags and citations of abs and listing pages. 0 to
+    disable."""
+
     ABS_PATH_ROOT: str = "tests/data/abs_files/"
     """Paths to .abs files.
 
@@ -152,6 +282,57 @@ class Settings(arxiv_base.Settings):
     `gs://arxiv-production-data`. Use with `/data/` for a file system.
     """
 
+    SOURCE_INDEX_PATH: str = ""
+    """Path to a SQLite file of source file locations.
+
+    With this set source files are found with a point lookup instead of
+    listing `SOURCE_STORAGE_PREFIX`. Build it with `flask source_index build`.
+    Empty to disable."""
+
+    ANCILLARY_MANIFEST_PATH: str = ""
+    """Path to a SQLite file of the ancillary file lists of source files, used
+    for the /abs sidebar and /src/<id>/anc, shared by the worker processes.
+
+    Lists are added the first time a paper's files are listed, or ahead of
+    time with `flask anc_manifest backfill`. Empty to keep them in memory in
+    each process, see `ANCILLARY_MANIFEST_CACHE_SIZE`."""
+
+    ANCILLARY_MANIFEST_CACHE_SIZE: int = 4096
+    """Max number of source files to keep the ancillary file list of in each
+    process when `ANCILLARY_MANIFEST_PATH` is empty, least recently used are
+    dropped first. 0 to disable and read the tar headers on each listing."""
+
+    ANCILLARY_TAR_INDEX_SIZE: int = 8
+    """Max number of .tar.gz sources to keep member and gzip seek indexes of in
+    each process, for /src/<id>/anc files. Indexes are built on a background
+    thread and until one is built the members of that tarball are read from
+    its start. 0 to disable and always read members from the start of the
+    tarball."""
+
+    ANCILLARY_TAR_INDEX_SPACING: int = 16 * 1024 * 1024
+    """Uncompressed bytes between gzip seek checkpoints in an ancillary tar
+    index. Each checkpoint holds about 40KB of decompressor state in memory."""
+
+    ANCILLARY_TAR_INDEX_PATH: str = ""
+    """Path to a SQLite file to save the member names, offsets and sizes of
+    indexed tarballs in, shared by the worker processes. It is used for 404s
+    of tarballs not yet indexed in the process. Empty to not save them."""
+
+    CONDITION_CACHE_SIZE: int = 10000
+    """Max number of negative dissemination results, like `NO_SOURCE`, to cache
+    in each process. 0 to disable."""
+
+    CONDITION_CACHE_STABLE_TTL: int = 60 * 60 * 24
+    """Seconds to cache conditions that do not change for a version, like
+    `WITHDRAWN` or `NOT_PDF` for a versioned id."""
+
+    CONDITION_CACHE_TRANSIENT_TTL: int = 60
+    """Seconds to cache conditions that may change, like `UNAVAILABLE`, or any
+    condition for an id without a version.
+
+    Conditions are only dropped by TTL so this is how long a change, like a
+    PDF being built, can take to be seen."""
+
     DISSEMINATION_STORAGE_PREFIX: str = "./tests/data/abs_files/"
     """Storage prefix to use. Ex gs://arxiv-production-data
 
@@ -169,6 +350,25 @@ class Settings(arxiv_base.Settings):
     It can also be a local file like `tests/data/reasons.json`.
     This can be the special value "DEFAULT" which will look for `DISSEMINATION_STORAGE_PREFIX/reasons.json`."""
 
+    FILE_STREAM_BLOCK_SIZE: int = 1024 * 1024
+    """Bytes per read when streaming PDFs, source and other files in responses."""
+
+    NATIVE_HTML_PAGE_CACHE_BYTES: int = 64 * 1024 * 1024
+    """Max total bytes of post processed native HTML pages, ex. proceedings
+    with LIST: directives, to cache in each process. 0 to disable."""
+
+    NATIVE_HTML_PAGE_CACHE_TTL: Optional[int] = 60 * 60
+    """Max age in seconds of a cached native HTML page. This bounds how stale
+    the metadata of the listed papers can be."""
+
+    NATIVE_HTML_MANIFEST_CACHE_SIZE: int = 1024
+    """Max number of native HTML paper versions to keep the file listing of in
+    each process. A listing is used while the paper's modified time is
+    unchanged. 0 to disable and list the directory on each request."""
+
+    NATIVE_HTML_MANIFEST_CACHE_TTL: Optional[int] = 60 * 60
+    """Max age in seconds of a cached native HTML file listing."""
+
     GENPDF_API_URL: str = ""
     """URL of the genpdf API. https://genpdf-api.arxiv.org"""
 
@@ -178,6 +378,26 @@ class Settings(arxiv_base.Settings):
     GENPDF_API_TIMEOUT: int = 590
     """Time ouf for the genpdf API access"""
 
+    SINGLE_FLIGHT_LOCK_DIR: str = ""
+    """Directory for lock files to serialize identical lookups across the
+    worker processes on a host. Empty to only coalesce within a process."""
+
+    SINGLE_FLIGHT_LOCK_TIMEOUT: float = 10
+    """Max seconds to wait for a single flight lock file before going ahead
+    without it."""
+
+    GENPDF_API_MAX_CONCURRENCY: int = 8
+    """Max concurrent requests to the genpdf API from each process."""
+
+    GENPDF_API_SLOT_TIMEOUT: float = 30
+    """Max seconds a request waits for one of the `GENPDF_API_MAX_CONCURRENCY`
+    slots. Past that the PDF is reported as unavailable rather than holding
+    the request thread until a build finishes."""
+
+    GENPDF_API_RETRIES: int = 3
+    """Max attempts of a request to the genpdf API on connection errors or
+    Cloud Run start up errors."""
+
     GENPDF_API_STORAGE_PREFIX: str = "./tests/data/abs_files"
     """Where genpdf stores the PDFs. It is likely the local file system does not work here but
     it is plausible to match the gs bucket with local file system, esp. for testing.
@@ -34,11 +34,10 @@ from browse import b_add_surrogate_key
 
 from browse.exceptions import AbsNotFound
 from browse.services.database import (
-    count_trackback_pings,
     get_datacite_doi,
     get_dblp_authors,
     get_dblp_listing_path,
-    get_trackback_ping_latest_date,
+    get_trackback_ping_summary,
     get_latexml_publish_dt,
 )
 from browse.services.documents import get_doc_service
@@ -58,6 +57,7 @@ from browse.formatting.search_authors import queries_for_authors, split_long_aut
 from browse.controllers.response_headers import mime_header_date
 from browse.formatting.metatags import meta_tag_metadata
 from browse.services.audio import has_audio
+from browse.services.fan_out import Lookup, fan_out, server_timing
 
 logger = logging.getLogger(__name__)
 
@@ -155,7 +155,8 @@ def get_abs_page(arxiv_id: str) -> Response:
         response_data["show_refs_cites"] = _show_refs_cites(arxiv_identifier)
         response_data["show_labs"] = _show_labs(arxiv_identifier)
 
-        _non_critical_abs_data(abs_meta, arxiv_identifier, response_data)
+        timings = _non_critical_abs_data(abs_meta, arxiv_identifier, response_data)
+        response_headers["Server-Timing"] = server_timing(timings)
 
     except AbsNotFoundException as ex:
         if (arxiv_identifier.is_old_id
@@ -204,28 +205,49 @@ def get_abs_page(arxiv_id: str) -> Response:
 
 def _non_critical_abs_data(
     abs_meta: DocMetadata, arxiv_identifier: Identifier, response_data: Dict
-) -> None:
-    """Get additional non-essential data for the abs page."""
+) -> Dict[str, float]:
+    """Get additional non-essential data for the abs page.
+
+    The lookups that depend on the DB or the object store are independent of
+    each other so they are run concurrently. Any that fails or is slower than
+    `ABS_NON_CRITICAL_TIMEOUT` is replaced by its default so the page can still
+    be rendered.
+
+    Returns the time in seconds each of the concurrent lookups took.
+    """
+    paper_id = arxiv_identifier.id
+    results, timings = fan_out(
+        {
+            "dblp": Lookup(lambda: _check_dblp(abs_meta)),
+            "trackbacks": Lookup(lambda: get_trackback_ping_summary(paper_id), (0, None)),
+            "ancillary_files": Lookup(lambda: get_article_store().get_ancillary_files(abs_meta), []),
+            "datacite_doi": Lookup(lambda: get_datacite_doi(paper_id=abs_meta.arxiv_id)),
+        },
+        timeout=current_app.config.get("ABS_NON_CRITICAL_TIMEOUT", 2.0),
+    )
+
     # The DBLP listing and trackback counts depend on the DB.
-    response_data["dblp"] = _check_dblp(abs_meta)
-    response_data["trackback_ping_count"] = count_trackback_pings(arxiv_identifier.id)
+    response_data["dblp"] = results["dblp"]
+    trackback_count, trackback_latest = results["trackbacks"]
+    response_data["trackback_ping_count"] = trackback_count or 0
     if response_data["trackback_ping_count"] > 0:
-        response_data["trackback_ping_latest"] = get_trackback_ping_latest_date(
-            arxiv_identifier.id
-        )
+        response_data["trackback_ping_latest"] = trackback_latest
 
     # Include INSPIRE link in references & citations section
     response_data["include_inspire_link"] = include_inspire_link(abs_meta)
 
     # Ancillary files
-    response_data["ancillary_files"] = get_article_store().get_ancillary_files(abs_meta)
+    response_data["ancillary_files"] = results["ancillary_files"]
 
     _prevnext_links(arxiv_identifier, abs_meta.primary_category, response_data)
 
     response_data["is_covid_match"] = _is_covid_match(abs_meta)
-    response_data["datacite_doi"] = get_datacite_doi(paper_id=abs_meta.arxiv_id)
+    response_data["datacite_doi"] = results["datacite_doi"]
     response_data["has_audio"] = has_audio(abs_meta)
 
+    logger.debug("abs %s non-critical lookup timings: %s", paper_id, timings)
+    return timings
+
 
 def _check_request_headers(
     docmeta: DocMetadata, response_data: Dict[str, Any], resp_headers: Headers
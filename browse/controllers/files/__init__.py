@@ -8,10 +8,9 @@ from arxiv.identifier import Identifier
 from arxiv.document.version import VersionEntry
 from arxiv.files import FileObj
 from browse import b_add_surrogate_key
+from browse.stream.file_stream import block_size, read_blocks
 from werkzeug.datastructures import Headers
 
-BUFFER_SIZE = 1024 * 4
-
 VERY_LONG = 60* 60* 24 * 365 # sec
 
 def maxage(versioned: bool=False) -> str:
@@ -39,12 +38,7 @@ def last_modified(fileobj: FileObj) -> str:
 def stream_gen(file: FileObj) -> Iterator[bytes]:
     """Returns a generator that returns the bytes from `file` to be used with a
     Flask response."""
-    with file.open("rb") as fh:
-        while True:
-            chunk = fh.read(BUFFER_SIZE)
-            if not chunk:
-                break
-            yield chunk
+    return read_blocks(file.open("rb"), block_size())
 
 
 def add_mimetype(resp: Response, filename: Union[str|FileObj]) -> None:
@@ -9,6 +9,7 @@ from arxiv.identifier import Identifier, IdentifierException
 
 from browse.services.dissemination import get_article_store
 from browse.services.dissemination.article_store import Deleted
+from browse.services.dissemination.tar_index import get_tar_index_cache
 from browse.services.documents import get_doc_service
 from arxiv.files import FileObj
 from arxiv.files import FileFromTar
@@ -59,22 +60,39 @@ def get_extracted_src_file_resp(arxiv_id_str: str,
         abort(500, description="Unexpected result for source")
 
     src_file: FileObj = dis_res[0]
-    tarmember = FileFromTar(src_file, path)
-    if not tarmember.exists():
-        return make_response(
-            render_template("src/anc_not_found.html",
-                            reason=f"File not in ancillary files for {arxiv_id.idv}"),
-            404, {"ETag": src_file.etag,
-                  "Surrogate-Control": f"max-age={maxage(arxiv_id.has_version)}"})
+    tar_index = get_tar_index_cache() if src_file.name.endswith(".tar.gz") else None
+    index = tar_index.get(src_file) if tar_index is not None else None
+    if tar_index is not None and index is not None:
+        # Reads and seeks start from the nearest gzip checkpoint, see tar_index
+        member = index.members.get(path)
+        if member is None:
+            return _not_in_anc(arxiv_id, src_file)
+        data, size, name = tar_index.open_member(src_file, index, member), member.size, member.name
+    else:
+        # Not indexed yet, the index is built in the background, see tar_index.
+        # RangeRequest does a seek and that seems odd with gzip and tarfile but
+        # both of those support seek.
+        saved = tar_index.saved_member(src_file, path) if tar_index is not None else None
+        tarmember = FileFromTar(src_file, path)
+        found = saved[1] is not None if saved is not None else tarmember.exists()
+        if not found:
+            return _not_in_anc(arxiv_id, src_file)
+        data, size, name = tarmember.open("rb"), tarmember.size, tarmember.name
 
-    """RangeRequest does a seek and that seems odd with gzip and tarfile but both of
-    those support seek."""
     resp: Response = RangeRequest(
-            data=tarmember.open("rb"),  # RangeRequest and flask are expected to call `close()`
+            data=data,  # RangeRequest and flask are expected to call `close()`
             etag=src_file.etag,
             last_modified=src_file.updated,
-            size=tarmember.size
+            size=size
     ).make_response()
-    add_mimetype(resp, tarmember.name)
+    add_mimetype(resp, name)
     add_time_headers(resp, src_file, arxiv_id)
     return resp
+
+
+def _not_in_anc(arxiv_id: Identifier, src_file: FileObj) -> Response:
+    return make_response(
+        render_template("src/anc_not_found.html",
+                        reason=f"File not in ancillary files for {arxiv_id.idv}"),
+        404, {"ETag": src_file.etag,
+              "Surrogate-Control": f"max-age={maxage(arxiv_id.has_version)}"})
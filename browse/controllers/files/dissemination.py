@@ -15,10 +15,11 @@ from browse.controllers.files import last_modified, add_time_headers, \
     not_found, bad_id, cannot_build_pdf, add_mimetype, not_public, no_source, \
     not_ps
 
-from arxiv.files import FileObj, FileTransform
+from arxiv.files import FileObj
 
-from browse.services.html_processing import post_process_html
-from browse.services.html_processing.scaffold import render_branded_html_paper, HTMLFileTransform
+from browse.services.html_processing import PostProcessedHTML
+from browse.stream.file_stream import BlobRangeReader, block_size, file_body, gcs_blob, local_path
+from browse.services.html_processing.scaffold import HTMLFileTransform
 from browse.services.html_processing.scaffold_builder import scaffold_metadata_from_published
 from browse.services.dissemination import get_article_store
 from browse.services.dissemination.article_store import (
@@ -57,7 +58,13 @@ def default_resp_fn(file: FileObj,
     if request.method == 'GET' and 'range' in [hk.lower() for hk in request.headers.keys()]:
         # Fastly requires Range response to cache large objects (>20MB),
         # Cloud run requires response larger than 20MB to be chunked but Range response will be smaller.
-        resp = RangeRequest(file.open('rb'),
+        blob = gcs_blob(file)
+        if blob is not None:
+            byte_range = request.range.range_for_length(file.size) if request.range else None
+            data = BlobRangeReader(blob, block_size(), byte_range[1] if byte_range else None)
+        else:
+            data = file.open('rb')
+        resp = RangeRequest(data,
                             etag=file.etag,
                             last_modified=file.updated,
                             size=file.size).make_response()
@@ -65,7 +72,11 @@ def default_resp_fn(file: FileObj,
         # Cloud run needs chunked for large responses
         if request.method == "GET":
             # Flask/werkzeug automatically do Transfer-Encoding: chunked for a file
-            resp = make_response(stream_with_context(iter(file.open("rb"))))
+            body = file_body(file, request.environ)
+            if local_path(file) is not None:  # wsgi.file_wrapper, the server may use sendfile
+                resp = Response(body, direct_passthrough=True)
+            else:
+                resp = make_response(stream_with_context(body))
             # but the unit test client doesn't do that so we force it for those
             # see https://github.com/pallets/flask/issues/5424
             resp.headers["Transfer-Encoding"] = "chunked"
@@ -208,7 +219,7 @@ def _html_response(file_list: Union[List[FileObj],FileObj],
         resp= _html_source_listing_response(file_list, arxiv_id)
     elif isinstance(file_list, FileObj): #converted via latexml
         if file_list.name.endswith('.html'):  # only transform HTML
-            resp = default_resp_fn(HTMLFileTransform(file_list, render_branded_html_paper, \
+            resp = default_resp_fn(HTMLFileTransform(file_list,
                 scaffold_metadata_from_published(docmeta, version)), arxiv_id, docmeta, version)
         else: # PNGs and other assets served as-is
             resp = default_resp_fn(file_list, arxiv_id, docmeta, version)
@@ -232,7 +243,7 @@ def _html_response(file_list: Union[List[FileObj],FileObj],
 def _html_source_single_response(file: FileObj, arxiv_id: Identifier) -> Response:
     """Produces a `Response`for a single file for a paper with HTML source."""
     if _is_html_name(file):  # do post_processing
-        resp = default_resp_fn( FileTransform(file, post_process_html), arxiv_id)
+        resp = default_resp_fn(PostProcessedHTML(file), arxiv_id)
         resp.headers["Link"] = f"<https://arxiv.org/html/{arxiv_id.id}>; rel='canonical'"
         return resp
     else:
@@ -334,11 +334,13 @@ def get_listing(subject_or_category: str,
 
     idx = 0
 
+    articles = articles_for_ids([item.id for item in listings
+                                 if not hasattr(item, 'article') or item.article is None])
     for item in listings:
         idx = idx + 1
         setattr(item, 'list_index', idx + skipn)
         if not hasattr(item, 'article') or item.article is None:
-            setattr(item, 'article', get_doc_service().get_abs(item.id))
+            setattr(item, 'article', articles[item.id])
 
     response_data['listings'] = listings
     response_data['author_links'] = authors_for_articles(listings)
@@ -438,6 +440,20 @@ def more_fewer(show: int, count: int, viewing_all: bool) -> Dict[str, Any]:
 
     return rd
 
+def articles_for_ids(ids: List[str]) -> Dict[str, DocMetadata]:
+    """Gets the DocMetadata of the papers with one bulk lookup.
+
+    Raises the exception for the first paper that could not be gotten, as
+    getting them one at a time would."""
+    if not ids:
+        return {}
+    found = get_doc_service().get_abs_many(ids)
+    for id in ids:
+        article = found[id]
+        if isinstance(article, Exception):
+            raise article
+    return found  # type: ignore
+
 def _src_code(article: DocMetadata)->str:
     vhs = [vh for vh in article.version_history if vh.version == article.version]
     if vhs:
@@ -9,7 +9,6 @@ from werkzeug.exceptions import BadRequest
 
 from arxiv.taxonomy.definitions import CATEGORIES
 from arxiv.document.metadata import DocMetadata
-from arxiv.authors import parse_author_affil
 from arxiv.taxonomy.category import Category
 
 from ...services.database import (
@@ -19,9 +18,10 @@ from ...services.database import (
     get_orcid_by_user_id,
     get_articles_for_author
 )
-from browse.services.documents import get_doc_service
+from browse.formatting.author_cache import authors_affils
 
 from browse.controllers.list_page import (
+    articles_for_ids,
     dl_for_articles,
     latexml_links_for_articles,
     authors_for_articles,
@@ -51,9 +51,9 @@ def get_json(id: str) -> Optional[Dict]:
     if user_id is None:
         return None
 
-    entries = []
-    for li in get_articles_for_author(user_id):
-        entries.append(_make_json_entry(get_doc_service().get_abs(li.id)))
+    listings = get_articles_for_author(user_id)
+    articles = articles_for_ids([li.id for li in listings])
+    entries = [_make_json_entry(articles[li.id]) for li in listings]
 
     if is_orcid:
         orcid = f'{ORCID_URI_PREFIX}/{unquote(id)}'
@@ -85,8 +85,9 @@ def get_html_page(id: str) -> Tuple[Dict[str, Optional[Any]], int, Dict[str, str
     response_data['title'] = f'{response_data["display_name"]}\'s articles on arXiv'
 
     listings = get_articles_for_author(user_id)
+    articles = articles_for_ids([item.id for item in listings])
     for i, item in enumerate(listings):
-        setattr(item, 'article', get_doc_service().get_abs(item.id))
+        setattr(item, 'article', articles[item.id])
         setattr(item, 'list_index', i + 1)
 
     response_data['abstracts'] = listings
@@ -156,7 +157,7 @@ def _make_json_entry(metadata: DocMetadata) -> Dict[str, str]:
     entry: Dict[str, Any] = {}
 
     # 'authors' field
-    entry['authors'] = ', '.join(map(_author_name, parse_author_affil(metadata.authors.raw)))
+    entry['authors'] = ', '.join(map(_author_name, authors_affils(metadata.authors.raw)))
 
     # 'categories' field
     all_categories = []
@@ -227,11 +228,11 @@ def _add_atom_feed_entry(metadata: DocMetadata, feed: ET.Element, atom2: bool =
     ET.SubElement(entry, f'{{{ATOM_NS}}}summary').text = re.sub(r'\n+', ' ', metadata.abstract.strip())
 
     if atom2:
-        names = ', '.join(map(_author_name, parse_author_affil(metadata.authors.raw)))
+        names = ', '.join(map(_author_name, authors_affils(metadata.authors.raw)))
         author = ET.SubElement(entry, f'{{{ATOM_NS}}}author')
         ET.SubElement(author, f'{{{ATOM_NS}}}name').text = names
     else:
-        for author_line in parse_author_affil(metadata.authors.raw):
+        for author_line in authors_affils(metadata.authors.raw):
             author = ET.SubElement(entry, f'{{{ATOM_NS}}}author')
             ET.SubElement(author, f'{{{ATOM_NS}}}name').text = _author_name(author_line)
             affils = _author_affils(author_line)
@@ -315,8 +316,10 @@ def _get_atom_feed(id: str, atom2: bool = False) -> str:
                     'href': f'{request.url_root}{id}'
                 })
 
-    for li in get_articles_for_author(user_id):
-        _add_atom_feed_entry(get_doc_service().get_abs(li.id), feed, atom2)
+    listings = get_articles_for_author(user_id)
+    articles = articles_for_ids([li.id for li in listings])
+    for li in listings:
+        _add_atom_feed_entry(articles[li.id], feed, atom2)
 
     # Indent for pretty printing (Python 3.9+)
     ET.indent(feed, space="  ", level=0)
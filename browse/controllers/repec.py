@@ -8,13 +8,13 @@ format documented at http://ideas.repec.org/t/httpserver.html.
 import re
 import textwrap
 from datetime import date
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
-from arxiv.authors import parse_author_affil
-from arxiv.document.exceptions import AbsException
+from arxiv.document.metadata import DocMetadata
 from arxiv.taxonomy.definitions import GROUPS
 from arxiv.base import logging
 
+from browse.formatting.author_cache import authors_affils
 from browse.services.documents import get_doc_service
 from browse.services.database import get_repec_paper_ids
 
@@ -117,25 +117,28 @@ def _item_files() -> Dict[str, int]:
 
 def _items(year: int) -> Tuple[str, int, str]:
     parts: List[str] = []
-    for paper_id in get_repec_paper_ids(year):
-        item = _item(paper_id)
+    found = get_doc_service().get_abs_many(get_repec_paper_ids(year))
+    for paper_id, metadata in found.items():
+        item = _item(paper_id, metadata)
         if item is not None:
             parts.append(f"\n#arXiv:{paper_id}\n")
             parts.append(item)
     return "".join(parts), 200, "text/plain"
 
 
-def _item(paper_id: str) -> Optional[str]:
-    """Render a single ReDIF-Paper record, or None if metadata is unavailable."""
-    try:
-        metadata = get_doc_service().get_abs(paper_id)
-    except AbsException:
+def _item(paper_id: str, metadata: Union[DocMetadata, Exception]) -> Optional[str]:
+    """Render a single ReDIF-Paper record, or None if metadata is unavailable.
+
+    `metadata` is the paper's entry from `get_abs_many`, the exception in
+    place of the metadata when it could not be read.
+    """
+    if isinstance(metadata, Exception):
         logger.warning("RePEc bad item %s, ignored", paper_id)
         return None
 
     lines = ["Template-type: ReDIF-Paper 1.0"]
 
-    for author in parse_author_affil(metadata.authors.raw):
+    for author in authors_affils(metadata.authors.raw):
         key, first, suffix, *affils = author
         name = key
         if first:
@@ -2,6 +2,8 @@
 from functools import partial
 
 import logging
+import time
+from typing import Dict
 
 from flask.logging import default_handler
 
@@ -17,27 +19,43 @@ from flask_s3 import FlaskS3
 
 from browse.config import Settings
 from browse.routes import ui, dissemination, src, unimplemented, redirects
-from browse.commands import invalidate, check_paper_formats
+from browse.commands import invalidate, check_paper_formats, source_index, announcement_index, \
+    anc_manifest
 from browse.services.check import service_statuses
 from browse.formatting.email import generate_show_email_hash
 from browse.filters import entity_to_utf
+from browse.warm_up import log_timings, warm_up
 
 s3 = FlaskS3()
 
 
 def create_web_app(**kwargs) -> Flask: # type: ignore
-    """Initialize an instance of the browse web application."""
+    """Initialize an instance of the browse web application.
+
+    If `WARM_UP_ON_START` is set the services, DB pool and templates are
+    warmed up before this returns, see `browse.warm_up`."""
+    timings: Dict[str, float] = {}
+    last = time.perf_counter()
+
+    def lap(name: str) -> None:
+        nonlocal last
+        now = time.perf_counter()
+        timings[name] = now - last
+        last = now
+
     root = logging.getLogger()
     root.addHandler(default_handler)
 
     settings = Settings(**kwargs)
     settings.check()
+    lap("settings")
 
     app = Flask('browse',
                 static_url_path=f'/static/browse/{settings.APP_VERSION}')
     app.config.from_object(settings)
 
     app.engine, app.latexml_engine  = configure_db(settings) # type: ignore
+    lap("configure_db")
 
     Base(app)
 
@@ -55,6 +73,9 @@ def create_web_app(**kwargs) -> Flask: # type: ignore
     # commands
     app.register_blueprint(invalidate.bp)
     app.register_blueprint(check_paper_formats.bp)
+    app.register_blueprint(source_index.bp)
+    app.register_blueprint(announcement_index.bp)
+    app.register_blueprint(anc_manifest.bp)
 
     s3.init_app(app)
 
@@ -78,6 +99,7 @@ def create_web_app(**kwargs) -> Flask: # type: ignore
     app.jinja_env.filters['arxiv_urlize'] = urlizer(['arxiv_id', 'doi', 'url'])
     app.jinja_env.filters['arxiv_id_doi_filter'] = urlizer(['arxiv_id', 'doi'])
     app.jinja_env.filters['tidy_filesize'] = tidy_filesize
+    lap("routes_and_jinja")
 
     with app.app_context():
         problems = service_statuses()
@@ -85,6 +107,11 @@ def create_web_app(**kwargs) -> Flask: # type: ignore
             app.logger.error("Problems with services!!!!!")
             for prob in problems:
                 app.logger.error(prob)
+    lap("service_statuses")
+    log_timings("startup", timings)
+
+    if settings.WARM_UP_ON_START:
+        warm_up(app)
 
     return app
 
@@ -0,0 +1,66 @@
+"""Process wide cache of parsed author lists.
+
+One /abs page parses the same authors string for the author links, the meta
+tags and the BibTeX, and a listing page parses the authors of up to 2000
+papers. For collaboration papers with thousands of authors this parsing is
+most of the time spent on the page.
+
+Parsed author lists are kept in a bounded LRU cache keyed by the kind of parse
+and a hash of the raw authors string, so each is parsed once in a process
+while it stays in the cache. The functions here return copies that callers
+are free to change.
+"""
+import hashlib
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from arxiv.authors import parse_author_affil, parse_author_affil_utf
+from flask import current_app, has_app_context
+
+from browse.services.cache import LRUCache
+
+T = TypeVar("T")
+
+DEFAULT_SIZE = 4096
+"""Max number of parsed author lists in the cache without an app context."""
+
+_cache: Optional[LRUCache[Tuple[str, bytes], Any]] = None
+# Shared by all requests in the process, see `get_author_cache()`.
+
+
+def get_author_cache() -> Optional[LRUCache[Tuple[str, bytes], Any]]:
+    """Gets the process wide cache of parsed author lists.
+
+    Returns `None` if it is disabled with `AUTHOR_PARSE_CACHE_SIZE` of 0."""
+    global _cache
+    size = int(current_app.config.get("AUTHOR_PARSE_CACHE_SIZE", DEFAULT_SIZE)) \
+        if has_app_context() else DEFAULT_SIZE
+    if size <= 0:
+        return None
+    if _cache is None:
+        _cache = LRUCache(size)
+    return _cache
+
+
+def memoized(kind: str, raw: str, parse: Callable[[str], T]) -> T:
+    """Gets `parse(raw)` from the cache, parsing and caching it if needed.
+
+    The result is shared so it must not be changed, use a copy."""
+    cache = get_author_cache()
+    if cache is None:
+        return parse(raw)
+    key = (kind, hashlib.blake2b(raw.encode('utf-8'), digest_size=16).digest())
+    parsed = cache.get(key)
+    if parsed is None:
+        parsed = parse(raw)
+        cache.put(key, parsed)
+    return parsed  # type: ignore
+
+
+def authors_affils(raw: str) -> List[List[str]]:
+    """`parse_author_affil(raw)`, cached."""
+    return [list(author) for author in memoized("affil", raw, parse_author_affil)]
+
+
+def authors_affils_utf(raw: str) -> List[List[str]]:
+    """`parse_author_affil_utf(raw)`, cached."""
+    return [list(author) for author in memoized("affil_utf", raw, parse_author_affil_utf)]
@@ -3,7 +3,7 @@
 
 from typing import List
 
-from arxiv.authors import parse_author_affil_utf
+from browse.formatting.author_cache import authors_affils_utf
 
 from arxiv.document.metadata import DocMetadata
 
@@ -14,7 +14,7 @@ def arxiv_bibtex(docm: DocMetadata) -> str:
     year = str(published.year) if published else "unknown"
 
     title = _normalize_whitespace(docm.title)
-    pauths = parse_author_affil_utf(docm.authors.raw)
+    pauths = authors_affils_utf(docm.authors.raw)
     auths = _fmt_author_list(pauths)
 
     pc = docm.primary_category.id if docm.primary_category else "unknown"
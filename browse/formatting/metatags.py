@@ -4,11 +4,12 @@ import re
 from datetime import datetime, timezone
 from typing import Dict, List, Union
 
-from arxiv.authors import parse_author_affil_utf
 from flask import url_for
 
 from arxiv.document.metadata import DocMetadata
 
+from browse.formatting.author_cache import authors_affils_utf
+
 
 def meta_tag_metadata(metadata: DocMetadata, truncate: bool = False) -> List:
     """Return data for HTML <meta> tags as used by Google Scholar.
@@ -35,9 +36,9 @@ def meta_tag_metadata(metadata: DocMetadata, truncate: bool = False) -> List:
     if metadata.authors:
 
         authors_list = (
-            parse_author_affil_utf(metadata.authors.raw)[:100]
+            authors_affils_utf(metadata.authors.raw)[:100]
             if truncate
-            else parse_author_affil_utf(metadata.authors.raw)
+            else authors_affils_utf(metadata.authors.raw)
         )
         meta_tags.extend(filter(lambda a: a, map(format_affil_author, authors_list)))
 
@@ -5,6 +5,8 @@ from typing import List, Tuple, Union
 from arxiv.authors import PREFIX_MATCH, split_authors
 from arxiv.util.tex2utf import tex2utf
 
+from browse.formatting.author_cache import memoized
+
 
 AuthorList = List[Union[str, Tuple[str, str]]]
 """Type alias for list of authors or strings that is used to display
@@ -13,6 +15,19 @@ the author list.
 """
 
 
+_etal = re.compile(r'et\.? al\.?$')
+_divider = re.compile(r'^(,|:)')
+_not_linked = re.compile(r'\s*((for\s+the\s+)|(the\s+))(?P<rest>.*)', re.IGNORECASE)
+_dot_space = re.compile(r'\.(?!) ')
+_escaped_space = re.compile(r'\\(,| )')
+_tilde = re.compile(r'([^\\])~')
+_comma = re.compile(r',\s*')
+_colab = re.compile(r'^(.+)\s+(collaboration|group|team)(\s?.*)', re.IGNORECASE)
+_the = re.compile('the (.*)', re.IGNORECASE)
+_suffix = re.compile(r'SJ|Jr|Sr|[IV]{2,}$')
+_prefix = re.compile('^(' + PREFIX_MATCH + ')$', re.IGNORECASE)
+
+
 def is_affiliation(item: str) -> bool:
     """Return true if a string contains an affiliation."""
     return item.startswith('(')
@@ -25,12 +40,12 @@ def is_short(item: str) -> bool:
 
 def is_etal(item: str) -> bool:
     """Return true if the string contains et al."""
-    return re.match(r'et\.? al\.?$', item) is not None
+    return _etal.match(item) is not None
 
 
 def is_divider(item: str) -> bool:
     """Return true if the string contains a divider character."""
-    return re.match(r'^(,|:)', item) is not None
+    return _divider.match(item) is not None
 
 
 def split_long_author_list(
@@ -91,7 +106,14 @@ def queries_for_authors(authors: str) -> AuthorList:
     DON'T URL_encode, do that in template
     DON'T do entities, do that in template
     DON'T escape utf8 for HTML, just return utf8        
+
+    Each distinct authors string is parsed once and kept in the process wide
+    cache of `browse.formatting.author_cache`.
     """
+    return list(memoized("queries", authors, _queries_for_authors))
+
+
+def _queries_for_authors(authors: str) -> AuthorList:
     out: AuthorList = []
 
     splits: List[str] = split_authors(authors)
@@ -103,7 +125,7 @@ def queries_for_authors(authors: str) -> AuthorList:
         elif is_short(item) or is_etal(item):
             out.append(item)
         else:
-            out = [*out, *_link_for_name_or_collab(item)]
+            out.extend(_link_for_name_or_collab(item))
 
     return out
 
@@ -112,26 +134,24 @@ def _link_for_name_or_collab(item: str) -> AuthorList:
     out: List[Union[str, Tuple[str, str]]] = []
 
     # deal with 'for the _whatever_' or 'for _whatever_' or 'the'
-    not_linked = re.match(r'\s*((for\s+the\s+)|(the\s+))(?P<rest>.*)',
-                          item, flags=re.IGNORECASE)
+    not_linked = _not_linked.match(item)
     if not_linked:
         out.append(not_linked.group(1))
         item = not_linked.group('rest')
 
     item = tex2utf(item)
-    item = re.sub(r'\.(?!) ', '.', item)
-    item = re.sub(r'\\(,| )', ' ', item)
-    item = re.sub(r'([^\\])~', r'\1', item)
-    item = re.sub(r',\s*', ' ', item)
+    item = _dot_space.sub('.', item)
+    item = _escaped_space.sub(' ', item)
+    item = _tilde.sub(r'\1', item)
+    item = _comma.sub(' ', item)
 
-    colab_m = re.match(r'^(.+)\s+(collaboration|group|team)(\s?.*)',
-                       item, re.IGNORECASE)
+    colab_m = _colab.match(item)
     if colab_m:
         colab = f'{colab_m.group(1)} {colab_m.group(2)}'
         out.append((item, colab))
         return out
 
-    the_m = re.match('the (.*)', item, re.IGNORECASE)
+    the_m = _the.match(item)
     if the_m:
         out.append((item, the_m.group(1)))
         return out
@@ -142,7 +162,7 @@ def _link_for_name_or_collab(item: str) -> AuthorList:
         query_str = item
     else:
         # Do not include SJ, Jr, Sr, III, IV, etc. in search
-        if re.match(r'SJ|Jr|Sr|[IV]{2,}$', name_bits[-1]) \
+        if _suffix.match(name_bits[-1]) \
            and len(name_bits) > 1:
             name_bits.pop()
 
@@ -159,8 +179,7 @@ def _link_for_name_or_collab(item: str) -> AuthorList:
             name_bit_count += 1
 
             if (found_prefix or (name_bit_count > 1
-                                 and re.match('^(' + PREFIX_MATCH + ')$',
-                                              name_bit, re.IGNORECASE))):
+                                 and _prefix.match(name_bit))):
                 surname_prefixes.append(name_bit)
                 found_prefix = True
             else:
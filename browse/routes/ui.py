@@ -41,6 +41,7 @@ from browse.controllers.bibtexcite import bibtex_citation
 from browse.controllers.list_page import author
 from browse.controllers import audio
 from browse.controllers import repec
+from browse.warm_up import is_ready
 
 logger = logging.getLogger(__name__)
 geoip_reader = None
@@ -171,6 +172,16 @@ def institutional_banner() -> Any:
         return ("", status.INTERNAL_SERVER_ERROR, response_headers)
 
 
+@blueprint.route("ready", methods=["GET"])
+def ready() -> Any:
+    """Readiness of this worker, 503 until its warm up is done and worked."""
+    response_headers = {
+        "Cache-Control": "no-cache, no-store, private, max-age=0",
+        'Content-Type': 'application/json'}
+    ok, details = is_ready(current_app._get_current_object())  # type: ignore
+    return (details, status.OK if ok else status.SERVICE_UNAVAILABLE, response_headers)
+
+
 @blueprint.route("tb/recent", methods=["GET", "POST"])
 def tb_recent() -> Response:
     """Get the recent trackbacks that have been posted across the site."""
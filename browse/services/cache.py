@@ -0,0 +1,137 @@
+"""Small in-process caches for the browse services.
+
+These are per worker process, thread safe and bounded. They are meant for data
+that is costly to get from the object store or DB and that is requested over
+and over, like the metadata of a popular paper.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A thread safe LRU cache with an optional TTL for each entry.
+
+    When the cache is full the least recently used entry is evicted. Entries
+    older than their TTL are treated as missing and dropped when next looked up.
+
+    Example
+    -------
+
+        cache: LRUCache[str, int] = LRUCache(maxsize=100, ttl=60)
+        cache.put("a", 1)
+        cache.get("a")  # 1
+        cache.stats()   # {'size': 1, 'maxsize': 100, 'hits': 1, 'misses': 0, ...}
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 weigher: Optional[Callable[[V], int]] = None):
+        """
+        Parameters
+        ----------
+        maxsize: Max number of entries, or with `weigher` the max total
+        weight of the entries. If this is 0 or less nothing is cached.
+
+        ttl: Default time to live in seconds of an entry. `None` is no expiry.
+
+        clock: Source of time in seconds, for use in testing.
+
+        weigher: Optional function that gives the weight of a value, like its
+        size in bytes. A value heavier than `maxsize` is not cached.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.weigher = weigher
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.weight = 0
+        self._data: "OrderedDict[K, Tuple[V, Optional[float], int]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K, valid: Optional[Callable[[V], bool]] = None) -> Optional[V]:
+        """Gets the value for `key` or `None` if it is missing or expired.
+
+        With `valid` a value it returns false for is removed and counted as a
+        miss, like an expired one."""
+        with self._lock:
+            entry = self._data.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires, _ = entry
+            if (expires is not None and expires <= self.clock()) \
+               or (valid is not None and not valid(value)):
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Puts `value` in the cache.
+
+        `ttl` overrides the cache's default TTL for this entry.
+        """
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else self.clock() + ttl
+        weight = self.weigher(value) if self.weigher is not None else 1
+        with self._lock:
+            self._remove(key)
+            if weight > self.maxsize:
+                return
+            self._data[key] = (value, expires, weight)
+            self.weight += weight
+            while self.weight > self.maxsize:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def _remove(self, key: K) -> Optional[Tuple[V, Optional[float], int]]:
+        """Removes `key`, the caller holds the lock."""
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+        return entry
+
+    def pop(self, key: K) -> Optional[V]:
+        """Removes `key` from the cache, returns its value if it was present."""
+        with self._lock:
+            entry = self._remove(key)
+        return entry[0] if entry is not None else None
+
+    def pop_matching(self, pred: Callable[[K], bool]) -> int:
+        """Removes all keys where `pred(key)` is true, returns how many."""
+        with self._lock:
+            keys = [key for key in self._data if pred(key)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Removes all entries. Does not reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        """Size, hit and miss counters and hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {"size": len(self._data),
+                "weight": self.weight,
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -46,6 +46,8 @@ from arxiv.db.models import (
     t_arXiv_stats_hourly
 )
 from browse.services.listing import ListingItem
+from browse.services.database.institution_ip_index import get_institution_index
+from browse.services.database.latexml_status import get_latexml_status_cache
 from arxiv.base import logging
 from logging import Logger
 
@@ -108,7 +110,16 @@ def __paper_trackbacks_query(paper_id: str) -> Select[Tuple[TrackbackPing]]:
 
 @db_handle_error(db_logger=logger, default_return_val=None)
 def get_institution(ip: str) -> Optional[Mapping[str, str]]:
-    """Get institution label from IP address."""
+    """Get institution label from IP address.
+
+    Uses the in-process `InstitutionIPIndex` unless `INSTITUTION_IP_INDEX_TTL`
+    is 0.
+    """
+    index = get_institution_index()
+    if index is not None:
+        found = index.lookup(ip)
+        return {"id": found[0], "label": found[1], "ip": ip} if found else None
+
     decimal_ip = int(ipaddress.ip_address(ip))
 
     stmt = (
@@ -233,6 +244,24 @@ def count_trackback_pings(paper_id: str) -> int:
     return num_pings or 0
 
 
+# used on abs page
+@db_handle_error(db_logger=logger, default_return_val=(0, None))
+def get_trackback_ping_summary(paper_id: str) -> Tuple[int, Optional[datetime]]:
+    """Count trackback pings for a paper_id and get the most recent accepted
+    trackback datetime, in one query."""
+    num_pings, timestamp = Session.execute(
+        select(func.count(func.distinct(TrackbackPing.url)),
+               func.max(TrackbackPing.approved_time))
+        .filter(TrackbackPing.document_id == Document.document_id)
+        .filter(Document.paper_id == paper_id)
+        .filter(TrackbackPing.status == "accepted")
+    ).one()
+    if not num_pings:
+        return 0, None
+    latest = datetime.fromtimestamp(timestamp, tz=tz).astimezone(tz=tzutc()) if timestamp else None
+    return num_pings, latest
+
+
 #Not used, only in tests
 @db_handle_error(db_logger=logger, default_return_val=0)
 def count_all_trackback_pings() -> int:
@@ -534,6 +563,9 @@ def get_latexml_status_for_document(paper_id: str, version: int = 1) -> Optional
     """Get latexml conversion status for a given paper_id and version"""
     if not current_app.config["LATEXML_ENABLED"]:
         return None
+    cache = get_latexml_status_cache()
+    if cache is not None:
+        return cache.get(paper_id, version).conversion_status
     return Session.scalar(
         select(DBLaTeXMLDocuments.conversion_status)
         .filter(DBLaTeXMLDocuments.paper_id == paper_id)
@@ -545,6 +577,11 @@ def get_latexml_status_for_document(paper_id: str, version: int = 1) -> Optional
 def get_latexml_statuses_for_listings (listings: Iterable[DocMetadata]) -> Dict[Tuple[str, int], int]:
     if not current_app.config["LATEXML_ENABLED"]:
         return {}
+    cache = get_latexml_status_cache()
+    if cache is not None:
+        records = cache.get_many((article.arxiv_id, article.highest_version()) for article in listings)
+        return {key: record.conversion_status for key, record in records.items()
+                if record.conversion_status is not None}
     statuses = Session.execute(
         select(DBLaTeXMLDocuments.paper_id, DBLaTeXMLDocuments.document_version, DBLaTeXMLDocuments.conversion_status)
         .filter(tuple_(DBLaTeXMLDocuments.paper_id, DBLaTeXMLDocuments.document_version).in_(
@@ -563,6 +600,9 @@ def get_latexml_publish_dt (paper_id: str, version: int = 1) -> Optional[datetim
     _inside_get_latexml_publish_dt()
     if not current_app.config["LATEXML_ENABLED"]:
         return None
+    cache = get_latexml_status_cache()
+    if cache is not None:
+        return cache.get(paper_id, version).publish_dt
     publish_dt = Session.scalar(
         select(DBLaTeXMLDocuments.publish_dt)
         .filter(DBLaTeXMLDocuments.paper_id == paper_id)
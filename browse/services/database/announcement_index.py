@@ -0,0 +1,186 @@
+"""Index of the listing of each mailing for each archive or category.
+
+The /new, /recent and catchup listings are the same for every visitor between
+announcements but without this each page recomputes them from
+`arXiv_updates` or `arXiv_next_mail` with several grouped and joined queries.
+
+An `AnnouncementIndex` holds, for a kind of listing, a subject and a mailing,
+the counts of the listing and its ordered rows of `(document_id,
+listing_type)`. It is built once per mailing, either by the first request for
+it or by the `flask announcement_index rebuild` command run after the publish,
+and a page is then a slice of the rows and a query for the metadata of just
+those documents.
+
+The index is a SQLite file at `ANNOUNCEMENT_INDEX_PATH`, shared by the worker
+processes on a host and by the rebuild command. Without a path each process
+keeps its own index in memory.
+"""
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from threading import Lock
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from flask import current_app
+
+from browse.services.single_flight import coalesce
+
+logger = logging.getLogger(__name__)
+
+Row = Tuple[int, str]
+"""`(document_id, listing_type)` of an item in a listing."""
+
+_announcement_index: Optional["AnnouncementIndex"] = None
+# Shared by all requests in the process, see `get_announcement_index()`.
+
+
+@dataclass(frozen=True)
+class Announcement:
+    """Counts of the listing of one mailing for one subject.
+
+    `size` is the number of rows in the index for it. `pubdates` is only used
+    by the recent listing, the count of items for each of its days."""
+    announced: Optional[date]
+    size: int
+    new_count: int = 0
+    cross_count: int = 0
+    rep_count: int = 0
+    pubdates: List[Tuple[date, int]] = field(default_factory=list)
+
+
+class AnnouncementIndex:
+    """Listing rows and counts by kind, subject and mailing in SQLite.
+
+    The connection is shared by threads and guarded by a lock. Reads are
+    primary key lookups and ranges so holding the lock is brief.
+
+    `ttl` is the seconds after which an entry is not used and is built again,
+    `None` to keep entries until the next mailing."""
+
+    def __init__(self, path: str = ":memory:", ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS announcement ("
+                               "kind TEXT NOT NULL, "
+                               "subject TEXT NOT NULL, "
+                               "mailing TEXT NOT NULL, "
+                               "announced TEXT, "
+                               "size INTEGER NOT NULL, "
+                               "new_count INTEGER NOT NULL, "
+                               "cross_count INTEGER NOT NULL, "
+                               "rep_count INTEGER NOT NULL, "
+                               "pubdates TEXT NOT NULL, "
+                               "built REAL NOT NULL, "
+                               "PRIMARY KEY (kind, subject, mailing))")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS announcement_item ("
+                               "kind TEXT NOT NULL, "
+                               "subject TEXT NOT NULL, "
+                               "mailing TEXT NOT NULL, "
+                               "position INTEGER NOT NULL, "
+                               "document_id INTEGER NOT NULL, "
+                               "listing_type TEXT NOT NULL, "
+                               "PRIMARY KEY (kind, subject, mailing, position))")
+
+    def lookup(self, kind: str, subject: str, mailing: str) -> Optional[Announcement]:
+        """Gets the counts for the listing or `None` if it is not in the index or too old."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT announced, size, new_count, cross_count, rep_count, pubdates, built "
+                "FROM announcement WHERE kind = ? AND subject = ? AND mailing = ?",
+                (kind, subject, mailing)).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[6] > self.ttl):
+            return None
+        announced, size, new_count, cross_count, rep_count, pubdates, _ = row
+        return Announcement(announced=date.fromisoformat(announced) if announced else None,
+                            size=size, new_count=new_count, cross_count=cross_count,
+                            rep_count=rep_count,
+                            pubdates=[(date.fromisoformat(day), count)
+                                      for day, count in json.loads(pubdates)])
+
+    def rows(self, kind: str, subject: str, mailing: str, skip: int, show: int) -> List[Row]:
+        """Gets `show` rows of the listing after the first `skip`."""
+        with self._lock:
+            return [(int(doc_id), str(listing_type)) for doc_id, listing_type in self._conn.execute(
+                "SELECT document_id, listing_type FROM announcement_item "
+                "WHERE kind = ? AND subject = ? AND mailing = ? AND position >= ? AND position < ? "
+                "ORDER BY position",
+                (kind, subject, mailing, max(0, skip), max(0, skip) + max(0, show)))]
+
+    def record(self, kind: str, subject: str, mailing: str,
+               announcement: Announcement, rows: Sequence[Row], keep: int = 1) -> None:
+        """Adds or replaces the listing.
+
+        Only the `keep` most recently built mailings of `kind` for `subject`
+        are kept, the listings of older ones are removed."""
+        announced = announcement.announced.isoformat() if announcement.announced else None
+        pubdates = json.dumps([(day.isoformat(), count) for day, count in announcement.pubdates])
+        with self._lock, self._conn:
+            self._delete(kind, subject, [mailing])
+            self._conn.execute(
+                "INSERT INTO announcement (kind, subject, mailing, announced, size, new_count, "
+                "cross_count, rep_count, pubdates, built) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, subject, mailing, announced, len(rows), announcement.new_count,
+                 announcement.cross_count, announcement.rep_count, pubdates, time.time()))
+            self._conn.executemany(
+                "INSERT INTO announcement_item (kind, subject, mailing, position, document_id, "
+                "listing_type) VALUES (?, ?, ?, ?, ?, ?)",
+                [(kind, subject, mailing, position, doc_id, listing_type)
+                 for position, (doc_id, listing_type) in enumerate(rows)])
+            older = [row[0] for row in self._conn.execute(
+                "SELECT mailing FROM announcement WHERE kind = ? AND subject = ? AND mailing != ? "
+                "ORDER BY built DESC LIMIT -1 OFFSET ?",
+                (kind, subject, mailing, max(0, keep - 1)))]
+            self._delete(kind, subject, older)
+
+    def _delete(self, kind: str, subject: str, mailings: Sequence[str]) -> None:
+        """Removes the listings of `mailings`, the lock must be held."""
+        for table in ("announcement", "announcement_item"):
+            self._conn.executemany(
+                f"DELETE FROM {table} WHERE kind = ? AND subject = ? AND mailing = ?",
+                [(kind, subject, mailing) for mailing in mailings])
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM announcement")
+            self._conn.execute("DELETE FROM announcement_item")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT count(*) FROM announcement").fetchone()[0])
+
+
+def announcement_page(index: AnnouncementIndex, kind: str, subject: str, mailing: str,
+                      build: Callable[[], Tuple[Announcement, List[Row]]],
+                      skip: int, show: int, keep: int = 1) -> Tuple[Announcement, List[Row]]:
+    """Gets the counts and a page of rows of a listing, building it with `build` if needed.
+
+    When the listing is not in `index` only one request in the process builds
+    it, the others wait for and use its result. `keep` is as for
+    `AnnouncementIndex.record()`."""
+    announcement = index.lookup(kind, subject, mailing)
+    if announcement is not None:
+        return announcement, index.rows(kind, subject, mailing, skip, show)
+
+    def build_and_record() -> Tuple[Announcement, List[Row]]:
+        built, rows = build()
+        index.record(kind, subject, mailing, built, rows, keep)
+        return built, rows
+
+    announcement, rows = coalesce("announcement", (index.path, kind, subject, mailing), build_and_record)
+    return announcement, rows[max(0, skip):max(0, skip) + max(0, show)]
+
+
+def get_announcement_index() -> AnnouncementIndex:
+    """Gets the process wide `AnnouncementIndex` configured by `ANNOUNCEMENT_INDEX_PATH`."""
+    global _announcement_index
+    if _announcement_index is None:
+        _announcement_index = AnnouncementIndex(
+            current_app.config.get("ANNOUNCEMENT_INDEX_PATH") or ":memory:",
+            current_app.config.get("ANNOUNCEMENT_INDEX_TTL", None))
+    return _announcement_index
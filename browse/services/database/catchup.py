@@ -1,15 +1,22 @@
-from typing import Union, Optional
+from typing import List, Optional, Tuple, Union
 from datetime import date
 
+from flask import current_app
 from sqlalchemy import or_, and_, case
-from sqlalchemy.orm import aliased, load_only
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import func
 
 from arxiv.db import Session
-from arxiv.db.models import Metadata, NextMail, t_arXiv_in_category 
+from arxiv.db.models import NextMail, t_arXiv_in_category 
 from arxiv.taxonomy.category import Group, Archive, Category
 
-from browse.services.database.listings import _metadata_to_listing_item, process_requested_subject
+from browse.services.database.announcement_index import (
+    Announcement,
+    Row as AnnouncementRow,
+    announcement_page,
+    get_announcement_index
+)
+from browse.services.database.listings import _announcement_of, _rows_to_listing_items, process_requested_subject
 from browse.services.listing import ListingNew, gen_expires
 
 CATCHUP_LIMIT=2000
@@ -21,6 +28,44 @@ def get_catchup_data(subject: Union[Group, Archive, Category], day:date, include
     offset=(page_num-1)*CATCHUP_LIMIT
 
     mail_id=date_to_mail_id(day)
+    index=get_announcement_index()
+    if index.lookup("catchup", subject.id, mail_id) is None and not _is_written(day):
+        #the mailing may still change, build it for this request and don't keep it in the index
+        announcement, rows = _catchup_announcement(subject, mail_id, day)
+        rows=rows[max(0, offset):max(0, offset)+CATCHUP_LIMIT]
+    else:
+        announcement, rows = announcement_page(
+            index, "catchup", subject.id, mail_id,
+            lambda: _catchup_announcement(subject, mail_id, day), offset, CATCHUP_LIMIT, keep=_catchup_mailings())
+
+    return ListingNew(listings=_rows_to_listing_items(rows, include_abs), 
+                      new_count=announcement.new_count, 
+                      cross_count=announcement.cross_count, 
+                      rep_count=announcement.rep_count, 
+                      announced=day,
+                      expires=gen_expires())
+
+def rebuild_catchup(subject: Union[Group, Archive, Category], day:date)-> bool:
+    """builds the catchup listing of the mailing on day for subject into the announcement index
+    returns False, and builds nothing, if the mailing is not written yet"""
+    if not _is_written(day):
+        return False
+    mail_id=date_to_mail_id(day)
+    get_announcement_index().record("catchup", subject.id, mail_id,
+                                    *_catchup_announcement(subject, mail_id, day), keep=_catchup_mailings())
+    return True
+
+def _is_written(day:date)-> bool:
+    """whether the mailing of day is written, only then is its catchup listing final"""
+    latest=get_latest_announce_day()
+    return latest is not None and day <= latest
+
+def _catchup_mailings()-> int:
+    """number of mailings per subject to keep in the announcement index for catchup"""
+    return max(1, int(current_app.config.get("ANNOUNCEMENT_INDEX_CATCHUP_MAILINGS", 10)))
+
+def _catchup_announcement(subject: Union[Group, Archive, Category], mail_id:str, day:date)-> Tuple[Announcement, List[AnnouncementRow]]:
+    """counts and ordered rows of the listing of the mailing mail_id for the catchup page"""
     #get document ids
     doc_ids=(
         Session.query(
@@ -83,80 +128,7 @@ def get_catchup_data(subject: Union[Group, Archive, Category], day:date, include
         else_=4 
     ).label('case_order')
 
-    valid_types=["new", "cross", 'rep','repcross']
-
-    #counts
-    counts = (
-        Session.query(
-            listing_type,
-            func.count().label('type_count')
-        )
-        .filter(listing_type.label('case_order').in_(valid_types))
-        .group_by(listing_type)
-        .order_by(case_order)
-        .all() 
-    )
-
-    new_count=0
-    cross_count=0
-    rep_count=0
-    for name, number in counts:
-        if name =="new":
-            new_count+=number
-        elif name=="cross":
-            cross_count+=number
-        else: #rep and repcross
-            rep_count+=number
-
-    #data
-    meta = aliased(Metadata)
-    load_fields = [
-        meta.document_id,
-        meta.paper_id,
-        meta.updated,
-        meta.source_flags,
-        meta.title,
-        meta.authors,
-        meta.abs_categories,
-        meta.comments,
-        meta.journal_ref,
-        meta.version,
-        meta.modtime,
-    ]
-    if include_abs:
-        load_fields.append(meta.abstract)
-
-    #sort, limit and fetch
-    results=(
-        Session.query(
-            listing_type,
-            meta
-        )
-        .join(meta, meta.document_id == all_items.c.document_id)
-        .filter(listing_type.label('case_order').in_(valid_types))
-        .filter(meta.is_current ==1)
-        .order_by(case_order, meta.paper_id)
-        .offset(offset)
-        .limit(CATCHUP_LIMIT)
-        .options(load_only(*load_fields, raiseload=True))
-        .all()
-    )
-
-    #process similar to listings
-    items=[]
-    for row in results:
-        listing_case, metadata = row
-        if listing_case=="repcross":
-            listing_case="rep"
-        item= _metadata_to_listing_item(metadata, listing_case)
-        items.append(item)
-
-    return ListingNew(listings=items, 
-                      new_count=new_count, 
-                      cross_count=cross_count, 
-                      rep_count=rep_count, 
-                      announced=day,
-                      expires=gen_expires())
+    return _announcement_of(all_items, listing_type, case_order, day)
 
 def get_next_announce_day(day: date)->Optional[date]:
     """returns the next day with announcements after the parameter day
@@ -175,6 +147,15 @@ def get_next_announce_day(day: date)->Optional[date]:
 
     return mail_id_to_date(next_day[0])
 
+def get_latest_announce_day()->Optional[date]:
+    """returns the day of the most recent written mailing, None if there are none"""
+    latest = (
+        Session.query(func.max(NextMail.mail_id))
+        .filter(NextMail.is_written ==1)
+        .scalar()
+    )
+    return mail_id_to_date(latest) if latest else None
+
 def date_to_mail_id(day:date)->str:
     """converts a date to the mail_id it would have"""
     return f"{(day.year-2000):02d}{day.month:02d}{day.day:02d}"
@@ -0,0 +1,144 @@
+"""In-process index of member institution IP ranges.
+
+The institutional banner looks up the institution of the visitor's IP on
+every page view. Done in the DB that is a range scan over
+`MemberInstitutionIP` and a group by for the exclusions on each hit.
+
+`InstitutionIPIndex` is made from all the ranges at once. The ranges are cut
+into non overlapping segments, each with the institution it resolves to, in
+a sorted list of segment starts, so a lookup is one binary search. The index
+is loaded again every `INSTITUTION_IP_INDEX_TTL` seconds by one request while
+the others keep using the old one, and the new one replaces it with a single
+assignment.
+
+As in the DB query an IP belongs to an institution if one of the
+institution's ranges includes it and none of its exclusion ranges do. When
+more than one institution has the IP the one with the lowest id is used.
+IPv4 and IPv6 ranges are kept apart by the size of their ends, and IPv4
+mapped IPv6 addresses are looked up as IPv4.
+"""
+import ipaddress
+import logging
+import time
+from bisect import bisect_right
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from arxiv.db import Session
+from arxiv.db.models import MemberInstitution, MemberInstitutionIP
+
+from browse.services.single_flight import coalesce
+
+logger = logging.getLogger(__name__)
+
+IPV4_END = 2 ** 32
+"""Ranges that end below this are IPv4."""
+
+IPRange = Tuple[int, str, int, int, bool]
+"""Institution id, label, start and end IP as ints and if it is an exclusion."""
+
+_index: Optional["InstitutionIPIndex"] = None
+_loaded = 0.0
+_refresh_lock = Lock()
+# The process wide index, see `get_institution_index()`.
+
+
+class _Segments:
+    """Sorted, non overlapping segments of one IP version.
+
+    `starts[i]` is the first IP of segment i, which lasts to the start of the
+    next one, and `owners[i]` is the institution id it resolves to or `None`."""
+
+    def __init__(self, ranges: Iterable[IPRange]):
+        events: Dict[int, List[Tuple[int, bool, int]]] = {}
+        for inst_id, _, start, end, exclude in ranges:
+            events.setdefault(start, []).append((inst_id, exclude, 1))
+            events.setdefault(end + 1, []).append((inst_id, exclude, -1))
+
+        covering: Dict[int, int] = {}
+        excluding: Dict[int, int] = {}
+        eligible: Set[int] = set()
+        self.starts: List[int] = []
+        self.owners: List[Optional[int]] = []
+        for pos in sorted(events):
+            changed = set()
+            for inst_id, exclude, delta in events[pos]:
+                counts = excluding if exclude else covering
+                counts[inst_id] = counts.get(inst_id, 0) + delta
+                changed.add(inst_id)
+            for inst_id in changed:
+                if covering.get(inst_id, 0) > 0 and not excluding.get(inst_id, 0):
+                    eligible.add(inst_id)
+                else:
+                    eligible.discard(inst_id)
+            owner = min(eligible) if eligible else None
+            if not self.owners or self.owners[-1] != owner:
+                self.starts.append(pos)
+                self.owners.append(owner)
+
+    def lookup(self, ip: int) -> Optional[int]:
+        i = bisect_right(self.starts, ip) - 1
+        return self.owners[i] if i >= 0 else None
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class InstitutionIPIndex:
+    """Lookup of the member institution of an IP, made from all the IP ranges."""
+
+    def __init__(self, ranges: Iterable[IPRange]):
+        ranges = list(ranges)
+        self.labels: Dict[int, str] = {inst_id: label for inst_id, label, _, _, _ in ranges}
+        self.ipv4 = _Segments(r for r in ranges if r[3] < IPV4_END)
+        self.ipv6 = _Segments(r for r in ranges if r[3] >= IPV4_END)
+
+    def lookup(self, ip: str) -> Optional[Tuple[int, str]]:
+        """Gets the id and label of the institution of `ip` or `None`.
+
+        Raises `ValueError` if `ip` is not an IPv4 or IPv6 address."""
+        address = ipaddress.ip_address(ip)
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        segments = self.ipv4 if address.version == 4 else self.ipv6
+        inst_id = segments.lookup(int(address))
+        return (inst_id, self.labels[inst_id]) if inst_id is not None else None
+
+
+def load_institution_ip_index() -> InstitutionIPIndex:
+    """Makes an `InstitutionIPIndex` of all the ranges in the DB."""
+    rows = Session.execute(
+        select(MemberInstitution.id, MemberInstitution.label,
+               MemberInstitutionIP.start, MemberInstitutionIP.end, MemberInstitutionIP.exclude)
+        .join(MemberInstitutionIP)
+    ).all()
+    return InstitutionIPIndex((int(inst_id), label, int(start), int(end), bool(exclude))
+                              for inst_id, label, start, end, exclude in rows)
+
+
+def get_institution_index() -> Optional[InstitutionIPIndex]:
+    """Gets the process wide `InstitutionIPIndex`, loading it if it is missing or old.
+
+    Returns `None` if it is disabled with `INSTITUTION_IP_INDEX_TTL` of 0. If
+    loading a newer index fails the old one is used until the next refresh."""
+    global _index, _loaded
+    ttl = int(current_app.config.get("INSTITUTION_IP_INDEX_TTL", 0))
+    if ttl <= 0:
+        return None
+    index = _index
+    if index is None:
+        index = coalesce("institution_ip_index", "load", load_institution_ip_index)
+        _index, _loaded = index, time.monotonic()
+    elif time.monotonic() - _loaded > ttl and _refresh_lock.acquire(blocking=False):
+        try:
+            index = load_institution_ip_index()
+            _index = index
+        except Exception as ex:
+            logger.warning("Could not refresh the institution IP index, keeping the old one: %s", ex)
+        finally:
+            _loaded = time.monotonic()
+            _refresh_lock.release()
+    return index
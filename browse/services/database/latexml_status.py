@@ -0,0 +1,115 @@
+"""In-process cache of the LaTeXML conversion status and publish time of papers.
+
+An /abs page asks the latexml DB for the same row twice, once for the status
+to decide on the HTML link and once for the publish time for the
+`Last-Modified` header. Listing pages ask for the status of every paper on the
+page on each render.
+
+`LatexmlStatusCache` keeps a `LatexmlRecord` of both for each (paper_id,
+version). Lookups of one or many papers are answered from it and the papers
+that are missing are read with one query. Papers without a row in the latexml
+DB are cached too, as a record of `None`s, so that they are not asked for on
+every page. Entries are dropped after `LATEXML_STATUS_CACHE_TTL` seconds so a
+conversion that finishes shows up after at most that long.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import select, tuple_
+
+from arxiv.db import Session
+from arxiv.db.models import DBLaTeXMLDocuments
+
+from browse.services.cache import LRUCache
+from browse.services.single_flight import coalesce
+
+PaperVersion = Tuple[str, int]
+"""A paper id and version."""
+
+BATCH_SIZE = 500
+"""Max number of papers in one query."""
+
+_cache: Optional["LatexmlStatusCache"] = None
+# Shared by all requests in the process, see `get_latexml_status_cache()`.
+
+
+class LatexmlRecord(NamedTuple):
+    """The latexml DB row of a paper version, all `None` if it has none."""
+    conversion_status: Optional[int] = None
+    publish_dt: Optional[datetime] = None
+
+
+def load_latexml_records(keys: Iterable[PaperVersion]) -> Dict[PaperVersion, LatexmlRecord]:
+    """Reads the `LatexmlRecord` of each of `keys` from the latexml DB.
+
+    Keys without a row get an empty record."""
+    wanted = list(dict.fromkeys(keys))
+    records = {key: LatexmlRecord() for key in wanted}
+    for start in range(0, len(wanted), BATCH_SIZE):
+        rows = Session.execute(
+            select(DBLaTeXMLDocuments.paper_id,
+                   DBLaTeXMLDocuments.document_version,
+                   DBLaTeXMLDocuments.conversion_status,
+                   DBLaTeXMLDocuments.publish_dt)
+            .filter(tuple_(DBLaTeXMLDocuments.paper_id, DBLaTeXMLDocuments.document_version)
+                    .in_(wanted[start:start + BATCH_SIZE]))
+        ).all()
+        for paper_id, version, status, publish_dt in rows:
+            records[(paper_id, version)] = LatexmlRecord(
+                status, publish_dt.replace(tzinfo=timezone.utc) if publish_dt else None)
+    return records
+
+
+class LatexmlStatusCache:
+    """`LatexmlRecord`s by (paper_id, version)."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self._cache: LRUCache[PaperVersion, LatexmlRecord] = LRUCache(maxsize, ttl)
+
+    def get(self, paper_id: str, version: int) -> LatexmlRecord:
+        """Gets the record of one paper version, reading it if it is not cached."""
+        key = (paper_id, version)
+        found = self._cache.get(key)
+        if found is not None:
+            return found
+        return coalesce("latexml_status", key, lambda: self._load([key])[key])
+
+    def get_many(self, keys: Iterable[PaperVersion]) -> Dict[PaperVersion, LatexmlRecord]:
+        """Gets the records of `keys`, reading all the missing ones with one query."""
+        found: Dict[PaperVersion, LatexmlRecord] = {}
+        missing: List[PaperVersion] = []
+        for key in dict.fromkeys(keys):
+            record = self._cache.get(key)
+            if record is None:
+                missing.append(key)
+            else:
+                found[key] = record
+        if missing:
+            found.update(self._load(missing))
+        return found
+
+    def _load(self, keys: List[PaperVersion]) -> Dict[PaperVersion, LatexmlRecord]:
+        records = load_latexml_records(keys)
+        for key, record in records.items():
+            self._cache.put(key, record)
+        return records
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
+
+
+def get_latexml_status_cache() -> Optional[LatexmlStatusCache]:
+    """Gets the process wide `LatexmlStatusCache`.
+
+    Returns `None` if it is disabled with `LATEXML_STATUS_CACHE_SIZE` of 0."""
+    global _cache
+    size = int(current_app.config.get("LATEXML_STATUS_CACHE_SIZE", 0))
+    if size <= 0:
+        return None
+    if _cache is None:
+        _cache = LatexmlStatusCache(size, current_app.config.get("LATEXML_STATUS_CACHE_TTL", None))
+    return _cache
@@ -1,12 +1,16 @@
-from datetime import  datetime
+from datetime import  date, datetime
 from dateutil.tz import gettz
-from typing import List, Optional, Tuple, Set, Union
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Set, Union
 
 from sqlalchemy import case, distinct, or_, and_, desc
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.sql import func
+from sqlalchemy.sql.elements import Label
 from sqlalchemy.engine import Row
 from sqlalchemy.orm import aliased, load_only
+from sqlalchemy.sql.selectable import Subquery
 
 from browse.services.listing import (
     MonthCount,
@@ -28,14 +32,42 @@ from arxiv.document.version import VersionEntry, SourceFlag
 from arxiv.base.globals import get_application_config
 from arxiv.base import logging
 from werkzeug.exceptions import BadRequest
+from flask import current_app
+
+from browse.services.database.announcement_index import (
+    Announcement,
+    Row as AnnouncementRow,
+    announcement_page,
+    get_announcement_index
+)
+from browse.services.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 app_config = get_application_config()
 tz = gettz(app_config.get("ARXIV_BUSINESS_TZ"))
 
+PageBoundary = Tuple[int, Tuple[int, str]]
+"""position in a listing and the (is_primary, paper_id) of the item before it"""
+
+_page_boundaries: Optional["PageBoundaries"] = None
+# Shared by all requests in the process, see get_page_boundaries()
+
 def get_new_listing(archive_or_cat: str,skip: int, show: int) -> ListingNew:
     "gets the most recent day of listings for an archive or category"
+    mail_date=_latest_mail_date()
+    announcement, rows = announcement_page(
+        get_announcement_index(), "new", archive_or_cat, str(mail_date),
+        lambda: _new_announcement(archive_or_cat, mail_date), skip, show)
+
+    return ListingNew(listings=_rows_to_listing_items(rows, include_abs=True),
+                      new_count=announcement.new_count,
+                      cross_count=announcement.cross_count,
+                      rep_count=announcement.rep_count,
+                      announced=mail_date,
+                      expires=gen_expires())
 
+def _new_announcement(archive_or_cat: str, mail_date: Optional[date]) -> Tuple[Announcement, List[AnnouncementRow]]:
+    """counts and ordered rows of the listing of the mailing on mail_date for the new page"""
     category_list=_all_possible_categories(archive_or_cat)
     archives, cats=_request_categories(archive_or_cat)
 
@@ -49,14 +81,13 @@ def get_new_listing(archive_or_cat: str,skip: int, show: int) -> ListingNew:
         else_=3 
     ).label('case_order')
         
-    recent_date=Session.query(func.max(up.date)).scalar_subquery()
     doc_ids=(
         Session.query(
             up.document_id,
             up.date,
             up.action
         )
-        .filter(up.date==recent_date)
+        .filter(up.date==mail_date)
         .filter(up.version<6)
         .filter(up.action!="absonly")
         .filter(up.category.in_(category_list))
@@ -109,91 +140,30 @@ def get_new_listing(archive_or_cat: str,skip: int, show: int) -> ListingNew:
         else_=4 
     ).label('case_order')
 
-    valid_types=["new", "cross", 'rep','repcross']
+    return _announcement_of(all, listing_type, case_order, mail_date)
 
-    #how many of each type
-    counts = (
-        Session.query(
-            listing_type,
-            func.count().label('type_count')
-        )
-        .filter(listing_type.label('case_order').in_(valid_types))
-        .group_by(listing_type)
-        .order_by(case_order)
-        .all() 
-    )
-
-    new_count=0
-    cross_count=0
-    rep_count=0
-    for name, number in counts:
-        if name =="new":
-            new_count+=number
-        elif name=="cross":
-            cross_count+=number
-        else: #rep and repcross
-            rep_count+=number
+def get_recent_listing(archive_or_cat: str,skip: int, show: int) -> Listing:
+    "gets the listings of the 5 most recent mailings for an archive or category"
+    mail_date=_latest_mail_date()
+    announcement, rows = announcement_page(
+        get_announcement_index(), "recent", archive_or_cat, str(mail_date),
+        lambda: _recent_announcement(archive_or_cat, mail_date), skip, show)
 
-    #data for listings to be displayed
-    meta = aliased(Metadata)
-    results = (
-        Session.query(
-            listing_type,
-            meta,
-            all.c.date
-        )
-        .join(meta, meta.document_id == all.c.document_id)
-        .filter(listing_type.label('case_order').in_(valid_types))
-        .filter(meta.is_current ==1)
-        .order_by(case_order, meta.paper_id)
-        .offset(skip)
-        .limit(show)
-        .options(load_only(
-            meta.document_id,
-            meta.paper_id,
-            meta.updated,
-            meta.source_flags,
-            meta.title,
-            meta.authors,
-            meta.abs_categories,
-            meta.comments,
-            meta.journal_ref,
-            meta.version,
-            meta.modtime,
-            meta.abstract,
-            raiseload= True
-            ))
-        .all() 
+    return Listing(
+        listings=_rows_to_listing_items(rows, include_abs=False),
+        pubdates=announcement.pubdates,
+        count=sum(number for _, number in announcement.pubdates),
+        expires=gen_expires()
     )
 
-    #organize results into expected listing
-    items=[]
-    for row in results:
-        listing_case, metadata, _ = row
-        if listing_case=="repcross":
-            listing_case="rep"
-        item= _metadata_to_listing_item(metadata, listing_case)
-        items.append(item)
-
-    if len(items)==0: #no results to find the last mailing day from
-        mail_date=Session.query(func.max(up.date)).scalar()
-    else:
-        mail_date=results[0][2] 
-
-    return ListingNew(listings=items, 
-                      new_count=new_count, 
-                      cross_count=cross_count, 
-                      rep_count=rep_count, 
-                      announced=mail_date,
-                      expires=gen_expires())
-
-def get_recent_listing(archive_or_cat: str,skip: int, show: int) -> Listing:
-
+def _recent_announcement(archive_or_cat: str, mail_date: Optional[date]) -> Tuple[Announcement, List[AnnouncementRow]]:
+    """daily counts and ordered rows of the 5 mailings up to mail_date for the recent page"""
     category_list=_all_possible_categories(archive_or_cat)
     archives, cats=_request_categories(archive_or_cat)
     up=aliased(Updates)
     dates = (
         Session.query(distinct(up.date).label("date"))
+        .filter(up.date<=mail_date)
         .order_by(desc(up.date))
         .limit(5)
         .subquery()
@@ -253,56 +223,112 @@ def get_recent_listing(archive_or_cat: str,skip: int, show: int) -> Listing:
     result=(
         Session.query(
             all.c.is_primary,
-            meta
+            meta.document_id
         )
         .join(meta, meta.document_id == all.c.document_id)
         .filter(meta.is_current ==1)
         .order_by(desc(all.c.date), desc(all.c.is_primary), desc(meta.paper_id))
-        .offset(skip)
-        .limit(show)
-        .options(load_only(
-            meta.document_id,
-            meta.paper_id,
-            meta.updated,
-            meta.source_flags,
-            meta.title,
-            meta.authors,
-            meta.abs_categories,
-            meta.comments,
-            meta.journal_ref,
-            meta.version,
-            meta.modtime,
-            raiseload= True
-            ))
+        .all()
+    )
+    rows=[(doc_id, "new" if primary else "cross") for primary, doc_id in result]
+
+    return Announcement(announced=mail_date,
+                        size=len(rows),
+                        pubdates=[(day, number) for day, number in counts]), rows
+
+def rebuild_announcements(archive_or_cat: str) -> None:
+    """builds the new and recent listings of the latest mailing for archive_or_cat into the announcement index"""
+    index=get_announcement_index()
+    mail_date=_latest_mail_date()
+    index.record("new", archive_or_cat, str(mail_date), *_new_announcement(archive_or_cat, mail_date))
+    index.record("recent", archive_or_cat, str(mail_date), *_recent_announcement(archive_or_cat, mail_date))
+
+def _announcement_of(items: Subquery, listing_type: Label, case_order: Label,
+                     announced: Optional[date]) -> Tuple[Announcement, List[AnnouncementRow]]:
+    """counts and ordered rows of the listing of items, a subquery with a document_id column,
+    by type of listing
+
+    The counts and rows come from the same query so they always agree. Items with no
+    current metadata are counted but not listed, as when these were separate queries."""
+    valid_types=["new", "cross", 'rep','repcross']
+    meta = aliased(Metadata)
+    results = (
+        Session.query(
+            listing_type,
+            meta.document_id
+        )
+        .select_from(items)
+        .outerjoin(meta, and_(meta.document_id == items.c.document_id, meta.is_current ==1))
+        .filter(listing_type.label('case_order').in_(valid_types))
+        .order_by(case_order, meta.paper_id)
         .all()
     )
 
-    total=0
-    daily_counts=[]
-    for count in counts:
-        day, number = count
-        daily_counts.append((day, number))
-        total+=number
-
-    items=[]
-    for row in result:
-        primary=row[0]
-        metadata: Metadata=row[1]
-        listing_case: AnnounceTypes
-        if primary:
-            listing_case="new"
-        else:
-            listing_case="cross"
-        metadata.abstract="" #abstract uneeded but will be referenced
-        item= _metadata_to_listing_item(metadata, listing_case)
-        items.append(item)
+    new_count=0
+    cross_count=0
+    rep_count=0
+    rows=[]
+    for listing_case, doc_id in results:
+        if listing_case =="new":
+            new_count+=1
+        elif listing_case=="cross":
+            cross_count+=1
+        else: #rep and repcross
+            rep_count+=1
+            listing_case="rep"
+        if doc_id is not None:
+            rows.append((doc_id, listing_case))
+
+    return Announcement(announced=announced,
+                        size=len(rows),
+                        new_count=new_count,
+                        cross_count=cross_count,
+                        rep_count=rep_count), rows
+
+def _latest_mail_date() -> Optional[date]:
+    """date of the most recent mailing"""
+    return Session.query(func.max(Updates.date)).scalar() # type: ignore
+
+def _rows_to_listing_items(rows: List[AnnouncementRow], include_abs: bool) -> List[ListingItem]:
+    """gets the metadata of the documents of the rows of an announcement in one query
+    and makes them into listing items in the same order"""
+    if not rows:
+        return []
+    meta = aliased(Metadata)
+    load_fields = [
+        meta.document_id,
+        meta.paper_id,
+        meta.updated,
+        meta.source_flags,
+        meta.title,
+        meta.authors,
+        meta.abs_categories,
+        meta.comments,
+        meta.journal_ref,
+        meta.version,
+        meta.modtime,
+    ]
+    if include_abs:
+        load_fields.append(meta.abstract)
 
-    return Listing(
-        listings=items,
-        pubdates=daily_counts,
-        count=total,
-        expires=gen_expires()
+    results = (
+        Session.query(meta)
+        .filter(meta.document_id.in_([doc_id for doc_id, _ in rows]))
+        .filter(meta.is_current ==1)
+        .options(load_only(*load_fields, raiseload=True))
+        .all()
     )
+    by_id={metadata.document_id: metadata for metadata in results}
+
+    items=[]
+    for doc_id, listing_case in rows:
+        metadata=by_id.get(doc_id)
+        if metadata is None: #changed since the index was built
+            continue
+        if not include_abs:
+            metadata.abstract="" #abstract uneeded but will be referenced
+        items.append(_metadata_to_listing_item(metadata, listing_case)) # type: ignore
+    return items
 
 
 def get_articles_for_month(
@@ -371,29 +397,59 @@ def get_articles_for_month(
         .filter(meta.is_current == 1)
     )
 
-    rows=( 
-        main_query.order_by(cat_query.c.is_primary.desc(), meta.paper_id)
-        .offset(skip)
-        .limit(show)
-        .options(load_only(
-            meta.document_id,
-            meta.paper_id,
-            meta.updated,
-            meta.source_flags,
-            meta.title,
-            meta.authors,
-            meta.abs_categories,
-            meta.comments,
-            meta.journal_ref,
-            meta.version,
-            meta.modtime,
-            raiseload= True
+    def page(start: Optional[PageBoundary], offset: int) -> List[Row]:
+        query=main_query
+        if start:
+            #keyset: continue after the last item of an earlier page instead of skipping over it
+            _, (primary, paper_id) = start
+            query=query.filter(or_(
+                cat_query.c.is_primary < primary,
+                and_(cat_query.c.is_primary == primary, meta.paper_id > paper_id)
             ))
+        return (
+            #total entries with each row so the count and page come from one query
+            query.add_columns(func.count().over().label('total'))
+            .order_by(cat_query.c.is_primary.desc(), meta.paper_id)
+            .offset(offset)
+            .limit(show)
+            .options(load_only(
+                meta.document_id,
+                meta.paper_id,
+                meta.updated,
+                meta.source_flags,
+                meta.title,
+                meta.authors,
+                meta.abs_categories,
+                meta.comments,
+                meta.journal_ref,
+                meta.version,
+                meta.modtime,
+                raiseload= True
+                ))
+            .all()
         )
-    
-    result=rows.all() #get listings to display
-    count=main_query.count() #get total entries 
-    new_listings, cross_listings = _entries_into_monthly_listing_items(result)
+
+    key=(archive_or_cat, year, month)
+    boundaries=get_page_boundaries()
+    start=boundaries.nearest(key, skip) if boundaries else None
+    result=page(start, skip - start[0] if start else skip) #get listings to display
+    if boundaries and start and not (result and boundaries.agrees(key, result[0].total + start[0])):
+        #items changed since the boundaries were recorded
+        boundaries.forget(key)
+        start=None
+        result=page(None, skip)
+    if result:
+        count=result[0].total + (start[0] if start else 0)
+    elif skip>0: #past the end, no rows to get the total from
+        count=main_query.count()
+    else:
+        count=0
+    if boundaries and result:
+        last, primary, _ = result[-1]
+        boundaries.record(key, count, skip + len(result), (primary, last.paper_id))
+
+    new_listings, cross_listings = _entries_into_monthly_listing_items(
+        [(metadata, primary) for metadata, primary, _ in result])
 
     if not month:
         month=1 #yearly listings need a month for datetime
@@ -405,6 +461,61 @@ def get_articles_for_month(
         expires=gen_expires(),
     )
 
+class PageBoundaries:
+    """keyset cursors for pages of month and year listings, by archive or category, year and month
+
+    A cursor is the (is_primary, paper_id) of the last item before a position in the listing.
+    With one for a page's skip, or near it, the page is a range query after the cursor rather
+    than an offset that makes the DB go through every earlier row. The cursors of a listing
+    are only used while its count is the same as when they were recorded.
+
+    The cursors of a listing are an immutable mapping that is replaced, not changed, when one
+    is recorded so readers never see it change under them."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self._cache: LRUCache[Tuple[str, int, Optional[int]], Tuple[int, Mapping[int, Tuple[int, str]]]] = \
+            LRUCache(maxsize, ttl)
+        self._lock = Lock()
+
+    def nearest(self, key: Tuple[str, int, Optional[int]], skip: int) -> Optional[PageBoundary]:
+        """the cursor with the highest position not past skip"""
+        entry=self._cache.get(key)
+        if entry is None or skip <= 0:
+            return None
+        positions=[position for position in entry[1] if position <= skip]
+        if not positions:
+            return None
+        position=max(positions)
+        return position, entry[1][position]
+
+    def agrees(self, key: Tuple[str, int, Optional[int]], count: int) -> bool:
+        entry=self._cache.get(key)
+        return entry is not None and entry[0] == count
+
+    def record(self, key: Tuple[str, int, Optional[int]], count: int, position: int, cursor: Tuple[int, str]) -> None:
+        with self._lock:
+            entry=self._cache.get(key)
+            cursors: Dict[int, Tuple[int, str]] = {} if entry is None or entry[0] != count else dict(entry[1])
+            cursors[position]=cursor
+            self._cache.put(key, (count, MappingProxyType(cursors)))
+
+    def forget(self, key: Tuple[str, int, Optional[int]]) -> None:
+        self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def get_page_boundaries() -> Optional[PageBoundaries]:
+    """the process wide PageBoundaries, None if disabled with LISTING_PAGE_BOUNDARY_CACHE_SIZE of 0"""
+    global _page_boundaries
+    size = int(current_app.config.get("LISTING_PAGE_BOUNDARY_CACHE_SIZE", 0))
+    if size <= 0:
+        return None
+    if _page_boundaries is None:
+        _page_boundaries = PageBoundaries(size, current_app.config.get("LISTING_PAGE_BOUNDARY_CACHE_TTL", None))
+    return _page_boundaries
+
 def _metadata_to_listing_item(meta: Metadata, type: AnnounceTypes) -> ListingItem:
     """"turns rows of document and category into a underfilled version of DocMetadata.
     Underfilled to match the behavior of fs_listings, omits data not needed for listing items
@@ -6,7 +6,11 @@ import logging
 from browse.services.documents import get_doc_service
 from browse.services.global_object_store import get_global_object_store, one_time_file
 
+from .anc_manifest import AncillaryManifests
 from .article_store import ArticleStore
+from .condition_cache import ConditionCache
+from .html_manifest import HtmlManifestCache
+from .source_index import SqliteSourceIndex
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +45,19 @@ def get_article_store() -> "ArticleStore":
             get_global_object_store(config["GENPDF_API_STORAGE_PREFIX"], "_genpdf_store"),
             get_global_object_store(config["LATEXML_BUCKET"], "_latexml_store"),
             get_reasons_data(reason_file),
+            source_index=SqliteSourceIndex(config["SOURCE_INDEX_PATH"])
+            if config.get("SOURCE_INDEX_PATH") else None,
+            condition_cache=ConditionCache(config["CONDITION_CACHE_SIZE"],
+                                           config["CONDITION_CACHE_STABLE_TTL"],
+                                           config["CONDITION_CACHE_TRANSIENT_TTL"])
+            if config.get("CONDITION_CACHE_SIZE", 0) > 0 else None,
+            anc_manifests=AncillaryManifests(config.get("ANCILLARY_MANIFEST_PATH", ""),
+                                             config.get("ANCILLARY_MANIFEST_CACHE_SIZE", 4096))
+            if config.get("ANCILLARY_MANIFEST_PATH")
+            or config.get("ANCILLARY_MANIFEST_CACHE_SIZE", 4096) > 0 else None,
+            html_manifests=HtmlManifestCache(config["NATIVE_HTML_MANIFEST_CACHE_SIZE"],
+                                             config.get("NATIVE_HTML_MANIFEST_CACHE_TTL", None))
+            if config.get("NATIVE_HTML_MANIFEST_CACHE_SIZE", 0) > 0 else None,
         )
 
     return _article_store
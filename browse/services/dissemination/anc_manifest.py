@@ -0,0 +1,77 @@
+"""Lists of the ancillary files in source tarballs.
+
+The /abs sidebar and the /src/<id>/anc page of a paper with ancillary files
+list them with `list_ancillary_files()`, which reads all the tar headers of the
+source. The list only changes when the source does.
+
+`AncillaryManifests` keeps the list for each source file by its key and etag.
+`SourceStore` fills it the first time a paper's files are listed, or it can be
+filled ahead of time with `flask anc_manifest backfill`. Later lists need only
+the `FileObj` of the source, which with a `SourceIndex` is a point lookup.
+
+The manifests are in a SQLite file at `ANCILLARY_MANIFEST_PATH`, shared by the
+worker processes on a host. Without a path each process keeps the most recently
+used `ANCILLARY_MANIFEST_CACHE_SIZE` of them in memory.
+"""
+import json
+import logging
+import sqlite3
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from browse.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class AncillaryManifests:
+    """Ancillary file names and sizes of source files, by key and etag.
+
+    The connection is shared by threads and guarded by a lock. Lookups are
+    primary key reads so holding the lock is brief.
+
+    Without a `path` they are in an `LRUCache` of `maxsize` sources instead."""
+
+    def __init__(self, path: str = "", maxsize: int = 4096):
+        self.path = path
+        self._cache: Optional[LRUCache[str, Tuple[str, List[Dict]]]] = None
+        if not path:
+            self._cache = LRUCache(maxsize)
+            return
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS anc_manifest ("
+                               "src_key TEXT PRIMARY KEY, "
+                               "etag TEXT NOT NULL, "
+                               "files TEXT NOT NULL)")
+
+    def lookup(self, src_key: str, etag: str) -> Optional[List[Dict]]:
+        """Gets the files of `src_key` or `None` if it is missing or was for another etag."""
+        if self._cache is not None:
+            found = self._cache.get(src_key)
+            if found is None or found[0] != str(etag):
+                return None
+            return [dict(file) for file in found[1]]
+        with self._lock:
+            row = self._conn.execute("SELECT etag, files FROM anc_manifest WHERE src_key = ?",
+                                     (src_key,)).fetchone()
+        if row is None or row[0] != str(etag):
+            return None
+        return list(json.loads(row[1]))
+
+    def record(self, src_key: str, etag: str, files: List[Dict]) -> None:
+        """Adds or replaces the files of `src_key`."""
+        if self._cache is not None:
+            self._cache.put(src_key, (str(etag), [dict(file) for file in files]))
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO anc_manifest (src_key, etag, files) VALUES (?, ?, ?)",
+                (src_key, str(etag), json.dumps(files)))
+
+    def __len__(self) -> int:
+        if self._cache is not None:
+            return len(self._cache)
+        with self._lock:
+            return int(self._conn.execute("SELECT count(*) FROM anc_manifest").fetchone()[0])
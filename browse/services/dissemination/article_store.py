@@ -9,7 +9,6 @@ from collections.abc import Callable
 from typing import Dict, List, Literal, Optional, Tuple, Union, get_args
 from urllib.parse import urlparse
 
-import requests
 from arxiv.document.exceptions import (
     AbsDeletedException, AbsNotFoundException, AbsVersionNotFoundException)
 from arxiv.document.metadata import DocMetadata, VersionEntry
@@ -27,6 +26,13 @@ from google.auth.exceptions import DefaultCredentialsError
 
 from browse.services.documents.base_documents import DocMetadataService
 from browse.services.documents.config.deleted_papers import DELETED_PAPERS
+from browse.services.global_object_store import first_existing
+from browse.services.single_flight import coalesce
+from .anc_manifest import AncillaryManifests
+from .condition_cache import ConditionCache, ConditionKey, condition_key
+from .genpdf_client import GenpdfClient
+from .html_manifest import HtmlManifestCache
+from .source_index import SourceIndex
 from .source_store import SourceStore
 
 logger = logging.getLogger(__file__)
@@ -139,6 +145,10 @@ class ArticleStore:
                  latexml_store: ObjectStore,
                  reasons_data: Dict[str, str] = {},
                  is_deleted: Callable[[str], str] = _is_deleted,
+                 source_index: Optional[SourceIndex] = None,
+                 condition_cache: Optional[ConditionCache] = None,
+                 anc_manifests: Optional[AncillaryManifests] = None,
+                 html_manifests: Optional[HtmlManifestCache] = None,
                  ):
         """
 
@@ -157,14 +167,24 @@ class ArticleStore:
         reasons_data: Dict of reasons for lack of specific paper's PDFs.
 
         is_deleted: Dict of Paper ids that are deleted.
+
+        source_index: Optional index of source file keys, avoids listing `src_store`.
+
+        condition_cache: Optional cache of conditions returned by `dissemination()`.
+
+        anc_manifests: Optional store of the ancillary file lists of source files.
+
+        html_manifests: Optional cache of the file listings of native HTML papers.
         """
         self.metadataservice = metaservice
         self.cache_store: ObjectStore = cache_store
         self.genpdf_store: ObjectStore = genpdf_store
         self.latexml_store: ObjectStore = latexml_store
         self.is_deleted = is_deleted
-        self.source_store = SourceStore(src_store)
+        self.source_store = SourceStore(src_store, source_index, anc_manifests)
         self.reasons_data = reasons_data
+        self.condition_cache = condition_cache
+        self.html_manifests = html_manifests
 
         self.format_handlers: Dict[Acceptable_Format_Requests, FHANDLER] = {
             fileformat.pdf: self._pdf,
@@ -173,6 +193,7 @@ class ArticleStore:
             fileformat.html: self._html
         }
 
+        self._genpdf_client: Optional[GenpdfClient] = None
         self.service_identity = None
         genpdf_api = current_app.config.get("GENPDF_API_URL")
         genpdf_api
@@ -252,6 +273,35 @@ class ArticleStore:
         if reason := self.reasons(arxiv_id, format):
             return KnownReason(reason, format)
 
+        key = condition_key(format if isinstance(format, str) else format.id, arxiv_id)
+        # Concurrent requests for the same paper and format share one lookup
+        return coalesce("dissemination", key,
+                        lambda: self._cached_dissemination(key, format, arxiv_id, docmeta))
+
+    def _cached_dissemination(self,
+                              key: ConditionKey,
+                              format: Acceptable_Format_Requests,
+                              arxiv_id: Identifier,
+                              docmeta: Optional[DocMetadata] = None) \
+            -> Union[Conditions, Tuple[Union[FileObj,List[FileObj]], DocMetadata, VersionEntry]]:
+        """Does `_dissemination()` using the `condition_cache` if there is one."""
+        if self.condition_cache is None:
+            return self._dissemination(format, arxiv_id, docmeta)
+
+        cached = self.condition_cache.get(key)
+        if cached is not None:
+            return cached  # type: ignore
+        result = self._dissemination(format, arxiv_id, docmeta)
+        if isinstance(result, str):
+            self.condition_cache.put(key, result, arxiv_id.has_version)
+        return result
+
+    def _dissemination(self,
+                       format: Acceptable_Format_Requests,
+                       arxiv_id: Identifier,
+                       docmeta: Optional[DocMetadata] = None) \
+            -> Union[Conditions, Tuple[Union[FileObj,List[FileObj]], DocMetadata, VersionEntry]]:
+        """Does the lookups of `dissemination()` that are not cheap."""
         try:
             if docmeta is None:
                 # Pass `arxiv_id` directly, so that if a version is provided it will be used.
@@ -361,14 +411,14 @@ class ArticleStore:
         if version.source_flag.cannot_pdf or version.source_format == "html":
             return "NOT_PDF"
 
-        ps_cache_pdf = self.cache_store.to_obj(ps_cache_pdf_path(arxiv_id, version.version))
-        if ps_cache_pdf.exists():
-            return ps_cache_pdf
-
+        ps_cache_pdf = ps_cache_pdf_path(arxiv_id, version.version)
         current = version.is_current or not arxiv_id.has_version or arxiv_id.version == docmeta.highest_version()
-        pdf_file = self.source_store.get_src_pdf(arxiv_id, current)
-        if pdf_file and pdf_file.exists():
-            return pdf_file
+        pdf_file = self.source_store.src_pdf_path(arxiv_id, current)
+        # Get and probe both at once, the PS cache PDF is preferred if both exist
+        found = first_existing([lambda: self.cache_store.to_obj(ps_cache_pdf),
+                                lambda: self.source_store.objstore.to_obj(pdf_file)])
+        if found is not None:
+            return found
 
         if is_genpdf_able(arxiv_id):
             return self._genpdf(arxiv_id, docmeta, version)
@@ -377,37 +427,33 @@ class ArticleStore:
             return "NO_SOURCE"
 
         logger.debug("No PDF found for %s, source exists and is not WDR, tried %s", arxiv_id.idv,
-                     [str(ps_cache_pdf), str(pdf_file)])
+                     [ps_cache_pdf, pdf_file])
         return "UNAVAILABLE"
 
+    def genpdf_client(self) -> GenpdfClient:
+        """Gets the client for the genpdf-api, it is made on first use."""
+        if self._genpdf_client is None:
+            config = current_app.config
+            self._genpdf_client = GenpdfClient(config.get("GENPDF_API_URL", ""),
+                                               config.get("GENPDF_API_TIMEOUT", 60),
+                                               config.get("GENPDF_API_MAX_CONCURRENCY", 8),
+                                               config.get("GENPDF_API_RETRIES", 3),
+                                               slot_timeout=config.get("GENPDF_API_SLOT_TIMEOUT", 30))
+        return self._genpdf_client
+
     def _genpdf(self, arxiv_id: Identifier, docmeta: DocMetadata, version: VersionEntry) -> FormatHandlerReturn:
         """Gets a PDF from the genpdf-api."""
-        genpdf_api = current_app.config.get("GENPDF_API_URL")
-        # requests.get() cannot have timeout <= 0
-        timeout = max(1, current_app.config.get("GENPDF_API_TIMEOUT", 60))
-        url = f"{genpdf_api}/pdf/{arxiv_id.ids}?timeout={timeout}&download=false"
         headers = {}
         if self.service_identity:
             try:
                 headers["Authorization"] = f"Bearer {self.service_identity.token}"
             except Exception as exc:
                 logger.warning("Acquiring auth token for genpdf failed. %s", str(exc), exc_info=True)
-        logger.debug("genpdf-api request(timeout=%d): %s ", timeout, url)
         t_start = time.perf_counter()
-        for _ in range(3):  # cannot be infinite loop but 500s are common when the cloud run's service is starting up.
-            try:
-                response: requests.Response = \
-                    requests.get(url, timeout=timeout, allow_redirects=False, headers=headers)
-                break
-            except ConnectionError as _exc:
-                logger.warning("The HTTP connection is reset. Retrying...")
-                time.sleep(0.1) # just a fraction is enough
-                continue
-            except Exception as _exc:
-                logger.warning("genpdf-api access failed", exc_info=True)
-                return "UNAVAILABLE"
+        response = self.genpdf_client().request_pdf(arxiv_id.ids, headers)
         t_end = time.perf_counter()
-        logger.debug("genpdf-api responded in %f seconds", t_end - t_start)
+        if isinstance(response, str):
+            return response
 
         # Normal operation is a redirect to the bucket
 
@@ -473,10 +519,18 @@ class ArticleStore:
         if docmeta.source_format == 'html' or version.source_flag.html: # paper source is html
             # note: the preprocessed html is expected to exist in the ps_cache
             path = ps_cache_html_path(arxiv_id, version.version)
+            manifest = None
+            if self.html_manifests is not None:
+                manifest = self.html_manifests.get(f"{arxiv_id.id}v{version.version}",
+                                                   docmeta.modified, path,
+                                                   lambda: self.cache_store.list(path))
             if arxiv_id.extra:  # requesting a specific file
-                return self.cache_store.to_obj(path + arxiv_id.extra.removeprefix("/"))
+                name = arxiv_id.extra.removeprefix("/")
+                if manifest is not None and name in manifest.by_name:
+                    return manifest.by_name[name]
+                return self.cache_store.to_obj(path + name)
             else:  # requesting list of files
-                file_list = list(self.cache_store.list(path))
+                file_list = manifest.files if manifest is not None else list(self.cache_store.list(path))
                 return file_list if file_list else "NO_SOURCE"
         else: # latex to html
             file = self.latexml_store.to_obj(latexml_html_path(arxiv_id, version.version))
@@ -0,0 +1,63 @@
+"""Per process cache of negative results from `ArticleStore.dissemination()`.
+
+Getting to a condition like `NO_SOURCE` or `UNAVAILABLE` takes a chain of
+object store probes, the PS cache, the source PDF, genpdf and a listing of the
+source files. Crawlers request these dead ends over and over so the resulting
+condition is cached by id and format.
+
+Conditions that cannot change for a given version, like `WITHDRAWN` or
+`NOT_PDF` for a versioned id, get a long TTL. Everything else, and everything
+for an id without a version since a new version may be announced, gets a
+short TTL. `ARTICLE_NOT_FOUND` and `VERSION_NOT_FOUND` are not cached, they
+only need the metadata, and caching them would report a newly announced paper
+or version as missing.
+
+The cache is per process and entries only leave it by their TTL, there is no
+way to drop them in the serving processes from outside.
+"""
+from typing import Dict, Optional, Tuple
+
+from arxiv.identifier import Identifier
+
+from browse.services.cache import LRUCache
+
+ConditionKey = Tuple[str, str, str]
+"""Key of the cache: id as requested, format and extra path."""
+
+STABLE_CONDITIONS = frozenset(["WITHDRAWN", "NOT_PDF", "NOT_PS", "NOT_PUBLIC"])
+"""Conditions that do not change for a paper version."""
+
+UNCACHED_CONDITIONS = frozenset(["ARTICLE_NOT_FOUND", "VERSION_NOT_FOUND"])
+"""Conditions that change when a paper or version is announced."""
+
+
+def condition_key(fmt: str, arxiv_id: Identifier) -> ConditionKey:
+    """Key for the condition of `arxiv_id` in format `fmt`."""
+    return (arxiv_id.idv if arxiv_id.has_version else arxiv_id.id,
+            fmt, arxiv_id.extra or "")
+
+
+class ConditionCache:
+    """Cache of condition strings by `ConditionKey`."""
+
+    def __init__(self, maxsize: int, stable_ttl: float, transient_ttl: float):
+        self.stable_ttl = stable_ttl
+        self.transient_ttl = transient_ttl
+        self._cache: LRUCache[ConditionKey, str] = LRUCache(maxsize, transient_ttl)
+
+    def get(self, key: ConditionKey) -> Optional[str]:
+        """Gets the cached condition or `None`."""
+        return self._cache.get(key)
+
+    def put(self, key: ConditionKey, condition: str, versioned: bool) -> None:
+        """Caches `condition` with a TTL based on how stable it is."""
+        if condition in UNCACHED_CONDITIONS:
+            return
+        stable = versioned and condition in STABLE_CONDITIONS
+        self._cache.put(key, condition, self.stable_ttl if stable else self.transient_ttl)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
@@ -0,0 +1,147 @@
+"""Client for the genpdf-api.
+
+The genpdf-api builds PDFs that are not in the PS cache. It runs on Cloud Run
+and a request may take many seconds, so this client:
+
+- keeps a pooled, keep-alive `requests.Session` to avoid a TCP and TLS
+  handshake on each request,
+- bounds the number of concurrent requests from this process, a request
+  that waits too long for a slot is `UNAVAILABLE`,
+- coalesces concurrent requests for the same paper id into one,
+- retries connection errors and Cloud Run start up errors with jittered
+  exponential backoff,
+- records the duration and status of each request as OpenTelemetry
+  histograms, `genpdf.request.duration`, for sizing genpdf capacity, and the
+  time waited for a slot, `genpdf.queue.wait`, for sizing the local cap.
+"""
+import logging
+import random
+import time
+from threading import BoundedSemaphore
+from typing import Literal, Mapping, Optional, Union
+
+import requests
+from opentelemetry import metrics
+from requests.adapters import HTTPAdapter
+
+from browse.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+request_duration = meter.create_histogram(
+    "genpdf.request.duration", unit="s",
+    description="Duration of genpdf-api requests by status")
+queue_wait = meter.create_histogram(
+    "genpdf.queue.wait", unit="s",
+    description="Time waited for a slot to make a genpdf-api request, by whether one was gotten")
+
+GenpdfResult = Union[requests.Response, Literal["UNAVAILABLE"]]
+"""A response from the genpdf-api or `UNAVAILABLE` if there was none."""
+
+RETRY_STATUSES = frozenset([502, 503])
+"""Statuses that are common while the Cloud Run service is starting up."""
+
+
+class GenpdfClient:
+    """Makes requests to the genpdf-api.
+
+    Example
+    -------
+
+        client = GenpdfClient("https://genpdf-api.arxiv.org", timeout=60)
+        resp = client.request_pdf("2101.00001v1", headers={})
+        if resp != "UNAVAILABLE" and resp.status_code == 302:
+            print(resp.headers["location"])
+    """
+
+    def __init__(self, api_url: str, timeout: int,
+                 max_concurrency: int = 8, retries: int = 3, backoff: float = 0.1,
+                 slot_timeout: float = 30, session: Optional[requests.Session] = None):
+        """
+        Parameters
+        ----------
+        api_url: Base URL of the genpdf-api.
+
+        timeout: Seconds the genpdf-api may take to build a PDF.
+
+        max_concurrency: Max requests in flight from this process. Also the
+        size of the connection pool.
+
+        retries: Max attempts for a request.
+
+        backoff: Base seconds of the backoff between attempts.
+
+        slot_timeout: Max seconds an attempt waits for one of the
+        `max_concurrency` slots before giving up as `UNAVAILABLE`.
+
+        session: Session to use, for testing.
+        """
+        self.api_url = api_url
+        self.timeout = max(1, timeout)  # requests.get() cannot have timeout <= 0
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.slot_timeout = slot_timeout
+        self.session = session if session is not None else requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_concurrency))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._slots = BoundedSemaphore(max(1, max_concurrency))
+        self._in_flight: SingleFlight[GenpdfResult] = SingleFlight()
+
+    def request_pdf(self, ids: str, headers: Mapping[str, str]) -> GenpdfResult:
+        """Requests the PDF for `ids`, the paper id with optional version.
+
+        If a request for `ids` is already in flight this waits for it and
+        returns its result.
+
+        The genpdf-api normally responds with a redirect to the PDF in its
+        bucket. Returns `UNAVAILABLE` if there was no response after all
+        retries, if no slot was free in time or if the request failed in an
+        unexpected way."""
+        return self._in_flight.do(ids, lambda: self._request(ids, headers))
+
+    def _request(self, ids: str, headers: Mapping[str, str]) -> GenpdfResult:
+        url = f"{self.api_url}/pdf/{ids}?timeout={self.timeout}&download=false"
+        logger.debug("genpdf-api request(timeout=%d): %s ", self.timeout, url)
+        response: Optional[requests.Response] = None
+        for attempt in range(self.retries):
+            if attempt:
+                # Full jitter so retries from many workers do not line up
+                time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            queued = time.perf_counter()
+            acquired = self._slots.acquire(timeout=self.slot_timeout)
+            queue_wait.record(time.perf_counter() - queued, {"acquired": str(acquired).lower()})
+            if not acquired:
+                logger.warning("No free slot for a genpdf-api request after %.1f seconds",
+                               self.slot_timeout)
+                return "UNAVAILABLE"
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout,
+                                            allow_redirects=False, headers=dict(headers))
+            except requests.ConnectionError:
+                self._record(start, "connection_error")
+                logger.warning("The HTTP connection to genpdf-api failed. Retrying...")
+                continue
+            except Exception:
+                self._record(start, "error")
+                logger.warning("genpdf-api access failed", exc_info=True)
+                return "UNAVAILABLE"
+            finally:
+                self._slots.release()
+
+            self._record(start, str(response.status_code))
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            logger.warning("genpdf-api returned %d. Retrying...", response.status_code)
+
+        if response is None:
+            logger.error("genpdf-api could not be reached after %d attempts", self.retries)
+            return "UNAVAILABLE"
+        return response
+
+    def _record(self, start: float, status: str) -> None:
+        duration = time.perf_counter() - start
+        request_duration.record(duration, {"status": status})
+        logger.debug("genpdf-api responded %s in %f seconds", status, duration)
@@ -0,0 +1,74 @@
+"""Per process cache of the file listings of native HTML papers.
+
+The HTML of a paper with HTML source is a directory in the PS cache. Without
+this every /html/<id> request lists that directory to decide between the
+single file and the file selector, and every request for one of its files
+probes the object store for it.
+
+An `HtmlManifest` is the listing of the directory of one paper version. It is
+cached by idv and used as long as the paper's modified time is the one it was
+made for, so a replaced version is listed again. An empty listing is not
+cached, the HTML may just not be in the PS cache yet.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from arxiv.files import FileObj
+
+from browse.services.cache import LRUCache
+from browse.services.single_flight import coalesce
+
+
+@dataclass(frozen=True)
+class HtmlManifest:
+    """Files in the HTML directory of a paper version.
+
+    `by_name` has the files by their path in the directory, as in
+    /html/<idv>/<path>."""
+    modified: datetime
+    files: List[FileObj]
+    by_name: Dict[str, FileObj] = field(default_factory=dict)
+
+
+def make_manifest(modified: datetime, path: str, files: Iterable[FileObj]) -> HtmlManifest:
+    """Makes the `HtmlManifest` of `files` listed under `path`."""
+    listed = list(files)
+    by_name = {}
+    for file in listed:
+        # Names from some stores include the store root, keep what is after path
+        start = file.name.find(path)
+        by_name[file.name[start + len(path):] if start >= 0 else file.name] = file
+    return HtmlManifest(modified, listed, by_name)
+
+
+class HtmlManifestCache:
+    """Cache of `HtmlManifest` by idv."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self._cache: LRUCache[str, HtmlManifest] = LRUCache(maxsize, ttl)
+
+    def get(self, idv: str, modified: datetime, path: str,
+            list_files: Callable[[], Iterable[FileObj]]) -> HtmlManifest:
+        """Gets the manifest of `idv`, listing its files with `list_files` if
+        it is not cached or was made for another `modified` time.
+
+        A manifest without files is not cached."""
+        found = self._cache.get(idv)
+        if found is not None and found.modified == modified:
+            return found
+
+        def make() -> HtmlManifest:
+            manifest = make_manifest(modified, path, list_files())
+            if manifest.files:
+                self._cache.put(idv, manifest)
+            return manifest
+
+        key: Tuple[str, datetime] = (idv, modified)
+        return coalesce("html_manifest", key, make)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
@@ -0,0 +1,148 @@
+"""Index of where the source file for a paper version is.
+
+Source files do not have a single key pattern, ex. `2001.00001v1.pdf` vs
+`2001.00001v1.tar.gz`, so `SourceStore` has to list the bucket under a prefix
+to find them. List operations are slow and more expensive than getting a
+single object.
+
+A `SourceIndex` maps the source prefix of a paper version, as made by
+`src_path_prefix()`, to the extension, size and checksum of its source file.
+With that `SourceStore` can get the file with a single point lookup. The index
+is built with a one time scan, see `build_source_index()` and the
+`flask source_index build` command, and is updated by `SourceStore` whenever it
+has to fall back to listing.
+"""
+import abc
+import logging
+import re
+import sqlite3
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Iterable, Optional
+
+from arxiv.files.object_store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+src_ext_regex = re.compile(r'^(?P<prefix>.*?)(?P<ext>\.tar\.gz|\.pdf|\.ps\.gz|\.div\.gz|\.html\.gz|\.gz)$')
+"""Splits a source key into its prefix and source extension."""
+
+
+@dataclass(frozen=True)
+class SourceLocation:
+    """Where the source file for a paper version is.
+
+    ext is the extension of the source file, the key of the file is the
+    source prefix followed by ext.
+    """
+    ext: str
+    size: int
+    checksum: str
+
+
+class SourceIndex(abc.ABC):
+    """Maps source prefixes to `SourceLocation`s."""
+
+    @abc.abstractmethod
+    def lookup(self, prefix: str) -> Optional[SourceLocation]:
+        """Gets the location for `prefix` or `None` if it is not in the index."""
+
+    @abc.abstractmethod
+    def record(self, prefix: str, location: SourceLocation) -> None:
+        """Adds or replaces the location for `prefix`."""
+
+    @abc.abstractmethod
+    def remove(self, prefix: str) -> None:
+        """Removes `prefix` from the index."""
+
+    def record_many(self, locations: Dict[str, SourceLocation]) -> None:
+        """Adds or replaces many locations."""
+        for prefix, location in locations.items():
+            self.record(prefix, location)
+
+
+class SqliteSourceIndex(SourceIndex):
+    """`SourceIndex` in a local SQLite file.
+
+    The connection is shared by threads and guarded by a lock. Lookups are
+    primary key reads so holding the lock is brief. The file is shared by the
+    worker processes on a host, so it is in WAL mode, where readers don't wait
+    on a writer, and a write waits up to `timeout` seconds for another
+    process's write.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS source_index ("
+                               "prefix TEXT PRIMARY KEY, "
+                               "ext TEXT NOT NULL, "
+                               "size INTEGER NOT NULL, "
+                               "checksum TEXT NOT NULL)")
+
+    def lookup(self, prefix: str) -> Optional[SourceLocation]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ext, size, checksum FROM source_index WHERE prefix = ?",
+                (prefix,)).fetchone()
+        return SourceLocation(*row) if row else None
+
+    def record(self, prefix: str, location: SourceLocation) -> None:
+        self.record_many({prefix: location})
+
+    def record_many(self, locations: Dict[str, SourceLocation]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO source_index (prefix, ext, size, checksum) "
+                "VALUES (?, ?, ?, ?)",
+                [(prefix, loc.ext, loc.size, loc.checksum) for prefix, loc in locations.items()])
+
+    def remove(self, prefix: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM source_index WHERE prefix = ?", (prefix,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT count(*) FROM source_index").fetchone()[0])
+
+
+def split_source_key(key: str) -> Optional[tuple[str, str]]:
+    """Splits `key` into its source prefix and extension.
+
+    Returns `None` if `key` does not look like a source file."""
+    mtch = src_ext_regex.match(key)
+    return (mtch.group('prefix'), mtch.group('ext')) if mtch else None
+
+
+def build_source_index(index: SourceIndex, objstore: ObjectStore,
+                       prefixes: Iterable[str]) -> int:
+    """Scans `objstore` under each of `prefixes` and records the source files found.
+
+    `prefixes` are key prefixes like `ftp/arxiv/papers/2101/`. When there is more
+    than one source file for a version the first key in lexical order is used,
+    which is the same one `SourceStore.get_src()` gets from a GS listing.
+
+    Returns the number of locations recorded.
+    """
+    total = 0
+    for scan_prefix in prefixes:
+        found: Dict[str, SourceLocation] = {}
+        for item in objstore.list(scan_prefix):
+            # Names from some stores include the store root, keep only the key
+            start = item.name.find(scan_prefix)
+            key = item.name[start:] if start >= 0 else item.name
+            split = split_source_key(key)
+            if split is None:
+                continue
+            prefix, ext = split
+            if prefix in found and prefix + found[prefix].ext < key:
+                continue
+            found[prefix] = SourceLocation(ext, item.size, item.etag)
+        index.record_many(found)
+        logger.info("Recorded %d source locations under %s", len(found), scan_prefix)
+        total += len(found)
+    return total
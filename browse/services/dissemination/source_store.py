@@ -12,6 +12,9 @@ from arxiv.files.object_store import ObjectStore
 from arxiv.files import FileObj
 from arxiv.formats import list_ancillary_files
 
+from .anc_manifest import AncillaryManifests
+from .source_index import SourceIndex, SourceLocation, split_source_key
+
 logger = logging.getLogger(__file__)
 
 src_regex = re.compile(r'.*(\.tar\.gz|\.pdf|\.ps\.gz|\.gz|\.div\.gz|\.html\.gz)')
@@ -28,7 +31,7 @@ def src_path_prefix(arxiv_id: Identifier, is_current:bool) -> str:
     Ex. 2001.00001v1.pdf vs 2001.00001v1.tar.gz.
 
     An object key prefix where the file then need to be listed is used. List operations in GS are more expensive
-    some other operations. In the future the DB should have a table of metadata_id -> source_file with a checksum.
+    some other operations. When a `SourceIndex` is available this prefix is its key, see `source_index`.
     """
     if is_current:
         return f"{abs_path_current_parent(arxiv_id)}/{arxiv_id.filename}"
@@ -49,8 +52,21 @@ class SourceStore():
 
     """
 
-    def __init__(self, objstore: ObjectStore):
+    def __init__(self, objstore: ObjectStore, index: Optional[SourceIndex] = None,
+                 anc_manifests: Optional[AncillaryManifests] = None):
+        """
+        Parameters
+        ----------
+        objstore: Where the source files are.
+
+        index: Optional `SourceIndex` to find source files without listing.
+
+        anc_manifests: Optional `AncillaryManifests` to list ancillary files
+        without reading the source tarball.
+        """
         self.objstore = objstore
+        self.index = index
+        self.anc_manifests = anc_manifests
 
     def source_exists(self,
                       arxiv_id: Identifier,
@@ -60,7 +76,48 @@ class SourceStore():
 
 
     def get_src(self, arxiv_id: Identifier, is_current: bool) -> Optional[FileObj]:
+        """Gets the source file for `arxiv_id`.
+
+        If there is a `SourceIndex` this first tries a point lookup of the key
+        from the index. Only if the index misses, or it points at a file that
+        no longer exists, does this list the store. Files found by listing, and
+        files whose size or checksum no longer match the index, are recorded
+        in the index.
+
+        Errors writing to the index are logged and otherwise ignored, the
+        index is only an optimization."""
         pattern = src_path_prefix(arxiv_id, is_current)
+        if self.index is not None:
+            location = self.index.lookup(pattern)
+            if location is not None:
+                src = self.objstore.to_obj(pattern + location.ext)
+                if src.exists():
+                    if (src.size, src.etag) != (location.size, location.checksum):
+                        self._update_index(pattern, SourceLocation(location.ext, src.size, src.etag))
+                    return src
+                self._update_index(pattern, None)
+
+        src = self._list_src(pattern)
+        if src is not None and self.index is not None:
+            split = split_source_key(src.name)
+            if split is not None:
+                self._update_index(pattern, SourceLocation(split[1], src.size, src.etag))
+        return src
+
+    def _update_index(self, prefix: str, location: Optional[SourceLocation]) -> None:
+        """Records `location` for `prefix`, or removes `prefix` if it is `None`."""
+        if self.index is None:
+            return
+        try:
+            if location is None:
+                self.index.remove(prefix)
+            else:
+                self.index.record(prefix, location)
+        except Exception as ex:
+            logger.warning("Could not update the source index for %s: %s", prefix, ex)
+
+    def _list_src(self, pattern: str) -> Optional[FileObj]:
+        """Finds the source file by listing keys that start with `pattern`."""
         items = list(self.objstore.list(pattern))
         if len(items) > MAX_ITEMS_IN_PATTERN_MATCH:
             raise Exception(f"Too many src matches for {pattern}")
@@ -72,18 +129,23 @@ class SourceStore():
 
     def get_src_pdf(self, arxiv_id: Identifier, is_current: bool) -> Optional[FileObj]:
         """Try to get the PDF file as if paper is a pdf-only source paper."""
+        pdf_file = self.src_pdf_obj(arxiv_id, is_current)
+        return pdf_file if pdf_file.exists() else None
+
+    def src_pdf_obj(self, arxiv_id: Identifier, is_current: bool) -> FileObj:
+        """Gets the `FileObj` where the PDF of a pdf-only source paper would be.
+
+        This does not check if it exists."""
+        return self.objstore.to_obj(self.src_pdf_path(arxiv_id, is_current))
+
+    def src_pdf_path(self, arxiv_id: Identifier, is_current: bool) -> str:
+        """Gets the key where the PDF of a pdf-only source paper would be."""
         if is_current or not arxiv_id.has_version:
             # try from the /ftp with no number for current ver of pdf only paper
-            pdf_file = self.objstore.to_obj(current_pdf_path(arxiv_id))
-            if pdf_file.exists():
-                return pdf_file
+            return current_pdf_path(arxiv_id)
         else:
             # try from the /orig with version number for a pdf only paper
-            pdf_file = self.objstore.to_obj(previous_pdf_path(arxiv_id))
-            if pdf_file.exists():
-                return pdf_file
-
-        return None
+            return previous_pdf_path(arxiv_id)
 
     def get_src_ps(self, arxiv_id: Identifier, is_current: bool) -> Optional[FileObj]:
         """Try to get the PS file as if paper is a PS-only source paper."""
@@ -146,4 +208,12 @@ class SourceStore():
         anc_files: List[dict] = []
         if not source_type.includes_ancillary_files:
             return anc_files
-        return list_ancillary_files(self.get_src_for_docmeta(docmeta.arxiv_identifier, docmeta))
+        src = self.get_src_for_docmeta(docmeta.arxiv_identifier, docmeta)
+        if src is None or self.anc_manifests is None:
+            return list_ancillary_files(src)
+
+        anc_files = self.anc_manifests.lookup(src.name, src.etag)  # type: ignore
+        if anc_files is None:
+            anc_files = list_ancillary_files(src)
+            self.anc_manifests.record(src.name, src.etag, anc_files)
+        return anc_files
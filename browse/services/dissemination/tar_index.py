@@ -0,0 +1,355 @@
+"""Random access to the members of .tar.gz source files.
+
+To send an ancillary file `FileFromTar` decompresses the source from its first
+byte up to the member, on every request, and again for each range request.
+For data papers with large ancillary files that is most of the CPU and egress
+of /src/<id>/anc.
+
+A `TarIndex` is made with one pass over a .tar.gz. It has the offset and size
+of each member in the uncompressed tar and, every `spacing` uncompressed
+bytes, a checkpoint of the compressed offset and a copy of the zlib
+decompressor state there, as in zlib's zran example. A read of a member then
+seeks the source to the nearest checkpoint before it and decompresses from
+there.
+
+The pass to make an index takes as long as decompressing the whole tarball,
+so it is never done by a request. A request for a tarball without an index
+starts building one on a background thread and is served with `FileFromTar`
+as before, later requests use the index once it is built.
+
+Python's zlib cannot prime a decompressor at a bit offset, so checkpoints
+can't be saved and are kept in memory for the `ANCILLARY_TAR_INDEX_SIZE` most
+recently used tarballs of the process. The member names, offsets and sizes are
+also saved in the SQLite file at `ANCILLARY_TAR_INDEX_PATH`, so that 404s
+don't need a pass over the tarball after a restart.
+"""
+import io
+import logging
+import sqlite3
+import tarfile
+import zlib
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from arxiv.files import FileObj
+from flask import current_app
+
+from browse.services.cache import LRUCache
+from browse.services.single_flight import coalesce
+
+logger = logging.getLogger(__name__)
+
+GZIP = 16 + zlib.MAX_WBITS
+"""zlib `wbits` to decompress gzip."""
+
+CHUNK = 64 * 1024
+"""Bytes of the compressed source read at a time."""
+
+MAX_OUT = 1024 * 1024
+"""Max bytes decompressed from one chunk at a time."""
+
+_tar_index_cache: Optional["TarIndexCache"] = None
+# Shared by all requests in the process, see `get_tar_index_cache()`.
+
+
+@dataclass(frozen=True)
+class TarMember:
+    """A file in a tar, `offset` is the start of its data in the uncompressed tar."""
+    name: str
+    offset: int
+    size: int
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """A place in a gzip file to start decompressing from.
+
+    `state` is a `zlib.Decompress` that has been given the first `compressed`
+    bytes and has output the first `uncompressed` bytes. It is copied before
+    each use."""
+    compressed: int
+    uncompressed: int
+    state: Any
+
+
+def _start() -> Checkpoint:
+    return Checkpoint(0, 0, zlib.decompressobj(GZIP))
+
+
+class TarIndex:
+    """Members and gzip checkpoints of one .tar.gz."""
+
+    def __init__(self, members: Dict[str, TarMember], checkpoints: List[Checkpoint]):
+        self.members = members
+        self.checkpoints = checkpoints or [_start()]
+        self._positions = [cp.uncompressed for cp in self.checkpoints]
+
+    def checkpoint_before(self, pos: int) -> Checkpoint:
+        """Gets the last checkpoint at or before uncompressed offset `pos`."""
+        return self.checkpoints[max(0, bisect_right(self._positions, pos) - 1)]
+
+
+class _Inflater(io.RawIOBase):
+    """Uncompressed bytes of a gzip file read from `source` starting at `start`.
+
+    With `spacing` a checkpoint is recorded in `checkpoints` about every
+    `spacing` uncompressed bytes. Files of several gzip members, as made by
+    pigz or by concatenation, are read through."""
+
+    def __init__(self, source: BinaryIO, start: Checkpoint, spacing: int = 0):
+        self.source = source
+        self.decomp = start.state.copy()
+        self.compressed = start.compressed
+        self.pos = start.uncompressed
+        self.spacing = spacing
+        self.checkpoints: List[Checkpoint] = []
+        self._next_checkpoint = start.uncompressed + spacing
+        self._out = start.uncompressed
+        self._pending = b""
+        self._buffer = b""
+        self._offset = 0
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> None:
+        if self.spacing and not self._pending and self._out >= self._next_checkpoint \
+           and not self.decomp.eof:
+            self.checkpoints.append(Checkpoint(self.compressed, self._out, self.decomp.copy()))
+            self._next_checkpoint = self._out + self.spacing
+        data = self._pending
+        if len(data) < 2:
+            more = self.source.read(CHUNK)
+            self.compressed += len(more)
+            data += more
+        if not data:
+            self._eof = True
+            return
+        if self.decomp.eof:
+            if not data.startswith(b"\x1f\x8b"):
+                # padding after the last gzip member
+                self._eof = True
+                return
+            self.decomp = zlib.decompressobj(GZIP)
+        out = self.decomp.decompress(data, MAX_OUT)
+        self._pending = self.decomp.unused_data if self.decomp.eof else self.decomp.unconsumed_tail
+        self._buffer = out
+        self._offset = 0
+        self._out += len(out)
+
+    def skip_to(self, pos: int) -> None:
+        """Discards uncompressed bytes up to `pos`."""
+        while self.pos < pos:
+            available = len(self._buffer) - self._offset
+            if not available:
+                if self._eof:
+                    return
+                self._fill()
+                continue
+            step = min(available, pos - self.pos)
+            self._offset += step
+            self.pos += step
+
+    def readinto(self, b: Any) -> int:
+        while self._offset >= len(self._buffer):
+            if self._eof:
+                return 0
+            self._fill()
+        n = min(len(b), len(self._buffer) - self._offset)
+        b[:n] = self._buffer[self._offset:self._offset + n]
+        self._offset += n
+        self.pos += n
+        return n
+
+
+class MemberReader(io.RawIOBase):
+    """Seekable reader of one member of a .tar.gz that uses the `TarIndex` checkpoints."""
+
+    def __init__(self, src_file: FileObj, index: TarIndex, member: TarMember, spacing: int):
+        self.member = member
+        self.index = index
+        self.spacing = spacing
+        self._src_file = src_file
+        self._source: Optional[BinaryIO] = None
+        self._inflater: Optional[_Inflater] = None
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.member.size
+        self._pos = max(0, min(offset, self.member.size))
+        return self._pos
+
+    def _inflater_at(self, pos: int) -> _Inflater:
+        checkpoint = self.index.checkpoint_before(pos)
+        inflater = self._inflater
+        if inflater is None or inflater.pos > pos or checkpoint.uncompressed > inflater.pos:
+            if self._source is None:
+                self._source = self._src_file.open("rb")
+            self._source.seek(checkpoint.compressed)
+            inflater = _Inflater(self._source, checkpoint)
+            self._inflater = inflater
+        inflater.skip_to(pos)
+        return inflater
+
+    def readinto(self, b: Any) -> int:
+        remaining = self.member.size - self._pos
+        if remaining <= 0:
+            return 0
+        inflater = self._inflater_at(self.member.offset + self._pos)
+        n = inflater.readinto(memoryview(b)[:min(len(b), remaining)])
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+        super().close()
+
+
+def build_tar_index(src_file: FileObj, spacing: int) -> TarIndex:
+    """Makes the `TarIndex` of a .tar.gz with one pass over it."""
+    with src_file.open("rb") as source:
+        inflater = _Inflater(source, _start(), spacing)
+        members: Dict[str, TarMember] = {}
+        with tarfile.open(fileobj=inflater, mode="r|") as tar:
+            for info in tar:
+                if info.isfile():
+                    members[info.name] = TarMember(info.name, info.offset_data, info.size)
+    return TarIndex(members, [_start()] + inflater.checkpoints)
+
+
+class TarIndexCache:
+    """`TarIndex`es of recently used tarballs, by key, etag and size.
+
+    Indexes that requests need are built one at a time on a background thread,
+    see `get()`. With `path` the members of each indexed tarball are also saved
+    in SQLite."""
+
+    def __init__(self, maxsize: int, spacing: int, path: str = ""):
+        self.spacing = spacing
+        self.path = path
+        self._indexes: LRUCache[Tuple[str, str, int], TarIndex] = LRUCache(maxsize)
+        self._maxsize = maxsize
+        self._builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tar_index")
+        self._building: Dict[Tuple[str, str, int], Future] = {}
+        self._building_lock = Lock()
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.execute("CREATE TABLE IF NOT EXISTS tar_member ("
+                                   "tarball TEXT NOT NULL, "
+                                   "name TEXT NOT NULL, "
+                                   "data_offset INTEGER NOT NULL, "
+                                   "size INTEGER NOT NULL, "
+                                   "PRIMARY KEY (tarball, name))")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS tar_indexed ("
+                                   "tarball TEXT PRIMARY KEY)")
+
+    @staticmethod
+    def _key(src_file: FileObj) -> Tuple[str, str, int]:
+        return (src_file.name, str(src_file.etag or src_file.updated), int(src_file.size))
+
+    def get(self, src_file: FileObj) -> Optional[TarIndex]:
+        """Gets the `TarIndex` of `src_file` if it has been built.
+
+        If it has not, it is built on a background thread and `None` is
+        returned. At most `maxsize` builds are waiting at once, past that the
+        tarball is not indexed this time."""
+        key = self._key(src_file)
+        found = self._indexes.get(key)
+        if found is not None:
+            return found
+        with self._building_lock:
+            if key in self._building or len(self._building) >= self._maxsize:
+                return None
+            future = self._builder.submit(self.index, src_file)
+            self._building[key] = future
+        future.add_done_callback(lambda done: self._built(key, src_file, done))
+        return None
+
+    def _built(self, key: Tuple[str, str, int], src_file: FileObj, future: Future) -> None:
+        with self._building_lock:
+            self._building.pop(key, None)
+        if future.exception() is not None:
+            logger.warning("Could not index %s: %s", src_file.name, future.exception())
+
+    def index(self, src_file: FileObj) -> TarIndex:
+        """Gets the `TarIndex` of `src_file`, building it on this thread if needed."""
+        key = self._key(src_file)
+        found = self._indexes.get(key)
+        if found is not None:
+            return found
+
+        def build() -> TarIndex:
+            index = build_tar_index(src_file, self.spacing)
+            self._indexes.put(key, index)
+            self._save(key, index)
+            return index
+
+        return coalesce("tar_index", key, build)
+
+    def open_member(self, src_file: FileObj, index: TarIndex, member: TarMember) -> BinaryIO:
+        """Opens `member` of `src_file` for reading with `index`, the reader can seek."""
+        reader = MemberReader(src_file, index, member, self.spacing)
+        return io.BufferedReader(reader, CHUNK)  # type: ignore
+
+    def _save(self, key: Tuple[str, str, int], index: TarIndex) -> None:
+        if self._conn is None:
+            return
+        tarball = "|".join(map(str, key))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tar_member WHERE tarball = ?", (tarball,))
+            self._conn.executemany(
+                "INSERT INTO tar_member (tarball, name, data_offset, size) VALUES (?, ?, ?, ?)",
+                [(tarball, m.name, m.offset, m.size) for m in index.members.values()])
+            self._conn.execute("INSERT OR REPLACE INTO tar_indexed (tarball) VALUES (?)", (tarball,))
+
+    def saved_member(self, src_file: FileObj,
+                     name: str) -> Optional[Tuple[bool, Optional[TarMember]]]:
+        """Gets `(True, member or None)` if the members of `src_file` were saved, `None` if not."""
+        if self._conn is None:
+            return None
+        tarball = "|".join(map(str, self._key(src_file)))
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM tar_indexed WHERE tarball = ?",
+                                  (tarball,)).fetchone() is None:
+                return None
+            row = self._conn.execute(
+                "SELECT data_offset, size FROM tar_member WHERE tarball = ? AND name = ?",
+                (tarball, name)).fetchone()
+        return (True, TarMember(name, row[0], row[1]) if row else None)
+
+
+def get_tar_index_cache() -> Optional[TarIndexCache]:
+    """Gets the process wide `TarIndexCache`.
+
+    Returns `None` if it is disabled with `ANCILLARY_TAR_INDEX_SIZE` of 0."""
+    global _tar_index_cache
+    size = int(current_app.config.get("ANCILLARY_TAR_INDEX_SIZE", 0))
+    if size <= 0:
+        return None
+    if _tar_index_cache is None:
+        _tar_index_cache = TarIndexCache(
+            size,
+            int(current_app.config.get("ANCILLARY_TAR_INDEX_SPACING", 16 * 1024 * 1024)),
+            current_app.config.get("ANCILLARY_TAR_INDEX_PATH", ""))
+    return _tar_index_cache
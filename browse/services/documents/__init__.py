@@ -1,16 +1,20 @@
 """Documents Service and implementations."""
-from typing import Any, cast
+from typing import Any, Optional, cast
 
 from flask import g, current_app
 
 from arxiv.files.object_store import ObjectStore
 
 from browse.services.documents.base_documents import DocMetadataService
+from browse.services.documents.doc_cache import DocMetadataCache
 from browse.services.global_object_store import get_global_object_store
 
 _doc_latest_versions_store: ObjectStore = None # type: ignore
 _doc_original_versions_store: ObjectStore = None # type: ignore
 
+_doc_cache: Optional[DocMetadataCache] = None
+# Shared by all requests in the process, it is thread safe.
+
 def get_doc_service() -> DocMetadataService:
     """Gets the documents service configured for this app context."""
     if 'doc_service' not in g:
@@ -19,15 +23,33 @@ def get_doc_service() -> DocMetadataService:
     return cast(DocMetadataService, g.doc_service)
 
 
+def get_doc_cache(config: dict) -> Optional[DocMetadataCache]:
+    """Gets the process wide `DocMetadata` cache.
+
+    Returns `None` if the cache is disabled with `DOC_METADATA_CACHE_SIZE` of 0."""
+    global _doc_cache
+    size = int(config.get("DOC_METADATA_CACHE_SIZE", 0))
+    if size <= 0:
+        return None
+    if _doc_cache is None:
+        _doc_cache = DocMetadataCache(size, config.get("DOC_METADATA_CACHE_TTL", None))
+    return _doc_cache
+
+
 def fs_docs(config: dict, _: Any) -> DocMetadataService:
     """Factory function for file system abstract service."""
     from browse.services.documents.fs_implementation.fs_abs import FsDocMetadataService
     return FsDocMetadataService(
         get_global_object_store(config["ABS_PATH_ROOT"], '_doc_latest_versions_store'),
+        get_doc_cache(config),
     )
 
 
 def db_docs(config: dict, _: Any) -> DocMetadataService:
-    """Factory function for DB backed abstract service."""
+    """Factory function for DB backed abstract service.
+
+    The DB service only uses the `DocMetadata` cache if it has a TTL, that is
+    how long a changed paper may be served stale."""
     from browse.services.documents.db_implementation.db_abs import DbDocMetadataService
-    return DbDocMetadataService()
+    cache = get_doc_cache(config)
+    return DbDocMetadataService(cache if cache is not None and cache.ttl is not None else None)
@@ -1,11 +1,20 @@
 """Base classes for the abstracts service."""
 
 import abc
-from typing import Union
+from typing import Callable, Dict, Iterable, Union
 
+from arxiv.document import exceptions
 from arxiv.document.metadata import DocMetadata, Identifier
+from arxiv.identifier import IdentifierException
 from browse.services import HasStatus
 
+ABS_EXCEPTIONS = (exceptions.AbsException, exceptions.AbsNotFoundException,
+                  exceptions.AbsVersionNotFoundException, exceptions.AbsParsingException,
+                  exceptions.AbsDeletedException, IdentifierException)
+"""Exceptions `get_abs()` raises for a bad id or a paper it can't get.
+
+Bulk lookups return these for an id; any other exception is raised."""
+
 
 class DocMetadataService(abc.ABC, HasStatus):
     """Class for arXiv document abstract metadata service."""
@@ -24,6 +33,40 @@ class DocMetadataService(abc.ABC, HasStatus):
         :class:`DocMetadata`
         """
 
+    def get_abs_many(self, arxiv_ids: Iterable[str]) -> Dict[str, Union[DocMetadata, Exception]]:
+        """Get the .abs metadata for many arXiv paper identifiers.
+
+        Implementations get them in bulk, this default gets them one after
+        the other with `get_abs()`.
+
+        Parameters
+        ----------
+        arxiv_ids : Iterable[str]
+            The arXiv identifier strings.
+
+        Returns
+        -------
+        Dict[str, Union[DocMetadata, Exception]]
+            The :class:`DocMetadata` for each id as passed, or the exception
+            `get_abs()` raises for it, like for a paper that does not exist.
+            Only the `ABS_EXCEPTIONS` are returned, others are raised.
+        """
+        found: Dict[str, Union[DocMetadata, Exception]] = {}
+        for arxiv_id in arxiv_ids:
+            if arxiv_id not in found:
+                found[arxiv_id] = abs_or_exception(self.get_abs, arxiv_id)
+        return found
+
+
+def abs_or_exception(get_abs: Callable[[str], DocMetadata],
+                     arxiv_id: str) -> Union[DocMetadata, Exception]:
+    """Calls `get_abs` for `arxiv_id` and returns the exception if it raises one
+    of the `ABS_EXCEPTIONS`."""
+    try:
+        return get_abs(arxiv_id)
+    except ABS_EXCEPTIONS as ex:
+        return ex
+
 
 class AbsException(Exception):
     """Error class for general arXiv .abs exceptions."""
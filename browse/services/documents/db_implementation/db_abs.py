@@ -1,6 +1,7 @@
 """Legacy DB backed core metadata service."""
+import dataclasses
 from datetime import timezone
-from typing import List, Optional, Union, Tuple
+from typing import Dict, Iterable, List, Optional, Union, Tuple
 
 from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.orm.exc import NoResultFound
@@ -16,13 +17,22 @@ from arxiv.db import Session
 from arxiv.db.models import Metadata
 from arxiv.document.exceptions import (
     AbsDeletedException, AbsNotFoundException, AbsVersionNotFoundException)
-from browse.services.documents.base_documents import DocMetadataService
+from browse.services.documents.base_documents import ABS_EXCEPTIONS, DocMetadataService
+from browse.services.documents.doc_cache import DocMetadataCache
 from browse.services.documents.config.deleted_papers import DELETED_PAPERS
+from browse.services.single_flight import coalesce
 
 
 class DbDocMetadataService(DocMetadataService):
     """Class for arXiv document metadata service."""
 
+    def __init__(self, cache: Optional[DocMetadataCache] = None) -> None:
+        """Initialize the DB document metadata service.
+
+        If `cache` is passed, `DocMetadata` are kept in it and reused without
+        checking the DB until they are as old as the cache's TTL, so a new or
+        updated version may be served stale for up to that long."""
+        self.cache = cache
 
     def get_abs(self, arxiv_id: Union[str, Identifier]) -> DocMetadata:
         """Get the .abs metadata for the specified arXiv paper identifier.
@@ -40,19 +50,65 @@ class DbDocMetadataService(DocMetadataService):
         if identifier.id in DELETED_PAPERS:
             raise AbsDeletedException(DELETED_PAPERS[identifier.id])
 
-        all_versions: List[Metadata] = (Session.query(Metadata).filter(Metadata.paper_id == identifier.id)).all()
-        if not all_versions:
-            raise AbsNotFoundException(identifier.id)
-
-        latest = next((ver for ver in all_versions if ver.is_current))
-        if identifier.has_version:
-            ver_of_interest = next((ver for ver in all_versions if ver.version == identifier.version), None)
-            if not ver_of_interest:
-                raise AbsVersionNotFoundException(identifier.idv)
-        else:
-            ver_of_interest = latest
+        # Concurrent requests for the same paper share one set of queries
+        return coalesce("abs", identifier.idv if identifier.has_version else identifier.id,
+                        lambda: self._get_abs(identifier))
+
+    def get_abs_many(self, arxiv_ids: Iterable[str]) -> Dict[str, Union[DocMetadata, Exception]]:
+        """Get the .abs metadata for many arXiv paper identifiers.
+
+        All versions of the papers not in the cache are gotten with one
+        query."""
+        found: Dict[str, Union[DocMetadata, Exception]] = {}
+        identifiers: Dict[str, Identifier] = {}
+        for arxiv_id in arxiv_ids:
+            if arxiv_id in found or arxiv_id in identifiers:
+                continue
+            try:
+                identifier = Identifier(arxiv_id=arxiv_id)
+                if identifier.id in DELETED_PAPERS:
+                    raise AbsDeletedException(DELETED_PAPERS[identifier.id])
+                identifiers[arxiv_id] = identifier
+            except ABS_EXCEPTIONS as ex:
+                found[arxiv_id] = ex
+
+        if self.cache is not None:
+            for arxiv_id, identifier in list(identifiers.items()):
+                version = identifier.version if identifier.has_version else None
+                cached = self.cache.get(identifier.id, version, None)
+                if cached is not None:
+                    found[arxiv_id] = dataclasses.replace(cached, arxiv_identifier=identifier)
+                    del identifiers[arxiv_id]
+
+        if identifiers:
+            versions: Dict[str, List[Metadata]] = {}
+            for row in (Session.query(Metadata)
+                        .filter(Metadata.paper_id.in_({identifier.id for identifier in identifiers.values()}))
+                        .order_by(Metadata.paper_id, Metadata.metadata_id)).all():
+                versions.setdefault(row.paper_id, []).append(row)
+            for arxiv_id, identifier in identifiers.items():
+                try:
+                    docmeta = _from_versions(versions.get(identifier.id, []), identifier)
+                    if self.cache is not None:
+                        version = identifier.version if identifier.has_version else None
+                        self.cache.put(identifier.id, version, None, docmeta)
+                    found[arxiv_id] = docmeta
+                except ABS_EXCEPTIONS as ex:
+                    found[arxiv_id] = ex
+        return found
+
+    def _get_abs(self, identifier: Identifier) -> DocMetadata:
+        version = identifier.version if identifier.has_version else None
+        if self.cache is not None:
+            cached = self.cache.get(identifier.id, version, None)
+            if cached is not None:
+                return dataclasses.replace(cached, arxiv_identifier=identifier)
 
-        return _to_docmeta(all_versions, latest, ver_of_interest, identifier)
+        all_versions: List[Metadata] = (Session.query(Metadata).filter(Metadata.paper_id == identifier.id)).all()
+        docmeta = _from_versions(all_versions, identifier)
+        if self.cache is not None:
+            self.cache.put(identifier.id, version, None, docmeta)
+        return docmeta
 
 
     def service_status(self) -> List[str]:
@@ -72,6 +128,22 @@ class DbDocMetadataService(DocMetadataService):
         return []
 
 
+def _from_versions(all_versions: List[Metadata], identifier: Identifier) -> DocMetadata:
+    """`DocMetadata` for `identifier` from all the versions of the paper."""
+    if not all_versions:
+        raise AbsNotFoundException(identifier.id)
+
+    latest = next((ver for ver in all_versions if ver.is_current))
+    if identifier.has_version:
+        ver_of_interest = next((ver for ver in all_versions if ver.version == identifier.version), None)
+        if not ver_of_interest:
+            raise AbsVersionNotFoundException(identifier.idv)
+    else:
+        ver_of_interest = latest
+
+    return _to_docmeta(all_versions, latest, ver_of_interest, identifier)
+
+
 def _to_docmeta(all_versions: List[Metadata], latest: Metadata, ver_of_interest: Metadata, identifier: Identifier) -> DocMetadata:
     """Convert a Metadata object from the DB to a DocMetadata object."""
     version_history = list()
@@ -0,0 +1,58 @@
+"""Process wide cache of `DocMetadata`.
+
+The document services are made for each request, so without this every /abs,
+/pdf, /src, /html and listing request would parse the .abs file or query the DB
+again. The cache is shared by all requests in a worker process.
+
+Entries are keyed by paper id and version and carry a freshness token, such as
+the `updated` time of the .abs file. A cached value is only used if the token
+still matches, so a replaced or updated paper is never served stale. Entries
+are also bounded by count and by age.
+
+The DB service does not check a token, that would be a query as costly as
+getting the paper. Its entries are used until they are
+`DOC_METADATA_CACHE_TTL` old.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from arxiv.document.metadata import DocMetadata
+
+from browse.services.cache import LRUCache
+
+
+class DocMetadataCache:
+    """LRU and TTL bounded cache of `DocMetadata`."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float]):
+        self._cache: LRUCache[Tuple[str, Optional[int]], Tuple[DocMetadata, Any]] = \
+            LRUCache(maxsize, ttl)
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self._cache.ttl
+
+    def get(self, paper_id: str, version: Optional[int], fresh: Any) -> Optional[DocMetadata]:
+        """Gets the cached `DocMetadata` for `paper_id` and `version`.
+
+        `version` of `None` is for the latest version. `fresh` is the current
+        freshness token of the paper, if it differs from the token the entry
+        was cached with the entry is dropped and `None` is returned.
+        """
+        entry = self._cache.get((paper_id, version), valid=lambda entry: entry[1] == fresh)
+        return entry[0] if entry is not None else None
+
+    def put(self, paper_id: str, version: Optional[int], fresh: Any,
+            docmeta: DocMetadata) -> None:
+        """Caches `docmeta` along with its freshness token."""
+        self._cache.put((paper_id, version), (docmeta, fresh))
+
+    def invalidate(self, paper_id: str) -> int:
+        """Drops all versions of `paper_id`, returns how many were dropped."""
+        return self._cache.pop_matching(lambda key: key[0] == paper_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Size, hits, misses and hit rate of the cache."""
+        return self._cache.stats()
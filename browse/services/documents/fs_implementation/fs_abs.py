@@ -1,8 +1,12 @@
 """File system backed core metadata service."""
 
-from typing import List, Union
+from collections import deque
+from functools import partial
+from typing import Deque, Dict, Iterable, List, Optional, Tuple, Union
+from concurrent.futures import Future
 import dataclasses
 
+from flask import current_app
 
 from arxiv.document.metadata import DocMetadata
 from arxiv.document.parse_abs import parse_abs_file
@@ -18,7 +22,10 @@ from arxiv.files.key_patterns import (
     abs_path_current
 )
 from browse.services.documents.config.deleted_papers import DELETED_PAPERS
-from browse.services.documents.base_documents import DocMetadataService
+from browse.services.documents.base_documents import DocMetadataService, abs_or_exception
+from browse.services.documents.doc_cache import DocMetadataCache
+from browse.services.fan_out import get_executor, in_app_context
+from browse.services.single_flight import coalesce
 
 
 def fs_check(abs_store: ObjectStore) -> List[str]:
@@ -36,9 +43,14 @@ def fs_check(abs_store: ObjectStore) -> List[str]:
 class FsDocMetadataService(DocMetadataService):
     """Class for arXiv document metadata service."""
 
-    def __init__(self, abs_store: ObjectStore) -> None:
-        """Initialize the FS document metadata service."""
+    def __init__(self, abs_store: ObjectStore,
+                 cache: Optional[DocMetadataCache] = None) -> None:
+        """Initialize the FS document metadata service.
+
+        If `cache` is passed, parsed .abs files are kept in it and reused
+        while the `updated` time of the .abs file is unchanged."""
         self.abs_store = abs_store
+        self.cache = cache
 
     def get_abs(self, arxiv_id: Union[str, Identifier]) -> DocMetadata:
         """Get the .abs metadata for the specified arXiv paper identifier.
@@ -59,6 +71,37 @@ class FsDocMetadataService(DocMetadataService):
         if paper_id.id in DELETED_PAPERS:
             raise AbsDeletedException(DELETED_PAPERS[paper_id.id])
 
+        # Concurrent requests for the same paper share one read of the .abs files
+        return coalesce("abs", paper_id.idv if paper_id.has_version else paper_id.id,
+                        lambda: self._get_abs(paper_id))
+
+    def get_abs_many(self, arxiv_ids: Iterable[str]) -> Dict[str, Union[DocMetadata, Exception]]:
+        """Get the .abs metadata for many arXiv paper identifiers.
+
+        The .abs files are read concurrently on the fan out executor, see
+        `browse.services.fan_out`, unless `FAN_OUT_MAX_WORKERS` is 0. At most
+        `ABS_MANY_MAX_IN_FLIGHT` reads are on the executor at once so a page
+        with many papers does not take all of its threads."""
+        ids = list(dict.fromkeys(arxiv_ids))
+        if len(ids) < 2 or int(current_app.config.get("FAN_OUT_MAX_WORKERS", 16)) <= 0:
+            return super().get_abs_many(ids)
+
+        executor = get_executor()
+        app = current_app._get_current_object()  # type: ignore
+        window = max(1, int(current_app.config.get("ABS_MANY_MAX_IN_FLIGHT", 4)))
+        found: Dict[str, Union[DocMetadata, Exception]] = {}
+        pending: Deque[Tuple[str, Future]] = deque()
+        for id in ids:
+            if len(pending) >= window:
+                done_id, future = pending.popleft()
+                found[done_id] = future.result()
+            # In an app context so coalesce() and the like see the config as on the request thread
+            pending.append((id, executor.submit(in_app_context(app, partial(abs_or_exception, self.get_abs, id)))))
+        for id, future in pending:
+            found[id] = future.result()
+        return {id: found[id] for id in ids}
+
+    def _get_abs(self, paper_id: Identifier) -> DocMetadata:
         latest_version = self._abs_for_version(identifier=paper_id)
         if not paper_id.has_version \
            or paper_id.version == latest_version.version:
@@ -94,7 +137,16 @@ class FsDocMetadataService(DocMetadataService):
         if version is None then get the latest version."""        
         obj = self.abs_store.to_obj(abs_path_current(identifier)) if is_latest \
             else self.abs_store.to_obj(abs_path_orig(identifier))
-        return parse_abs_file(obj)
+        if self.cache is None or not obj.exists():
+            return parse_abs_file(obj)
+
+        version = None if is_latest else identifier.version
+        updated = obj.updated
+        docmeta = self.cache.get(identifier.id, version, updated)
+        if docmeta is None:
+            docmeta = parse_abs_file(obj)
+            self.cache.put(identifier.id, version, updated, docmeta)
+        return docmeta
 
 
     def service_status(self)->List[str]:
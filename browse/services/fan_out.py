@@ -0,0 +1,171 @@
+"""Run independent lookups concurrently within a request.
+
+Several pages gather data from a number of independent, non-critical
+dependencies (DB tables, the object store, etc.). Done one after the other
+those round-trips add up. `fan_out()` runs them on a shared thread pool, gives
+each one a deadline and falls back to a default value for any lookup that is
+slow or fails, so a single slow dependency cannot hold up the page.
+
+Each lookup runs in its own Flask app context so it can use `current_app`,
+`flask.g` and the `arxiv.db.Session` just as it would on the request thread.
+
+A lookup that misses its deadline can't be stopped and keeps a pool thread
+until it returns. So that a hung dependency can't take over the pool, once
+`FAN_OUT_MAX_ABANDONED` lookups of a name are still running past their
+deadline, later lookups of that name get their default without being run.
+"""
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Flask, current_app
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+
+_abandoned: Dict[str, int] = {}
+_abandoned_lock = Lock()
+# Number of lookups of each name still running past their deadline.
+
+
+@dataclass
+class Lookup:
+    """A single lookup to run in a `fan_out()`.
+
+    fn is called with no arguments.
+
+    default is the value used if fn raises or does not finish by its deadline.
+
+    timeout is the deadline in seconds for this lookup, measured from the start
+    of the `fan_out()`. If `None` the timeout passed to `fan_out()` is used.
+    """
+    fn: Callable[[], Any]
+    default: Any = None
+    timeout: Optional[float] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Gets the process wide executor used for fan-out lookups."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(current_app.config.get("FAN_OUT_MAX_WORKERS", 16))
+                _executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                               thread_name_prefix="fan_out")
+    return _executor
+
+
+def in_app_context(app: Flask, fn: Callable[[], Any]) -> Callable[[], Any]:
+    """Wraps `fn` so it runs in a new app context of `app`."""
+    def wrapper() -> Any:
+        with app.app_context():
+            return fn()
+    return wrapper
+
+
+def _timed(name: str, fn: Callable[[], Any], timings: Dict[str, float]) -> Callable[[], Any]:
+    def wrapper() -> Any:
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            timings[name] = time.perf_counter() - start
+    return wrapper
+
+
+def _abandon(name: str, future: Future) -> None:
+    """Counts `future` as abandoned until it finishes."""
+    with _abandoned_lock:
+        _abandoned[name] = _abandoned.get(name, 0) + 1
+
+    def done(_: Future) -> None:
+        with _abandoned_lock:
+            _abandoned[name] -= 1
+    future.add_done_callback(done)
+
+
+def _too_many_abandoned(name: str, limit: int) -> bool:
+    with _abandoned_lock:
+        return _abandoned.get(name, 0) >= limit
+
+
+def fan_out(lookups: Dict[str, Lookup], timeout: float) \
+        -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Runs `lookups` concurrently and waits for them.
+
+    Parameters
+    ----------
+    lookups: Dict[str, Lookup]
+        Lookups to run keyed by name.
+    timeout: float
+        Default deadline in seconds for a lookup.
+
+    Returns
+    -------
+    Tuple[Dict[str, Any], Dict[str, float]]
+        The value of each lookup by name and how long each took in seconds. A
+        lookup that did not finish by its deadline has its timing reported as
+        the time waited for it.
+
+    If the `FAN_OUT_MAX_WORKERS` config is 0 the lookups are run one after the
+    other on the calling thread. That is useful for debugging.
+    """
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    if not lookups:
+        return results, timings
+
+    if int(current_app.config.get("FAN_OUT_MAX_WORKERS", 16)) <= 0:
+        for name, lookup in lookups.items():
+            results[name] = _run_serial(name, lookup, timings)
+        return results, timings
+
+    app = current_app._get_current_object()  # type: ignore
+    executor = get_executor()
+    max_abandoned = int(current_app.config.get("FAN_OUT_MAX_ABANDONED", 4))
+    start = time.perf_counter()
+    futures: Dict[str, Future] = {}
+    for name, lookup in lookups.items():
+        if _too_many_abandoned(name, max_abandoned):
+            logger.warning("Lookup %s has %d abandoned calls still running, using default",
+                           name, max_abandoned)
+            results[name] = lookup.default
+            timings[name] = 0.0
+            continue
+        futures[name] = executor.submit(in_app_context(app, _timed(name, lookup.fn, timings)))
+    for name, future in futures.items():
+        lookup = lookups[name]
+        deadline = start + (timeout if lookup.timeout is None else lookup.timeout)
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except TimeoutError:
+            if not future.cancel():
+                _abandon(name, future)
+            timings[name] = time.perf_counter() - start
+            logger.warning("Lookup %s did not finish in %.3fs, using default", name,
+                           timings[name])
+            results[name] = lookup.default
+        except Exception as ex:
+            logger.warning("Lookup %s failed, using default: %s", name, ex, exc_info=True)
+            results[name] = lookup.default
+    return results, dict(timings)
+
+
+def _run_serial(name: str, lookup: Lookup, timings: Dict[str, float]) -> Any:
+    try:
+        return _timed(name, lookup.fn, timings)()
+    except Exception as ex:
+        logger.warning("Lookup %s failed, using default: %s", name, ex, exc_info=True)
+        return lookup.default
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Formats `timings` for use as an HTTP `Server-Timing` header value."""
+    return ", ".join(f"{name};dur={secs * 1000:.1f}"
+                     for name, secs in sorted(timings.items()))
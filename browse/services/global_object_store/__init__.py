@@ -1,10 +1,14 @@
 from pathlib import Path
+from typing import Callable, Optional, Sequence, Union
 from urllib.parse import urlparse
 
 import google.cloud.storage as storage
 from arxiv.files import FileObj
 
 from arxiv.files.object_store import ObjectStore, GsObjectStore, LocalObjectStore
+from flask import current_app
+
+from browse.services.fan_out import get_executor
 
 _stores: dict[str, ObjectStore] = {}
 
@@ -39,3 +43,36 @@ def get_global_object_store(path: str, global_name: str) -> ObjectStore:
         store = _path_to_store(path)
         _stores[global_name] = store
     return store
+
+
+def first_existing(objs: Sequence[Optional[Union[FileObj, Callable[[], FileObj]]]]) -> Optional[FileObj]:
+    """Gets the first of `objs` that exists, in the order given.
+
+    Each of `objs` is a `FileObj` or a function that makes one, like
+    `lambda: store.to_obj(key)`. With some stores making the `FileObj` is a
+    round-trip of its own, so passing functions lets that be done concurrently
+    too.
+
+    The probes are done concurrently so the time is that of the slowest probe
+    needed rather than the sum of them. `None` entries are skipped. Returns
+    `None` if none of `objs` exist.
+
+    If the `FAN_OUT_MAX_WORKERS` config is 0 the probes are done one after the
+    other."""
+    candidates = [obj for obj in objs if obj is not None]
+    if len(candidates) < 2 or int(current_app.config.get("FAN_OUT_MAX_WORKERS", 16)) <= 0:
+        return next(filter(None, map(_existing, candidates)), None)
+
+    executor = get_executor()
+    futures = [executor.submit(_existing, obj) for obj in candidates]
+    for future in futures:
+        found = future.result()
+        if found is not None:
+            return found
+    return None
+
+
+def _existing(obj: Union[FileObj, Callable[[], FileObj]]) -> Optional[FileObj]:
+    """Makes the `FileObj` if `obj` is a function, returns it if it exists."""
+    fileobj = obj() if callable(obj) else obj
+    return fileobj if fileobj.exists() else None
@@ -1,10 +1,13 @@
-import arxiv.document.exceptions
-from flask import render_template, url_for
-from arxiv.identifier import Identifier, IdentifierException
+from flask import current_app, render_template, url_for
+from arxiv.files import FileObj, FileTransform
+from io import BytesIO
 import re
 import urllib.parse
+from typing import IO, Dict, Iterable, List, Optional, Tuple, Union
 from arxiv.document.metadata import DocMetadata
+from browse.services.cache import LRUCache
 from browse.services.documents import get_doc_service
+from browse.services.documents.base_documents import ABS_EXCEPTIONS
 from browse.controllers.list_page import dl_for_article, latexml_links_for_article, authors_for_article
 import logging
 
@@ -13,53 +16,85 @@ logger.setLevel(logging.INFO)
 
 LAX_ID_REGEX = b'(arXiv:)?([a-z-]+(\.[A-Z][A-Z])?\/\d{7}|\d{4}\.\d{4,5})(v\d+)?'
 
-def post_process_html(byte_line:bytes) -> bytes:
-    """Transformes each `byte_line` with the HTML post processing to
-    add in any ABS or LIST lines.
+# Match LIST: or ABS: directives followed by an identifier using regular expressions
+_directive = re.compile(b'(LIST|ABS):(' + LAX_ID_REGEX + b')', re.I)
+_report_no = re.compile(b'^\s*REPORT-NO:([A-Za-z0-9-\/]+)', re.I)
 
-    If this is run after the app code returns, say with
-    `make_resposne(post_process_html(somefile))` this needs to be used with
-    `flask.stream_with_context`.
+_page_cache: Optional[LRUCache[Tuple[str, str], bytes]] = None
+# Post processed pages by source file name and etag, shared by all requests in the process.
+
+ENTRY_OVERHEAD = 256
+"""Bytes counted for each page in the page cache on top of its length."""
+
+Resolved = Union[DocMetadata, Exception]
+"""Metadata for a directive's id or the exception from getting it."""
+
+
+def post_process_html(html: bytes) -> bytes:
+    """Transforms `html` with the HTML post processing to add in any ABS or
+    LIST lines.
+
+    This is done in two phases. First all the lines are scanned for directives
+    and the metadata for all of them is gotten at once. Then the lines are
+    transformed. Proceedings with hundreds of entries are not hundreds of
+    lookups one after the other.
+
+    This needs a flask request context.
     """
-    #line=byte_line.decode('utf-8')
-    # Match LIST: or ABS: directives followed by an identifier using regular expressions
-    list_match = re.match(b'(LIST|ABS):(' + LAX_ID_REGEX + b')', byte_line, re.I)
-    report_no_match = re.match(b'^\s*REPORT-NO:([A-Za-z0-9-\/]+)', byte_line, re.I)
+    lines = html.splitlines(keepends=True)
+    metadata = resolve_directives(lines)
+    return b''.join(_post_process_line(line, metadata) for line in lines)
+
+
+def resolve_directives(lines: Iterable[bytes]) -> Dict[str, Resolved]:
+    """Gets the metadata for the ids of all the LIST: and ABS: directives in `lines`.
+
+    The metadata is gotten in bulk with `get_abs_many()`. Returns a dict of id
+    as written in the directive to its metadata or the exception for a bad id
+    or missing paper."""
+    ids: List[str] = []
+    for line in lines:
+        list_match = _directive.match(line)
+        if list_match:
+            id = list_match.group(2).decode('utf-8')
+            if id not in ids:
+                ids.append(id)
+
+    return get_doc_service().get_abs_many(ids)
+
+
+def _post_process_line(byte_line: bytes, metadata: Dict[str, Resolved]) -> bytes:
+    list_match = _directive.match(byte_line)
+    report_no_match = _report_no.match(byte_line)
     if list_match:
-        try:
-            cmd = list_match.group(1) #which command to perform
-            if cmd==b'ABS':
-                include_abstract=True
-            else:
-                include_abstract=False
-            id = list_match.group(2).decode('utf-8') #document ID
-            arxiv_id=Identifier(id)
-
-            new_html = "<dl>\n"
-
-            if arxiv_id:
-                #get and format metadata here as html
-                metadata=get_doc_service().get_abs(arxiv_id)
-                downloads= dl_for_article(metadata)
-                latexml=latexml_links_for_article(metadata)
-                author_links=authors_for_article(metadata)
-                item_string=render_template('list/conference_item.html',
-                                            item=metadata,
-                                            include_abstract=include_abstract,
-                                            downloads=downloads,
-                                            latexml=latexml,
-                                            author_links=author_links,
-                                            url_for_author_search=author_query )
-
-                new_html+= item_string
-            else:
-                new_html += f"<dd>{id} [failed to get identifier for paper]</dd>\n"
-
-            new_html += "</dl>\n"
-            new_bytes=new_html.encode('utf-8')
-        except (arxiv.document.exceptions.AbsException, IdentifierException ) as ee:
-            new_bytes = byte_line
-            logger.error(f"Source of html paper had a problem during post_process_html: {ee}")
+        cmd = list_match.group(1) #which command to perform
+        if cmd==b'ABS':
+            include_abstract=True
+        else:
+            include_abstract=False
+        id = list_match.group(2).decode('utf-8') #document ID
+        found = metadata[id]
+        if isinstance(found, Exception):
+            if not isinstance(found, ABS_EXCEPTIONS):
+                raise found
+            logger.error(f"Source of html paper had a problem during post_process_html: {found}")
+            return byte_line
+
+        new_html = "<dl>\n"
+        #format metadata here as html
+        downloads= dl_for_article(found)
+        latexml=latexml_links_for_article(found)
+        author_links=authors_for_article(found)
+        item_string=render_template('list/conference_item.html',
+                                    item=found,
+                                    include_abstract=include_abstract,
+                                    downloads=downloads,
+                                    latexml=latexml,
+                                    author_links=author_links,
+                                    url_for_author_search=author_query )
+        new_html+= item_string
+        new_html += "</dl>\n"
+        new_bytes=new_html.encode('utf-8')
 
     elif report_no_match: #need to find proceeding to test with
         rn = report_no_match.group(1).decode('utf-8')
@@ -72,3 +107,67 @@ def post_process_html(byte_line:bytes) -> bytes:
 
 def author_query(article: DocMetadata, query: str)->str:
     return str(url_for('search_box', searchtype='author', query=query))
+
+
+def get_page_cache() -> Optional[LRUCache[Tuple[str, str], bytes]]:
+    """Gets the process wide cache of post processed pages.
+
+    The cache is bounded by the total bytes of the pages. Returns `None` if it
+    is disabled with `NATIVE_HTML_PAGE_CACHE_BYTES` of 0."""
+    global _page_cache
+    max_bytes = int(current_app.config.get("NATIVE_HTML_PAGE_CACHE_BYTES", 0))
+    if max_bytes <= 0:
+        return None
+    if _page_cache is None:
+        _page_cache = LRUCache(max_bytes, current_app.config.get("NATIVE_HTML_PAGE_CACHE_TTL", None),
+                               weigher=lambda html: len(html) + ENTRY_OVERHEAD)
+    return _page_cache
+
+
+def has_directives(lines: Iterable[bytes]) -> bool:
+    """Does any of `lines` need `post_process_html()`?"""
+    return any(_directive.match(line) or _report_no.match(line) for line in lines)
+
+
+class PostProcessedHTML(FileTransform):
+    """A native HTML paper file with `post_process_html()` applied.
+
+    Most native HTML files have no LIST:, ABS: or REPORT-NO: lines. The file is
+    first scanned line by line and if it has none it is streamed as is.
+    Otherwise the whole file is processed. Either way the result is cached by
+    the file's name and etag, a file that needs no processing as an empty page,
+    so that it is scanned only once.
+    """
+    def __init__(self, file: FileObj):
+        self.fileobj = file
+        self._html: Optional[bytes] = None
+
+    def html(self) -> bytes:
+        """The post processed HTML, empty if the file is used as is."""
+        if self._html is not None:
+            return self._html
+        cache = get_page_cache()
+        key = (self.fileobj.name, self.fileobj.etag)
+        html = cache.get(key) if cache is not None else None
+        if html is None:
+            html = self._process()
+            if cache is not None:
+                cache.put(key, html)
+        self._html = html
+        return html
+
+    def _process(self) -> bytes:
+        with self.fileobj.open('rb') as fh:
+            if not has_directives(fh):
+                return b''
+        with self.fileobj.open('rb') as fh:
+            return post_process_html(fh.read())
+
+    def open(self, *args, **kwargs) -> IO[bytes]:  # type: ignore
+        html = self.html()
+        return BytesIO(html) if html else self.fileobj.open(*args, **kwargs)
+
+    @property
+    def size(self) -> int:
+        html = self.html()
+        return len(html) if html else self.fileobj.size
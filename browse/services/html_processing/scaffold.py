@@ -1,14 +1,13 @@
 from flask import render_template
 import re
-import typing
 from dataclasses import dataclass
-from typing import Tuple, Optional
+from typing import BinaryIO, Dict, Iterator, Optional
 from arxiv.files import FileObj, FileTransform
 
 @dataclass
 class ArticleScaffoldMetadata:
     """ A class which collects all metadata required by an HTML article scaffold. This is needed
-    since a published article and a submitted article have different DB models, and we only want a 
+    since a published article and a submitted article have different DB models, and we only want a
     small intersection of available metadata fields for the template rendering.
     """
     license : Optional[str]
@@ -17,83 +16,199 @@ class ArticleScaffoldMetadata:
     primary_category : Optional[str]
     date_of_version : Optional[str]
 
-# This is a stateless transform that can insert scaffolding at the usual global markup transition points.
-def render_branded_html_paper(byte_line:bytes, state: str, meta: ArticleScaffoldMetadata) -> Tuple[str, bytes]:
+
+BLOCK_SIZE = 256 * 1024
+"""Bytes read from the latexml HTML at a time. Papers can be tens of MB."""
+
+SCAFFOLD_TEMPLATES = {
+    'head_mixins': "dissemination/article_scaffold/head_mixins.html",
+    'header': "dissemination/article_scaffold/header.html",
+    'callout_license': "dissemination/article_scaffold/callout_license.html",
+    'footer': "dissemination/article_scaffold/footer.html",
+}
+
+_head_end = re.compile(rb'</head>$', re.I)
+_legacy_asset = re.compile(rb'<(link|script) ', re.I)
+_legacy_js = re.compile(rb'(?:addons_new|bootstrap\.bundle\.min|html2canvas\.min|feedbackOverlay)\.js')
+_body_start = re.compile(rb'<body>', re.I)
+_page_content = re.compile(rb'\s*<div class="ltx_page_content"', re.I)
+# In body_content only lines starting with these are of interest, so whole blocks are searched at once
+_body_content_stop = re.compile(rb'^(?:<footer|</body>)', re.I | re.M)
+_footer_end = re.compile(rb'</footer>$', re.I | re.M)
+
+
+def render_scaffold_fragments(meta: ArticleScaffoldMetadata) -> Dict[str, bytes]:
+    """Renders the arXiv-branded fragments inserted into a latexml HTML paper.
+
+    This needs a flask request context so do it before the response starts streaming."""
+    return {name: render_template(template, meta=meta).encode('utf-8')
+            for name, template in SCAFFOLD_TEMPLATES.items()}
+
+
+class BrandedHTMLRewriter:
     """ We brand and post-process the latexml-generated HTML asset, to allow for change management
         of branded materials within arxiv-browse itself.
-        
+
         The HTML assets from latexml include a single versioned CSS and JS asset, each of which served
         from browse, and coordinated with a LaTeXML version/release. Logic depending on latexml markup
         belongs either in latexml, in our conversion worker or in the CSS/JS assets, not here.
 
         arXiv-branded headers, footers, etc are added here.
+
+        This is a streaming state machine over lines of the HTML. It is fed blocks of any size
+        with `feed()` and the final partial line is emitted by `finish()`. The head and the start
+        of the body are scanned line by line. After the start of the page content, which is almost
+        all of a paper, whole blocks are passed through with a single search for the next `<footer`
+        or `</body>`.
     """
-    match state:
-        case 'noop':
-            # once in noop state, we remain there
-            return (state, byte_line)
-        case 'head':
-            if re.search(b'</head>$', byte_line, re.I):
-                # insert new head mixins before </head>
-                return ('head_end', \
-                    render_template("dissemination/article_scaffold/head_mixins.html", meta=meta)
-                    .encode('utf-8') + byte_line)
-            elif re.match(b'<(link|script) ', byte_line, re.I) and \
-                re.search(b'(?:addons_new|bootstrap\.bundle\.min|html2canvas\.min|feedbackOverlay)\.js', byte_line):
-                # pre 02.2026, we used JS rewrites and just returned the GCP bucket HTML content directly
-                # For backwards compatibility: when encountering those cases, ABORT REWRITE (noop state)
-                return ("noop", byte_line)
-            else:
-                # pass through all other lines unmodified
-                return (state, byte_line)
-        case 'head_end':
-            if re.match(b'<body>', byte_line, re.I):
-                return ('body', \
-                    byte_line + render_template("dissemination/article_scaffold/header.html",
-                                                 meta=meta)
-                    .encode('utf-8'))
-            else: # continue until we find <body>
-                return (state, byte_line)
-        case 'body':
-            if re.match(b'\s*<div class="ltx_page_content"', byte_line, re.I):
-                # add the licensing infobox at the start of the document content.
-                return ('body_content', \
-                    render_template("dissemination/article_scaffold/callout_license.html", meta=meta)
-                    .encode('utf-8') + byte_line)
-            else:
-                return (state, byte_line)
-        case 'body_footer': # skip the original latexml footer, we render an arXiv one
-            if re.search(b'</footer>$', byte_line, re.I):
-                return ('body_content', b'') # skipping completed.
-            else: 
-                return ('body_footer', b'')
-        case 'body_content':
-            if re.match(b'<footer', byte_line, re.I):
-                return ('body_footer', b'')
-            elif re.match(b'</body>', byte_line, re.I):
-                return ('body_end', \
-                    render_template("dissemination/article_scaffold/footer.html", meta=meta)
-                    .encode('utf-8') + byte_line)
+    def __init__(self, fragments: Dict[str, bytes]):
+        self.fragments = fragments
+        self.state = 'head'  # initial transform state
+        self._carry = b''
+
+    def feed(self, block: bytes) -> bytes:
+        """Rewrites the complete lines in `self._carry + block`, keeps any partial line."""
+        data = self._carry + block if self._carry else block
+        end = data.rfind(b'\n') + 1
+        self._carry = data[end:]
+        return self._rewrite(data[:end]) if end else b''
+
+    def finish(self) -> bytes:
+        """Rewrites any final line that had no newline."""
+        data, self._carry = self._carry, b''
+        return self._rewrite(data) if data else b''
+
+    def _rewrite(self, data: bytes) -> bytes:
+        out = []
+        pos = 0
+        size = len(data)
+        while pos < size:
+            match self.state:
+                case 'noop' | 'body_end':
+                    # once in noop or body_end state, we remain there
+                    out.append(data[pos:])
+                    break
+                case 'body_content':
+                    stop = _body_content_stop.search(data, pos)
+                    if stop is None:
+                        out.append(data[pos:])
+                        break
+                    out.append(data[pos:stop.start()])
+                    pos = stop.start()
+                    if data[pos + 1:pos + 2] == b'/':  # </body>
+                        out.append(self.fragments['footer'])
+                        self.state = 'body_end'
+                    else:  # skip the original latexml footer, we render an arXiv one
+                        pos = _line_end(data, pos)
+                        self.state = 'body_footer'
+                case 'body_footer':
+                    footer_end = _footer_end.search(data, pos)
+                    if footer_end is None:
+                        break
+                    pos = _line_end(data, footer_end.start())
+                    self.state = 'body_content'  # skipping completed.
+                case _:
+                    end = _line_end(data, pos)
+                    out.append(self._rewrite_line(data[pos:end]))
+                    pos = end
+        return b''.join(out)
+
+    def _rewrite_line(self, line: bytes) -> bytes:
+        match self.state:
+            case 'head':
+                if _head_end.search(line):
+                    # insert new head mixins before </head>
+                    self.state = 'head_end'
+                    return self.fragments['head_mixins'] + line
+                elif _legacy_asset.match(line) and _legacy_js.search(line):
+                    # pre 02.2026, we used JS rewrites and just returned the GCP bucket HTML content directly
+                    # For backwards compatibility: when encountering those cases, ABORT REWRITE (noop state)
+                    self.state = 'noop'
+            case 'head_end':
+                if _body_start.match(line):
+                    self.state = 'body'
+                    return line + self.fragments['header']
+            case 'body':
+                if _page_content.match(line):
+                    # add the licensing infobox at the start of the document content.
+                    self.state = 'body_content'
+                    return self.fragments['callout_license'] + line
+        # pass through all other lines unmodified
+        return line
+
+
+def _line_end(data: bytes, pos: int) -> int:
+    """Index just after the line in `data` that `pos` is on."""
+    end = data.find(b'\n', pos)
+    return len(data) if end < 0 else end + 1
+
+
+class _BrandedHTMLReader:
+    """Binary file-like reader that rewrites another with a `BrandedHTMLRewriter`."""
+    def __init__(self, raw: BinaryIO, rewriter: BrandedHTMLRewriter):
+        self.raw = raw
+        self.rewriter = rewriter
+        self._buffer = b''
+        self._eof = False
+
+    def _next_block(self) -> bytes:
+        """Gets the next non-empty rewritten block, or `b''` at the end."""
+        while not self._eof:
+            block = self.raw.read(BLOCK_SIZE)
+            if block:
+                out = self.rewriter.feed(block)
             else:
-                return (state, byte_line)
-        case _:
-            # pass through all other lines unmodified
-            return (state, byte_line)
+                self._eof = True
+                out = self.rewriter.finish()
+            if out:
+                return out
+        return b''
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        if self._buffer:
+            out, self._buffer = self._buffer, b''
+            return out
+        out = self._next_block()
+        if not out:
+            raise StopIteration
+        return out
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            out = self._next_block()
+            if not out:
+                break
+            self._buffer += out
+        if size < 0:
+            size = len(self._buffer)
+        out, self._buffer = self._buffer[:size], self._buffer[size:]
+        return out
+
+    def close(self) -> None:
+        self.raw.close()
+
+    def __enter__(self) -> '_BrandedHTMLReader':
+        return self
+
+    def __exit__(self, *args) -> None:  # type: ignore
+        self.close()
+
 
 class HTMLFileTransform(FileTransform):
-    """ A stateful `FileTransform` that applies HTML post-processing and branding to HTML papers.
-        We track the state of the HTML asset being transformed in this object, to minimize regex overhead.
+    """ A `FileTransform` that applies HTML post-processing and branding to HTML papers.
+
+        The scaffold fragments are rendered once when this is created, each `open()` gets its own
+        `BrandedHTMLRewriter` over large blocks of the file.
 
         Note: Depends on DB access to get metadata for licensing header.
     """
-    def __init__(self, file: FileObj, transform_fn: typing.Callable[[bytes, str, ArticleScaffoldMetadata], Tuple[str, bytes]], meta: ArticleScaffoldMetadata):
+    def __init__(self, file: FileObj, meta: ArticleScaffoldMetadata):
         self.fileobj = file
-        self.transform_fn = transform_fn
         self.meta = meta
-        self.transform_state = 'head' # initial transform state
-
-    def transform(self, data: bytes) -> bytes:
-        (new_state, new_data) = self.transform_fn(data, self.transform_state, self.meta)
-        self.transform_state = new_state
-        return new_data
+        self.fragments = render_scaffold_fragments(meta)
 
+    def open(self, *args, **kwargs) -> _BrandedHTMLReader:  # type: ignore
+        return _BrandedHTMLReader(self.fileobj.open('rb'), BrandedHTMLRewriter(self.fragments))
@@ -3,13 +3,22 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import date
-from typing import Any, List, Literal, Optional, Tuple, Union, cast
+from typing import TYPE_CHECKING, Any, List, Literal, Optional, Tuple, Union, cast
 
 from flask import g, current_app
 
 from arxiv.document.metadata import DocMetadata
 from browse.services import HasStatus
 
+if TYPE_CHECKING:
+    from .month_cache import ListingFileCache, MonthCache
+
+_month_cache: Optional["MonthCache"] = None
+# Shared by all requests in the process, it is thread safe.
+
+_new_cache: Optional["ListingFileCache"] = None
+# Parsed new and pastweek files, shared by all requests in the process.
+
 
 def get_listing_service() -> "ListingService":
     """Get the listing service configured for the app context."""
@@ -23,7 +32,40 @@ def get_listing_service() -> "ListingService":
 def fs_listing(config: dict, _: Any) -> "ListingService":
     """Factory function for filesystem-based listing service."""
     from .fs_listings import FsListingFilesService
-    return FsListingFilesService(config["DOCUMENT_LISTING_PATH"])
+    return FsListingFilesService(config["DOCUMENT_LISTING_PATH"], get_month_cache(config),
+                                 get_new_cache(config))
+
+
+def get_month_cache(config: dict) -> Optional["MonthCache"]:
+    """Gets the process wide cache of parsed monthly listing files.
+
+    Returns `None` if the cache is disabled with `LISTING_MONTH_CACHE_SIZE` of 0."""
+    global _month_cache
+    size = int(config.get("LISTING_MONTH_CACHE_SIZE", 0))
+    if size <= 0:
+        return None
+    if _month_cache is None:
+        from .month_cache import MonthCache
+        _month_cache = MonthCache(size, config.get("LISTING_MONTH_CACHE_TTL", None),
+                                  config.get("LISTING_MONTH_CACHE_DIR", ""),
+                                  int(config.get("LISTING_YEAR_CACHE_SIZE", 32)))
+    return _month_cache
+
+
+def get_new_cache(config: dict) -> Optional["ListingFileCache"]:
+    """Gets the process wide cache of parsed new and pastweek listing files.
+
+    The cache is bounded by the rough bytes of the parsed files. Returns `None`
+    if the cache is disabled with `LISTING_NEW_CACHE_BYTES` of 0."""
+    global _new_cache
+    max_bytes = int(config.get("LISTING_NEW_CACHE_BYTES", 0))
+    if max_bytes <= 0:
+        return None
+    if _new_cache is None:
+        from .month_cache import ListingFileCache, listing_bytes
+        _new_cache = ListingFileCache(max_bytes, config.get("LISTING_NEW_CACHE_TTL", None),
+                                      weigher=listing_bytes)
+    return _new_cache
 
 def db_listing(config: dict, _: Any) -> "ListingService":
     """Factory function for DB backed listing service."""
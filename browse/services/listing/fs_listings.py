@@ -6,7 +6,7 @@ Can be either local file or GCP storage.
 import logging
 import re
 from datetime import date, datetime
-from typing import List, Literal, Optional, Tuple, Union
+from typing import Callable, List, Literal, Optional, Tuple, TypeVar, Union
 
 import google.cloud.storage as storage
 
@@ -19,13 +19,17 @@ from arxiv.files import FileObj
 from arxiv.files.object_store import ObjectStore, GsObjectStore, LocalObjectStore
 from werkzeug.exceptions import BadRequest
 
-from .parse_listing_file import ParsingMode, get_updates_from_list_file
-from .parse_listing_pastweek import parse_listing_pastweek
-from .parse_new_listing_file import parse_new_listing_file
+from .month_cache import ListingFileCache, MonthCache
+from .parse_listing_file import (CompiledMonth, MonthsListing, ParsingMode,
+                                 compile_month, get_updates_from_list_file)
+from .parse_listing_pastweek import PastweekListing, compile_pastweek
+from .parse_new_listing_file import NewListing, compile_new_listing
 
 logger = logging.getLogger(__name__)
 logger.level = logging.DEBUG
 
+T = TypeVar("T")
+
 ListingFileType = Literal["new", "pastweek", "month"]
 """These are the listing file types."""
 
@@ -37,8 +41,11 @@ class FsListingFilesService(ListingService):
     or a GCP storage bucket.
     """
 
-    def __init__(self, document_listing_path: str):
+    def __init__(self, document_listing_path: str, month_cache: Optional[MonthCache] = None,
+                 new_cache: Optional[ListingFileCache] = None):
         self.document_listing_path = document_listing_path
+        self.month_cache = month_cache
+        self.new_cache = new_cache
         self.obj_store: ObjectStore = LocalObjectStore(document_listing_path)
         self.listing_files_root = "./"
         
@@ -58,6 +65,11 @@ class FsListingFilesService(ListingService):
 
         This just formats the string file name and returns a `Path`. It does
         not check if the file exists."""
+        return self.obj_store.to_obj(self._listing_key(fileMode, archiveOrCategory, year, month))
+
+    def _listing_key(self, fileMode: ListingFileType, archiveOrCategory: str,
+                     year: int, month: int) -> str:
+        """Key of a listing file in `obj_store`, see `_generate_listing_path()`."""
         categorySuffix = ''
         archive_id = ''
         if archiveOrCategory in ARCHIVES:
@@ -88,8 +100,46 @@ class FsListingFilesService(ListingService):
         else:
             listingFilePath = f'{listingRoot}{fileMode}{categorySuffix}'
 
-        return self.obj_store.to_obj(listingFilePath)
+        return listingFilePath
 
+    def _year_month_files(self, archiveOrCategory: str, year: int) -> List[Tuple[str, FileObj]]:
+        """Gets `(yymm, FileObj)` of the monthly listing files for `year` that exist.
+
+        This is one listing of the object store rather than a check of each
+        month's file. The `updated` times come with the listing."""
+        prefix = self._listing_key('month', archiveOrCategory, year, 1)[:-2]
+        yy = prefix.rsplit('/', 1)[-1]
+        month_name = re.compile(f'{re.escape(yy)}(0[1-9]|1[0-2])')
+        files = []
+        for item in self.obj_store.list(prefix):
+            name = item.name.rsplit('/', 1)[-1]
+            if month_name.fullmatch(name):
+                files.append((f'{yy[-2:]}{name[-2:]}', item))
+        return sorted(files, key=lambda yymm_file: yymm_file[0])
+
+    def _months_listing(self, listingFilter: str, key: Tuple[str, int],
+                        files: List[Tuple[str, FileObj]]) -> MonthsListing:
+        """Gets the `MonthsListing` of `files`, from the month cache if there is one."""
+        if self.month_cache is not None:
+            return self.month_cache.months_listing(listingFilter, key, files)
+        return MonthsListing.from_months(((yymm, self._compiled_month(file)) for yymm, file in files),
+                                         listingFilter)
+
+
+    def _compiled_month(self, listingFile: FileObj) -> CompiledMonth:
+        """Gets the parsed monthly listing file, from the month cache if there is one."""
+        if self.month_cache is not None:
+            return self.month_cache.get(listingFile)
+        with listingFile.open('rb') as fh:
+            return compile_month(fh.read())
+
+    def _compiled_file(self, listingFile: FileObj,
+                       compile: Callable[[bytes], T]) -> T:
+        """Gets a new or pastweek file parsed by `compile`, from the cache if there is one."""
+        if self.new_cache is not None:
+            return self.new_cache.get(listingFile, compile)
+        with listingFile.open('rb') as fh:
+            return compile(fh.read())
 
     def _current_y_m_em(self, year:int) -> Tuple[str,int,int]:
         """Gets `(currentYear, currentMonth, end_month)`"""
@@ -105,6 +155,10 @@ class FsListingFilesService(ListingService):
         """Returns whether data has been modified since `if_modified_since`."""
         if not listingFile.exists():
             return False
+        return self._updated_since(if_modified_since, listingFile)
+
+    def _updated_since(self, if_modified_since: str, listingFile: FileObj) -> bool:
+        """Returns whether `listingFile`, which must exist, was updated since `if_modified_since`."""
         parsed = datetime.strptime(if_modified_since, '%a, %d %b %Y %H:%M:%S GMT')
         modTime = listingFile.updated
         return modTime > parsed
@@ -177,34 +231,24 @@ class FsListingFilesService(ListingService):
                     for _,_, lf in yymmfiles]):
                 return NotModifiedResponse(True, gen_expires())
 
-        # Collect updates for each month
-        all_listings: List[ListingItem] = []
-        all_pubdates: List[Tuple[date,int]] = []
+        # Collect updates for each month, only the items shown get DocMetadata
+        months: List[Tuple[str, CompiledMonth]] = []
         for year, month, listingFile in yymmfiles:
             if not listingFile.exists() and currentYear != str(year)\
                and currentMonth != str(month):
                 # This is fine if new month and no announce has happened yet.
                 raise Exception(f"Missing monthly listing file {listingFile}")
 
-            response = get_updates_from_list_file(year, month, listingFile,
-                                                  mode, archiveOrCategory)
-            if not isinstance(response, Listing):
-                return response
-            
-            all_listings.extend(response.listings)            
-            if response.pubdates:
-                all_pubdates.extend(response.pubdates)
-            # else:
-            #     pub_date = date(year, month, 1).strftime('%a, %d %b %Y')
-            #     all_pubdates.append((pub_date, len(response.listings)))
-
-        return Listing(listings=all_listings[skip:skip + show], # Adjust for skip/show
-                       pubdates=all_pubdates,
-                       count=len(all_listings),
-                       expires= gen_expires())
-
-
-    
+            compiled = self._compiled_month(listingFile)
+            if mode == 'monthly_counts':
+                return get_updates_from_list_file(year, month, listingFile, mode,
+                                                  archiveOrCategory, compiled)
+            months.append((f'{year % 100:02d}{month:02d}', compiled))
+
+        listing = MonthsListing.from_months(months, archiveOrCategory)
+        return _listing_response(listing, skip, show, mode == 'month')
+
+
     def list_articles_by_year(self,
                               archiveOrCategory: str,
                               year: int,
@@ -223,16 +267,13 @@ class FsListingFilesService(ListingService):
 
         Existing production year list links use two digit year.
         """
-        _, _, end_month = self._current_y_m_em(year)
-        months = [(year, month) for month in range(1, end_month + 1)]
-        possible = (
-            (year, month, self._generate_listing_path('month', archiveOrCategory,
-                                                      year, month))
-            for year, month in months)
-        yymmfiles = [(year, month, fobj) for (year, month, fobj) in possible
-                     if fobj.exists()]
-        return self._list_articles_by_period(archiveOrCategory, yymmfiles, skip,
-                                             show, if_modified_since) # type: ignore
+        files = self._year_month_files(archiveOrCategory, year)
+        if if_modified_since: # Check if-modified-since for months of interest
+            if all([not self._updated_since(if_modified_since, lf) for _, lf in files]):
+                return NotModifiedResponse(True, gen_expires()) # type: ignore
+
+        listing = self._months_listing(archiveOrCategory, (archiveOrCategory, year), files)
+        return _listing_response(listing, skip, show)
 
 
     def list_articles_by_month(self,
@@ -275,9 +316,8 @@ class FsListingFilesService(ListingService):
         if if_modified_since and self._modified_since(if_modified_since, file):
             return NotModifiedResponse(True, gen_expires())
         else:
-            rv =  parse_new_listing_file(file)
-            rv.listings = rv.listings[skip:skip + show] # Adjust for skip/show
-            return rv
+            new: NewListing = self._compiled_file(file, compile_new_listing)
+            return new.listing(skip, show) # Adjust for skip/show
 
     def list_pastweek_articles(self,
                                archiveOrCategory: str,
@@ -297,32 +337,18 @@ class FsListingFilesService(ListingService):
         if if_modified_since and self._modified_since(if_modified_since, file):
             return NotModifiedResponse(True, gen_expires())
         else:
-            rv = parse_listing_pastweek(file)
-            rv.listings = rv.listings[skip:skip + show] # Adjust for skip/show
-            return rv
+            pastweek: PastweekListing = self._compiled_file(file, compile_pastweek)
+            return pastweek.listing(skip, show) # Adjust for skip/show
 
     def monthly_counts(self, archive: str, year: int) -> YearCount:
         """Gets monthly listing counts for the year."""
-        monthly_counts: List[MonthTotal] = []
-        new_cnt, cross_cnt = 0, 0
-        currentYear, currentMonth, end_month = self._current_y_m_em(year)
-
-        files = []
-        for month in range(1, end_month + 1):
-            file = self._generate_listing_path('month', archive, year, month)
-            files.append((month, file, file.exists()))
-        month_totals=[]
-        for month, file, exists in files:
-            if not exists:
-                continue
-            response = get_updates_from_list_file(year, month, file, 'monthly_counts'
-                                                  # archive TODO Does this need archive?
-                                                  )
-            if isinstance(response, MonthTotal):
-                monthly_counts.append(response)
-                new_cnt += response.new
-                cross_cnt += response.cross
-                month_totals.append(MonthCount(year,month,response.new,response.cross))
+        files = self._year_month_files(archive, year)
+        # TODO Does this need archive?
+        listing = self._months_listing('', (archive, year), files)
+        month_totals = [MonthCount(year, int(yymm[2:]), new, cross)
+                        for (yymm, _, _), new, cross
+                        in zip(listing.months, listing.new_counts, listing.cross_counts)]
+        new_cnt, cross_cnt = sum(listing.new_counts), sum(listing.cross_counts)
 
         year_resp=YearCount(year, new_cnt, cross_cnt,month_totals)
 
@@ -341,3 +367,12 @@ class FsListingFilesService(ListingService):
                 return []
         except Exception as ex:
             return [f"{__name__} Could not access '{self.document_listing_path}' due to {ex}"]
+
+
+def _listing_response(listing: MonthsListing, skip: int, show: int,
+                      with_pubdates: bool = True) -> Listing:
+    """Listing of items `skip` to `skip + show` of `listing`."""
+    return Listing(listings=listing.listing_items(skip, show), # Adjust for skip/show
+                   pubdates=listing.pubdates() if with_pubdates else [],
+                   count=listing.count,
+                   expires=gen_expires())
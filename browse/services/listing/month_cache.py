@@ -0,0 +1,175 @@
+"""Process wide cache of parsed monthly listing files.
+
+A monthly listing file for a big archive has thousands of items and parsing it
+takes a good fraction of a second. Without this every month and year page for
+the archive, or any category in it, parses the same files again.
+
+Each file is parsed once into a `CompiledMonth`, which is kept in memory keyed
+by the file's name and checked against the file's `updated` time before use.
+With a `cache_dir` the items are also saved as JSON so other worker processes,
+and the next start of the app, do not need to parse the file again. Saved
+files carry the `updated` time of the listing file they were made from and are
+only used if it still matches.
+
+Year listings and counts are kept as `MonthsListing`s made from the cached
+months. Each is checked against the `updated` times of all of its month files,
+so when the current month's file is updated only that month is parsed again.
+
+`ListingFileCache` does the same in memory for the new and pastweek files.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Sequence, Tuple, TypeVar
+
+from arxiv.files import FileObj
+
+from browse.services.cache import LRUCache
+from browse.services.single_flight import coalesce
+
+from .parse_listing_file import CompiledMonth, MonthsListing, compile_month
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+FORMAT = 1
+"""Version of the JSON saved in the cache dir, bump if `MonthItem` changes."""
+
+
+class MonthCache:
+    """LRU and TTL bounded cache of `CompiledMonth` with an optional dir of saved months.
+
+    Also caches up to `years_maxsize` `MonthsListing`s. These hold on to their
+    `CompiledMonth`s so keep it small."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None, cache_dir: str = "",
+                 years_maxsize: int = 32):
+        self._cache: LRUCache[str, Tuple[CompiledMonth, str]] = LRUCache(maxsize, ttl)
+        self._years: LRUCache[Hashable, Tuple[MonthsListing, Tuple[Tuple[str, str], ...]]] = \
+            LRUCache(years_maxsize, ttl)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    def get(self, listingFile: FileObj) -> CompiledMonth:
+        """Gets the parsed `listingFile`, parsing it if it is not cached or has been updated."""
+        updated = str(listingFile.updated)
+        entry = self._cache.get(listingFile.name)
+        if entry is not None and entry[1] == updated:
+            return entry[0]
+        return coalesce("listing_month", (listingFile.name, updated),
+                        lambda: self._load(listingFile, updated))
+
+    def months_listing(self, listingFilter: str, key: Hashable,
+                       files: Sequence[Tuple[str, FileObj]]) -> MonthsListing:
+        """Gets the `MonthsListing` for `listingFilter` of the `(yymm, FileObj)` in `files`.
+
+        `key` identifies the months, like the archive and year. The cached
+        listing is used if `files` have the same names and `updated` times as
+        when it was made."""
+        fresh = tuple((file.name, str(file.updated)) for _, file in files)
+        entry = self._years.get((listingFilter, key))
+        if entry is not None and entry[1] == fresh:
+            return entry[0]
+        listing = MonthsListing.from_months(((yymm, self.get(file)) for yymm, file in files),
+                                            listingFilter)
+        self._years.put((listingFilter, key), (listing, fresh))
+        return listing
+
+    def _load(self, listingFile: FileObj, updated: str) -> CompiledMonth:
+        compiled = self._read_saved(listingFile.name, updated)
+        if compiled is None:
+            with listingFile.open('rb') as fh:
+                compiled = compile_month(fh.read())
+            self._save(listingFile.name, updated, compiled)
+        self._cache.put(listingFile.name, (compiled, updated))
+        return compiled
+
+    def _saved_path(self, name: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / (re.sub(r'[^\w.-]+', '_', name.strip('./')) + '.json')
+
+    def _read_saved(self, name: str, updated: str) -> Optional[CompiledMonth]:
+        path = self._saved_path(name)
+        if path is None or not path.exists():
+            return None
+        try:
+            with path.open('r', encoding='utf-8') as fh:
+                data = json.load(fh)
+            if data.get('format') != FORMAT or data.get('updated') != updated:
+                return None
+            return CompiledMonth.from_json(data['items'])
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            logger.warning("Could not read saved listing month %s: %s", path, ex)
+            return None
+
+    def _save(self, name: str, updated: str, compiled: CompiledMonth) -> None:
+        path = self._saved_path(name)
+        if path is None:
+            return
+        data: Dict[str, Any] = {'format': FORMAT, 'updated': updated, 'items': compiled.to_json()}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                    json.dump(data, fh, separators=(',', ':'))
+                os.replace(tmp, path)  # readers see the old or the new file, never a partial one
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as ex:
+            logger.warning("Could not save listing month %s: %s", path, ex)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._years.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
+
+
+PARSED_BYTES_PER_CHAR = 4
+"""Rough bytes of memory a parsed listing item takes for each character of its text."""
+
+
+def listing_bytes(listing: Any) -> int:
+    """Rough bytes a `NewListing` or `PastweekListing` takes with all its items parsed."""
+    return int(listing.text_size) * PARSED_BYTES_PER_CHAR
+
+
+class ListingFileCache(Generic[T]):
+    """LRU and TTL bounded cache of parsed listing files, like `NewListing`.
+
+    Entries are keyed by the file's name and are only used if the file's
+    `updated` time is the same as when it was parsed. With `weigher`, like
+    `listing_bytes()`, `maxsize` is the max total weight of the entries."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None,
+                 weigher: Optional[Callable[[Any], int]] = None):
+        self._cache: LRUCache[str, Tuple[Any, str]] = LRUCache(
+            maxsize, ttl, weigher=(lambda entry: weigher(entry[0])) if weigher is not None else None)
+
+    def get(self, listingFile: FileObj, compile: Callable[[bytes], T]) -> T:
+        """Gets `listingFile` parsed by `compile`, parsing it if it is not cached or has been updated."""
+        updated = str(listingFile.updated)
+        entry = self._cache.get(listingFile.name)
+        if entry is not None and entry[1] == updated:
+            return entry[0]  # type: ignore
+        return coalesce("listing_file", (listingFile.name, updated),
+                        lambda: self._load(listingFile, updated, compile))
+
+    def _load(self, listingFile: FileObj, updated: str, compile: Callable[[bytes], T]) -> T:
+        with listingFile.open('rb') as fh:
+            parsed = compile(fh.read())
+        self._cache.put(listingFile.name, (parsed, updated))
+        return parsed
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
@@ -17,16 +17,18 @@ work for both.
 # mypy: disable-error-code="return,arg-type,assignment,attr-defined"
 import codecs
 import re
+from dataclasses import dataclass, field
 from datetime import datetime
 import datetime as dt
-from typing import List, Literal, Tuple, Union
+from typing import (Any, Dict, Iterable, List, Literal, NamedTuple, Optional,
+                    Tuple, Union)
 
 from arxiv.taxonomy.definitions import CATEGORIES
-from arxiv.taxonomy.category import create_bad_category
+from arxiv.taxonomy.category import Category, create_bad_category
 from arxiv.document.metadata import DocMetadata, AuthorList
 from arxiv.document.version import VersionEntry, SourceFlag
 from arxiv.files import FileObj
-from browse.services.listing import (Listing, ListingItem,
+from browse.services.listing import (AnnounceTypes, Listing, ListingItem,
                                      MonthTotal, NotModifiedResponse,
                                      gen_expires)
 
@@ -80,26 +82,194 @@ def _is_rule(line: str, type: str) -> Tuple[int, Literal['','cross','rep','end']
 ParsingMode = Literal['month', 'monthly_counts', 'year']
 
 
-def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
-                               parsingMode: ParsingMode, listingFilter: str='')\
-                               -> Union[Listing, NotModifiedResponse, MonthTotal]:
-    """Read the paperids that have been updated from a listings file.
+class MonthItem(NamedTuple):
+    """The fields of one item of a monthly listing file.
 
-    There are three forms of listing file: new, pastweek, and monthly.
-    The new listing contains the updates for the latest publish, pastweek
-    contains updates for the last five publish days, and month contains
-    the accumulated updates for the entire month (to date).
+    This is what the listing pages need of the item, as plain values so a
+    `CompiledMonth` is compact and can be saved as JSON. `to_doc()` makes the
+    `DocMetadata` for an item when it is to be shown.
+    """
+    id: str
+    listing_type: AnnounceTypes
+    primary: str
+    categories: str
+    title: str
+    authors: str
+    comments: str
+    journal_ref: str
+    version: Optional[Union[int, str]]
+    size_kilobytes: Optional[Union[int, str]]
+    source_type: Optional[str]
+
+    def to_doc(self) -> DocMetadata:
+        """Makes the `DocMetadata` for the item."""
+        primary_category, secondary_categories = _categories(self.categories)
+        return DocMetadata(
+            arxiv_id=self.id,
+            arxiv_id_v=f"{self.id}v{self.version}",
+            title=self.title,
+            authors=AuthorList(self.authors),
+            abstract='',
+            categories=self.categories,
+            primary_category= primary_category,
+            secondary_categories=secondary_categories,
+            comments=self.comments,
+            journal_ref=self.journal_ref,
+            version = self.version,
+            version_history = [VersionEntry(version=self.version, raw='', submitted_date=None,
+                                            size_kilobytes=self.size_kilobytes,
+                                            source_flag=SourceFlag(self.source_type))],
+            raw_safe = '',
+            submitter=None,
+            arxiv_identifier=None,
+            primary_archive = primary_category.get_archive(),
+            primary_group = primary_category.get_archive().get_group(),
+            modified = None,
+        )
+
+    def to_listing_item(self) -> ListingItem:
+        """Makes the `ListingItem` for the item."""
+        return ListingItem(id=self.id, listingType=self.listing_type,
+                           primary=self.primary, article=self.to_doc())
+
+
+Offsets = Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]
+"""Offsets into `CompiledMonth.items` of the new, cross and rep items of a listing."""
+
+
+@dataclass(frozen=True)
+class CompiledMonth:
+    """A monthly listing file parsed once.
+
+    `items` are in the order of the file. The offsets of the items in the
+    listing for an archive or category are worked out the first time that
+    listing is asked for and kept, so later month and year pages are just
+    slices of `items`. The `DocMetadata` is only made for the items that are
+    shown.
+
+    This is shared by requests and must not be changed.
+    """
+    items: Tuple[MonthItem, ...]
+    new_count: int
+    cross_count: int
+    rep_count: int
+    _offsets: Dict[str, Offsets] = field(default_factory=dict, compare=False, repr=False)
+
+    def offsets(self, listingFilter: str = '') -> Offsets:
+        """Offsets of the new, cross and rep items for `listingFilter`.
+
+        `listingFilter` is an archive or category, or empty for all items. An
+        item is listed as new if its primary starts with `listingFilter` and
+        it is not a cross-list in the file. Otherwise it is listed as a cross
+        if `listingFilter` is in its secondary categories."""
+        found = self._offsets.get(listingFilter, None)
+        if found is not None:
+            return found
+
+        new: List[int] = []
+        cross: List[int] = []
+        rep: List[int] = []
+        by_type = {'new': new, 'cross': cross, 'rep': rep}
+        primary_re = re.compile(f'^{listingFilter}')
+        secondary_re = re.compile(listingFilter)
+        for offset, item in enumerate(self.items):
+            if not listingFilter or (primary_re.match(item.primary)
+                                     and item.listing_type == 'new'):
+                by_type[item.listing_type].append(offset)
+            elif listingFilter:
+                secondaries = ' '.join(item.categories.split()[1:])
+                if secondary_re.search(secondaries):
+                    cross.append(offset)
+
+        found = (tuple(new), tuple(cross), tuple(rep))
+        self._offsets[listingFilter] = found
+        return found
+
+    def listing_offsets(self, listingFilter: str = '') -> Tuple[int, ...]:
+        """Offsets of the items in the month listing for `listingFilter`, new then cross."""
+        new, cross, _ = self.offsets(listingFilter)
+        return new + cross
+
+    def listing_items(self, offsets: Iterable[int]) -> List[ListingItem]:
+        """`ListingItem`s for `offsets` of `items`."""
+        return [self.items[offset].to_listing_item() for offset in offsets]
+
+    def to_json(self) -> List[List[Any]]:
+        """The items as lists for JSON."""
+        return [list(item) for item in self.items]
+
+    @classmethod
+    def from_items(cls, items: Iterable[MonthItem]) -> 'CompiledMonth':
+        items = tuple(items)
+        new = cross = rep = 0
+        for item in items:
+            if item.listing_type == 'new':
+                new += 1
+            elif item.listing_type == 'cross':
+                cross += 1
+            else:
+                rep += 1
+        return cls(items, new, cross, rep)
 
-    The new, pastweek, and current month listings are dynamic and
-    are updated after each publish. The monthly listing file is the only
-    permanent record of older announcements. The current month's listing
-    will be updated during the month it is active.
+    @classmethod
+    def from_json(cls, data: List[List[Any]]) -> 'CompiledMonth':
+        return cls.from_items(MonthItem(*item) for item in data)
 
-    An archive with sub categories will have a combined new and pastweek
-    listing for the time period in addition to a new/pastweek listing
-    file each category. new, new.CL, new.DF, etc.
 
-    Listing file markup is used to identify new and cross submissions.
+@dataclass(frozen=True)
+class MonthsListing:
+    """The listing of an archive or category for some months, usually a year.
+
+    It has the offsets of the listed items of each month, in order, and the
+    new and cross counts of each month, so a page of a year listing is made
+    without looking at the items of the other months. `months` are
+    `(yymm, CompiledMonth, offsets)`.
+
+    This is shared by requests and must not be changed.
+    """
+    months: Tuple[Tuple[str, CompiledMonth, Tuple[int, ...]], ...]
+    new_counts: Tuple[int, ...]
+    cross_counts: Tuple[int, ...]
+    count: int
+
+    @classmethod
+    def from_months(cls, months: Iterable[Tuple[str, CompiledMonth]],
+                    listingFilter: str = '') -> 'MonthsListing':
+        """Makes the listing for `listingFilter` of the `(yymm, CompiledMonth)` in `months`."""
+        listed = []
+        new_counts = []
+        cross_counts = []
+        for yymm, compiled in months:
+            new, cross, _ = compiled.offsets(listingFilter)
+            listed.append((yymm, compiled, new + cross))
+            new_counts.append(len(new))
+            cross_counts.append(len(cross))
+        return cls(tuple(listed), tuple(new_counts), tuple(cross_counts),
+                   sum(new_counts) + sum(cross_counts))
+
+    def listing_items(self, skip: int, show: int) -> List[ListingItem]:
+        """`ListingItem`s for items `skip` to `skip + show` of the months one after the other."""
+        items: List[ListingItem] = []
+        for _, compiled, offsets in self.months:
+            if show <= 0:
+                break
+            if skip >= len(offsets):
+                skip -= len(offsets)
+                continue
+            shown = offsets[skip:skip + show]
+            items.extend(compiled.listing_items(shown))
+            show -= len(shown)
+            skip = 0
+        return items
+
+    def pubdates(self) -> List[Tuple[dt.date, int]]:
+        """A pubdate for the first of each month with the count of items listed in the month."""
+        return [(datetime.strptime(yymm, '%y%m'), len(offsets))
+                for yymm, _, offsets in self.months]
+
+
+def compile_month(data: bytes) -> CompiledMonth:
+    """Parses the contents of a monthly listing file into a `CompiledMonth`.
 
     Comments from original code:
 
@@ -108,21 +278,9 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
 
       Does not read the metadata from the listings file.
     """
-    new_items:List[ListingItem] = []
-    cross_items:List[ListingItem] = []
-    rep_items:List[ListingItem] = []
-
-    # TODO I think pubdates are only used by pastweek, check if this is true,
-    # and alter the API so month listings don't return them.
-    # pastweek
-    pub_dates:List[dt.date] = []
-    pub_counts:List[int] = []
-
-    with listingFilePath.open('rb') as fh:
-        data = fh.read()
-
     lines = codecs.decode(data, encoding='utf-8',errors='ignore').split("\n")
-
+    size = len(lines)
+    items: List[MonthItem] = []
 
     # Skip forward to first \\,
     #   which brings us to first publish date for pastweek
@@ -130,24 +288,26 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
     # /*Tue, 20 Jul 2021 */
     #\\
     #   or first update entry for monthly listing
-    line = lines.pop(0)
-    while (len(lines) and not re.match(r'^\\', line)):
-        line = lines.pop(0)
-        line = line.replace('\n', '')
+    # `pos` is the index of the line after `line`, lines are not popped off the
+    # front of the list since that is O(n) each time.
+    line, pos = lines[0], 1
+    while (pos < size and not line.startswith('\\')):
+        line, pos = lines[pos], pos + 1
 
     # Now cycle through and process update entries in file
     type = 'new'
 
-    line = lines.pop(0)
-    line = line.replace('\n', '')
+    if pos >= size:
+        return CompiledMonth.from_items(items)
+    line, pos = lines[pos], pos + 1
     while (line):
         # check for special markup
         (is_rule, type_change) = _is_rule(line, type)
         while (is_rule):
             if is_rule and type_change:
                 type = type_change
-            if len(lines):
-                line = lines.pop(0)
+            if pos < size:
+                line, pos = lines[pos], pos + 1
             else:
                 break
             (is_rule, type_change) = _is_rule(line, type)
@@ -155,44 +315,15 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
                 break
 
         # Read up to the next \\
-        while (len(lines) and re.match(r'^\\', line)):
-            if len(lines):
-                line = lines.pop(0)
+        while (pos < size and line.startswith('\\')):
+            line, pos = lines[pos], pos + 1
 
         # Now process all fields up to the next \\
-        item_lines=[]
-        while (len(lines) and not re.match(r'^\\', line)):
-            item_lines.append(line)
-            if len(lines):
-                line = lines.pop(0)
-                line = line.replace('\n', '')
-            else:
-                break
+        item_start = pos - 1
+        while (pos < size and not line.startswith('\\')):
+            line, pos = lines[pos], pos + 1
 
-        article, neworcross = _parse_item(item_lines)
-
-        # If we have id, register the update
-        #   apply filtering (if we are dealing with monthly listing)
-        if article:
-            primary = article.primary_category.id if article.primary_category else ''
-            if not listingFilter or (re.match(f'^{listingFilter}', primary)
-                                     and neworcross == 'new' ):
-                # push update
-                item = ListingItem(id=article.arxiv_id, listingType=neworcross,
-                                   primary=primary, article=article)
-                if neworcross == 'new':
-                    new_items.append(item)
-                elif neworcross == 'cross':
-                    cross_items.append(item)
-                elif neworcross =='rep':
-                    rep_items.append(item)
-
-            elif listingFilter:
-                secondaries = ' '.join(article.categories.split()[1:]) # type: ignore
-                if re.search(listingFilter, secondaries):
-                    item = ListingItem(id=article.arxiv_id, listingType=neworcross,
-                                       primary=primary, article=article)
-                    cross_items.append(item)
+        items.append(_parse_fields(lines[item_start:pos - 1]))
 
         # From original parser
         #  Now complete the reading of this entry by reading everything up to the
@@ -201,52 +332,79 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
         (rule, new_type) = _is_rule(line, type)
         if new_type:
             type = new_type
-        while len(lines) and not rule:
-            line = lines.pop(0)
-            line = line.replace('\n', '')
+        while pos < size and not rule:
+            line, pos = lines[pos], pos + 1
             (rule, new_type) = _is_rule(line, type)
             if new_type:
                 type = new_type
 
         # Read the next line for while loop
-        if len(lines):
-            line = lines.pop(0)
-            line = line.replace('\n', '')
+        if pos < size:
+            line, pos = lines[pos], pos + 1
         else:
             break
 
-    count = len(new_items)
+    return CompiledMonth.from_items(items)
+
+
+def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
+                               parsingMode: ParsingMode, listingFilter: str='',
+                               compiled: Optional[CompiledMonth] = None)\
+                               -> Union[Listing, NotModifiedResponse, MonthTotal]:
+    """Read the paperids that have been updated from a listings file.
+
+    There are three forms of listing file: new, pastweek, and monthly.
+    The new listing contains the updates for the latest publish, pastweek
+    contains updates for the last five publish days, and month contains
+    the accumulated updates for the entire month (to date).
 
-    pub_dates_with_count:List[Tuple[dt.date,int]] = []
-    index = 0
-    for pdate in pub_dates:
-        pub_dates_with_count.append((pdate, pub_counts[index]))
-        index = index + 1
+    The new, pastweek, and current month listings are dynamic and
+    are updated after each publish. The monthly listing file is the only
+    permanent record of older announcements. The current month's listing
+    will be updated during the month it is active.
 
-    for pd in pub_dates_with_count:
-        (date, count) = pd
+    An archive with sub categories will have a combined new and pastweek
+    listing for the time period in addition to a new/pastweek listing
+    file each category. new, new.CL, new.DF, etc.
+
+    Listing file markup is used to identify new and cross submissions.
+
+    The file is parsed with `compile_month()` unless it was already and is
+    passed as `compiled`.
+    """
+    if compiled is None:
+        with listingFilePath.open('rb') as fh:
+            compiled = compile_month(fh.read())
 
     if parsingMode == 'monthly_counts':
         # We need the new and cross counts for the monthly count summary
+        new, cross, rep = compiled.offsets(listingFilter)
         return MonthTotal(
-            year=year, month=month, new=len(new_items), cross=len(cross_items),
-            expires=gen_expires(), listings=new_items + cross_items + rep_items)
+            year=year, month=month, new=len(new), cross=len(cross),
+            expires=gen_expires(), listings=compiled.listing_items(new + cross + rep))
     else:
-        # There are no pubdates for month, so we will create one and add count
-        # to be consistent with API
-        if parsingMode == 'month':
-            date = re.search(r'(?P<date>\d{4})$', str(listingFilePath))
-            if date:
-                yymm_string = date.group('date')
-                pub_date = datetime.strptime(yymm_string, '%y%m')
-                pub_dates_with_count.append((pub_date, len(new_items + cross_items)))
-
-        return Listing(listings=new_items + cross_items,
-                       pubdates=pub_dates_with_count,
-                       count=len(new_items + cross_items),
+        offsets = compiled.listing_offsets(listingFilter)
+        return Listing(listings=compiled.listing_items(offsets),
+                       pubdates=month_pubdates(listingFilePath, parsingMode, len(offsets)),
+                       count=len(offsets),
                        expires=gen_expires())
 
 
+def month_pubdates(listingFilePath: FileObj, parsingMode: ParsingMode,
+                   count: int) -> List[Tuple[dt.date, int]]:
+    """Pubdates of a month listing.
+
+    There are no pubdates for month, so we will create one and add count
+    to be consistent with API."""
+    if parsingMode == 'month':
+        date = re.search(r'(?P<date>\d{4})$', str(listingFilePath))
+        if date:
+            yymm_string = date.group('date')
+            pub_date = datetime.strptime(yymm_string, '%y%m')
+            return [(pub_date, count)]
+    return []
+
+
 
 RE_FROM_FIELD = re.compile(
     r'(?P<from>From:\s*)(?P<name>[^<]+)?\s+(<(?P<email>.*)>)?')
@@ -287,7 +445,13 @@ Title: A search for variable subdwarf B stars in TESS Full Frame Images III. An
     DOI: 10.1093/mnras/stac3676
     License: http://creativecommons.org/licenses/by/4.0/
     """
-    neworcross='new'
+    item = _parse_fields(item_lines)
+    return item.to_doc(), item.listing_type
+
+
+def _parse_fields(item_lines: List[str]) -> MonthItem:
+    """Parses the fields of an item of a monthly listing file, see `_parse_item()`."""
+    neworcross: AnnounceTypes = 'new'
     raw = "\n".join(item_lines)
     prehistory, misc_fields = re.split(r'\n\n', raw)
 
@@ -309,7 +473,6 @@ Title: A search for variable subdwarf B stars in TESS Full Frame Images III. An
     else:
         ver,kb,source_type=1,0,''
 
-    
     fieldms = re.finditer(RE_FIELDS, misc_fields)
     if fieldms:
         fields = {fieldm.group('field_name'): fieldm.group('value').replace('\n  ', ' ')
@@ -317,15 +480,33 @@ Title: A search for variable subdwarf B stars in TESS Full Frame Images III. An
     else:
         fields = {}
 
+    raw_cats = fields.get('Categories', None) or ''
+    primary_category, _ = _categories(raw_cats, secondaries=False)
+    return MonthItem(
+        id=id,
+        listing_type=neworcross,
+        primary=primary_category.id if primary_category else '',
+        categories=raw_cats,
+        title=fields.get('Title',''),
+        authors=fields.get('Authors',''),
+        comments=fields.get('Comments',''),
+        journal_ref=fields.get('Journal-ref',''),
+        version=ver,
+        size_kilobytes=kb,
+        source_type=source_type,
+    )
+
+
+def _categories(raw_cats: str, secondaries: bool = True) -> Tuple[Category, List[Category]]:
+    """Primary and secondary categories from the Categories: field of an item."""
     secondary_categories = []
-    if fields.get('Categories',None):
-        raw_cats =fields.get('Categories','')
+    if raw_cats:
         cats = raw_cats.split()
         if cats[0] in CATEGORIES:
             primary_category = CATEGORIES[cats[0]]
         else:
             primary_category =create_bad_category(cats[0]) #sometimes really old listing files have invalid keys
-        for sc in cats[1:]:
+        for sc in cats[1:] if secondaries else []:
             if sc in CATEGORIES:
                 secondary_categories.append(CATEGORIES[sc])
             else:
@@ -333,31 +514,5 @@ Title: A search for variable subdwarf B stars in TESS Full Frame Images III. An
                    create_bad_category(sc)
                 )
     else:
-        raw_cats=''
         primary_category = CATEGORIES["bad-arch.bad-cat"]
-
-    lai = DocMetadata(
-        arxiv_id=id,
-        arxiv_id_v=f"{id}v{ver}",
-        title=fields.get('Title',''),
-        authors=AuthorList(fields.get('Authors','')),
-        abstract='',
-        categories=raw_cats,
-        primary_category= primary_category,
-        secondary_categories=secondary_categories,
-        comments=fields.get('Comments',''),
-        journal_ref=fields.get('Journal-ref',''),
-        version = ver,
-        version_history = [VersionEntry(version=ver, raw='', submitted_date=None,
-                                        size_kilobytes=kb,
-                                        source_flag=SourceFlag(source_type))],
-        raw_safe = '',
-        submitter=None,
-        arxiv_identifier=None,
-        primary_archive = primary_category.get_archive(),
-        primary_group = primary_category.get_archive().get_group(),
-        modified = None,        
-    )
-
-    
-    return lai, neworcross
+    return primary_category, secondary_categories
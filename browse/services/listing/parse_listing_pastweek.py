@@ -20,7 +20,7 @@ that indicate the date.
 import codecs
 import re
 from datetime import datetime
-from typing import List, Literal, Tuple
+from typing import Dict, Iterator, List, Literal, Optional, Tuple
 from dataclasses import dataclass
 
 from arxiv.document.metadata import DocMetadata
@@ -37,7 +37,8 @@ class PastweekDay:
     items: List[ListingItem]
 
 
-def parse_listing_pastweek(listingFilePath: FileObj)\
+def parse_listing_pastweek(listingFilePath: FileObj, skip: int = 0,
+                           show: Optional[int] = None)\
         -> Listing:
     """Read the paperids that have been updated from a listings file.
 
@@ -52,23 +53,76 @@ def parse_listing_pastweek(listingFilePath: FileObj)\
     pastweek.CL, pastweek.DF, etc.
 
     Listing file markup is used to identify new and cross submissions.
-    """
-    days: List[PastweekDay] = []
-    day = PastweekDay('warning-unset',[])
-    section = 'new'
 
+    Only the items `skip` to `skip + show` are in the listings, the count is of
+    all the items.
+    """
     with listingFilePath.open('rb') as fh:
         data = fh.read()
+    return compile_pastweek(data).listing(skip, show)
+
+
+class PastweekListing:
+    """A pastweek listing file split into days and items but not parsed.
+
+    The text of an item is only parsed to `DocMetadata` when a listing that
+    shows it is asked for, then the parsed item is kept in place of its text.
+    This is meant to be cached for as long as the file is not updated.
+    """
+
+    def __init__(self, days: List[Tuple[str, List[Tuple[str, str]]]]):
+        self.items_text: List[Optional[Tuple[str, str]]] = \
+            [item for _, items in days for item in items]
+        self.text_size = sum(len(text) for _, items in days for text, _ in items)
+        self.pubdates = _recent_skip_for_days(
+            [PastweekDay(datestr, items) for datestr, items in days]) # type: ignore
+        self._items: Dict[int, ListingItem] = {}
+
+    def items(self, skip: int = 0, show: Optional[int] = None) -> Iterator[ListingItem]:
+        """Yields `ListingItem`s for items `skip` to `skip + show`."""
+        end = len(self.items_text) if show is None else min(len(self.items_text), skip + show)
+        for index in range(max(0, skip), end):
+            item = self._items.get(index, None)
+            if item is None:
+                entry = self.items_text[index]
+                if entry is None:  # parsed by another thread since the get
+                    item = self._items[index]
+                else:
+                    text, type = entry
+                    doc = _parse_text(text)
+                    item = ListingItem(id=doc.arxiv_id, listingType=type,
+                                       primary=doc.primary_category.id, # type: ignore
+                                       article=doc)
+                    self._items[index] = item
+                    self.items_text[index] = None
+            yield ListingItem(item.id, item.listingType, item.primary, item.article)
+
+    def listing(self, skip: int = 0, show: Optional[int] = None) -> Listing:
+        """`Listing` with items `skip` to `skip + show` and the count of all items."""
+        return Listing(listings=list(self.items(skip, show)),
+                       count=len(self.items_text),
+                       pubdates=list(self.pubdates),
+                       expires=gen_expires())
+
+
+def compile_pastweek(data: bytes) -> PastweekListing:
+    """Scans the contents of a pastweek listing file into a `PastweekListing`."""
+    days: List[Tuple[str, List[Tuple[str, str]]]] = []
+    day_items: List[Tuple[str, str]] = []
+    section = 'new'
 
     lines = codecs.decode(data, encoding='utf-8',errors='ignore').split("\n")
-    line = lines.pop(0).replace('\n','')
+    # `pos` is the index of the line after `line`, lines are not popped off the
+    # front of the list since that is O(n) each time.
+    size = len(lines)
+    line, pos = lines[0], 1
     while(line):
         (is_rule, section_change) = _is_rule(line, section)
         while (is_rule):
             if is_rule and section_change:
                 section = section_change
-            if len(lines):
-                line = lines.pop(0).replace('\n','')
+            if pos < size:
+                line, pos = lines[pos], pos + 1
             else:
                 break
             (is_rule, section_change) = _is_rule(line, section)
@@ -76,64 +130,59 @@ def parse_listing_pastweek(listingFilePath: FileObj)\
                 break
 
         # consume any \\
-        while (len(lines) and re.match(r'^\\', line)):
-            line = lines.pop(0).replace('\n','')
+        while (pos < size and line.startswith('\\')):
+            line, pos = lines[pos], pos + 1
 
         # Now accumulate all lines up to the next \\
-        listing_lines: List[str] = []
         # Since the non-new listings don't have abstracts we don't have the
         # problem of // being in the abstract so we can just use the // delimiters.
-        while (len(lines) and not re.match(r'^\\', line)):
-            listing_lines.append(line)
-            line = lines.pop(0).replace('\n','')
-
+        item_start = pos - 1
+        while (pos < size and not line.startswith('\\')):
+            line, pos = lines[pos], pos + 1
+        listing_lines = lines[item_start:pos - 1]
 
         start_new_date = re.search(r"/\* (.*) \*/", " ".join(listing_lines))
         if start_new_date:
-            day = PastweekDay(start_new_date.group(1), [])
-            days.append(day)
+            day_items = []
+            days.append((start_new_date.group(1), day_items))
         else:
-            doc, type = _parse_doc(listing_lines)
-            if doc:
-                item = ListingItem(id=doc.arxiv_id, listingType=type,
-                                   primary=doc.primary_category.id, # type: ignore
-                                   article=doc)
-                day.items.append(item)
+            day_items.append(("\n".join(listing_lines), _item_type(listing_lines)))
 
         #  Now complete the reading of this entry by reading everything up to the
         #  next rule.
         (rule, new_section) = _is_rule(line, section)
         if new_section:
             section = new_section
-        while len(lines) and not rule:
-            line = lines.pop(0).replace('\n','')
+        while pos < size and not rule:
+            line, pos = lines[pos], pos + 1
             (rule, new_section) = _is_rule(line, section)
             if new_section:
                 section = new_section
 
         # Read the next line for while loop
-        if len(lines):
-            line = lines.pop(0).replace('\n','')
+        if pos < size:
+            line, pos = lines[pos], pos + 1
         else:
             break
 
-    listings = [item for day in days for item in day.items]
-    return Listing(listings=listings,
-                   count=len(listings),
-                   pubdates=_recent_skip_for_days(days),
-                   expires=gen_expires())
-
+    return PastweekListing(days)
 
 
 def _parse_doc(listing_lines: List[str]) -> Tuple[DocMetadata, str]:
     """Parses the lines from a listing file to a DocMetadata"""
-    data = "\n".join(listing_lines)
-    abs = parse_abs_top(data,
-                        #TODO bogus time but don't think it is used in listing page.
-                        datetime.now(),
-                        '')
+    return _parse_text("\n".join(listing_lines)), _item_type(listing_lines)
+
+
+def _parse_text(data: str) -> DocMetadata:
+    return parse_abs_top(data,
+                         #TODO bogus time but don't think it is used in listing page.
+                         datetime.now(),
+                         '')
+
+
+def _item_type(listing_lines: List[str]) -> str:
     cross = "(*corss-listing*)" in "\n".join(listing_lines[:3]) #this seems like an old type..? - Erin 2024
-    return abs, 'cross' if cross else 'new' # no replacements in pastweek
+    return 'cross' if cross else 'new' # no replacements in pastweek
 
 
 
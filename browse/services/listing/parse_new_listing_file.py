@@ -13,7 +13,7 @@ that is found in abs files.
 import codecs
 import re
 from datetime import date, datetime
-from typing import List, Literal, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Literal, Optional, Tuple, Union
 
 from arxiv.files import FileObj
 from arxiv.document.parse_abs import (
@@ -61,7 +61,8 @@ def _is_rule(line: str, type: str) -> Tuple[int, Literal['','cross','rep','end']
     return (0, '')
 
 
-def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
+def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='',
+                           skip: int = 0, show: Optional[int] = None)\
                            -> Union[ListingNew]:
     """Parses a new or new.{CATEGORY} listing file.
 
@@ -70,25 +71,78 @@ def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
     etc.
 
     Listing file markup is used to identify new and cross submissions.
+
+    Only the items `skip` to `skip + show` are in the listings, the counts are
+    of all the items.
+    """
+    with listingFilePath.open('rb') as fh:
+        rawdata = fh.read()
+    return compile_new_listing(rawdata).listing(skip, show)
+
+
+ItemSpan = Tuple[Literal['new', 'cross', 'rep'], int, int]
+"""The type of an item and where its text starts and ends."""
+
+
+class NewListing:
+    """A new listing file split into items but not parsed.
+
+    The file is scanned once for the sections and items and only the text of
+    each item is kept. The text of an item is only parsed to `DocMetadata` when
+    a listing that shows it is asked for, then the parsed item is kept in place
+    of its text. This is meant to be cached for as long as the file is not
+    updated.
     """
-    extras = {}
 
-    new_items:List[ListingItem] = []
-    cross_items:List[ListingItem] = []
-    rep_items:List[ListingItem] = []
+    def __init__(self, items_text: List[Tuple[str, Literal['new', 'cross', 'rep']]],
+                 announced: Optional[date], new_count: int, cross_count: int, rep_count: int):
+        self.items_text: List[Optional[Tuple[str, Literal['new', 'cross', 'rep']]]] = \
+            list(items_text)
+        self.text_size = sum(len(text) for text, _ in items_text)
+        self.announced = announced
+        self.new_count = new_count
+        self.cross_count = cross_count
+        self.rep_count = rep_count
+        self._items: Dict[int, ListingItem] = {}
+
+    def items(self, skip: int = 0, show: Optional[int] = None) -> Iterator[ListingItem]:
+        """Yields `ListingItem`s for items `skip` to `skip + show`, new then cross then rep."""
+        end = len(self.items_text) if show is None else min(len(self.items_text), skip + show)
+        for index in range(max(0, skip), end):
+            item = self._items.get(index, None)
+            if item is None:
+                entry = self.items_text[index]
+                if entry is None:  # parsed by another thread since the get
+                    item = self._items[index]
+                else:
+                    item = _to_item(*entry)
+                    self._items[index] = item
+                    self.items_text[index] = None
+            yield ListingItem(item.id, item.listingType, item.primary, item.article)
+
+    def listing(self, skip: int = 0, show: Optional[int] = None) -> ListingNew:
+        """`ListingNew` with items `skip` to `skip + show` and the counts of all items."""
+        return ListingNew(listings= list(self.items(skip, show)),
+                          announced= self.announced,  # type: ignore
+                          new_count= self.new_count,
+                          cross_count= self.cross_count,
+                          rep_count= self.rep_count,
+                          expires= gen_expires())
+
+
+def compile_new_listing(rawdata: bytes) -> NewListing:
+    """Scans the contents of a new listing file into a `NewListing`."""
+    extras = {}
 
     # new
     announce_date: Optional[date] = None
 
-    with listingFilePath.open('rb') as fh:
-        rawdata = fh.read()
     data =codecs.decode(rawdata, encoding='utf-8',errors='ignore')
-    lines = data.split("\n")
+    lines = _iter_lines(data)
 
     # First line is always the date.
     # Date: Tue, 20 Jul 21 00:51:12 GMT
-    dateline = lines.pop(0)
-    dateline = dateline.replace('\n', '')
+    dateline, _ = next(lines)
 
     if DATE.match(dateline):
         dl_date = re.sub(r'^Date:\s+', '', dateline)
@@ -98,44 +152,69 @@ def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
         announce_date = datetime.strptime(short_date, '%a, %d %b %y')
 
     # Subject: cs daily 346 new + 55 crosses received
-    line = lines.pop(0)
+    line, _ = next(lines)
     if SUBJECT.match(line):
         subject = line
         extras['Subject'] = subject
 
-    # Pull received date out of data, not from line
-    # received from  Fri 16 Jul 21 18:00:00 GMT  to  Mon 19 Jul 21 18:00:00 GMT
-    received = RECEIVED.search(data)
-    if received:
-        date_from_to = str(received.group('date_range'))
-        date_short_from_to = re.sub(r'\s+\d\d:\d\d:\d\d\s+\w\w\w', '', date_from_to)
-        extras['date_from_to'] = date_from_to
-        extras['date_short_from_to'] = date_short_from_to
-
     # advance to "\\" just before first listing
     rules_to_pop = 5
     while( rules_to_pop ):
-        line = lines.pop(0)
+        line, start = next(lines)
         if line.startswith('--------'):
             rules_to_pop = rules_to_pop - 1
 
-    # Lines how has the new listings, then a rule, the cross listings, then a
-    # rule, the rep listings then a rule and then some unused tail matter.  line
-    # should be at // that is part of the first listing item Now cycle through
-    # and process update entries in file.
-
-    new_lines, cross_lines, rep, end = _split_sections(("\n").join(lines))
-    new_items = [_to_item(data, 'new') for data in _split_items(new_lines)]
-    cross_items = [_to_item(data, 'cross') for data in _split_items(cross_lines)]
-    rep_items = [_to_item(data, 'rep') for data in _split_items(rep)]
-
-    return ListingNew(listings= new_items + cross_items + rep_items,
-                      announced= announce_date,  # type: ignore
-                      new_count= len(new_items),
-                      cross_count= len(cross_items),
-                      rep_count= len(rep_items),
-                      expires= gen_expires())
-
+    # The rest has the new listings, then a rule, the cross listings, then a
+    # rule, the rep listings then a rule and then some unused tail matter. It
+    # starts at the \\ that is part of the first listing item.
+    start += len(line) + 1
+    cross_at = _find_rule(data, CROSS, start)
+    rep_at = _find_rule(data, REP, cross_at + len(CROSS))
+    end_at = _find_rule(data, END, rep_at + len(REP))
+
+    new_spans = list(_item_spans(data, 'new', start, cross_at))
+    cross_spans = list(_item_spans(data, 'cross', cross_at + len(CROSS), rep_at))
+    rep_spans = list(_item_spans(data, 'rep', rep_at + len(REP), end_at))
+    # Only the text of the items is kept, not the whole file
+    items_text = [(data[start:stop], ltype) for ltype, start, stop in new_spans + cross_spans + rep_spans]
+    return NewListing(items_text, announce_date, len(new_spans), len(cross_spans), len(rep_spans))
+
+
+def _iter_lines(data: str) -> Iterator[Tuple[str, int]]:
+    """Yields each line of `data` without its newline, and where it starts."""
+    start = 0
+    while True:
+        end = data.find("\n", start)
+        if end < 0:
+            yield data[start:], start
+            return
+        yield data[start:end], start
+        start = end + 1
+
+
+def _find_rule(data: str, rule: str, start: int) -> int:
+    at = data.find(rule, start)
+    if at < 0:
+        raise ValueError(f"New listing file lacks rule {rule.strip()}")
+    return at
+
+
+def _item_spans(data: str, ltype: Literal['new', 'cross', 'rep'],
+                start: int, end: int) -> Iterator[ItemSpan]:
+    """Yields the spans of the items between `start` and `end` of `data`.
+
+    Items are separated by NORMAL rules and there may be one at the start."""
+    if data.startswith(NORMAL, start, end):
+        start += len(NORMAL) # srtip NORMAL off if found
+    if start >= end:
+        return
+    while True:
+        rule = data.find(NORMAL, start, end)
+        if rule < 0:
+            yield ltype, start, end
+            return
+        yield ltype, start, rule
+        start = rule + len(NORMAL)
 
 
 NORMAL="------------------------------------------------------------------------------\n"
@@ -144,38 +223,6 @@ REP="%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%--%%-
 END = "%%%---%%%---%%%---%%%---%%%---%%%---%%%---%%%---%%%---%%%---%%%---%%%---%%%---\n"
 
     
-def _split_sections(data:str) -> Tuple[str,str,str,str]:
-    new_lines, other_linesA = data.split(CROSS)
-    cross_lines, other_linesB = other_linesA.split(REP)
-    rep_lines, end = other_linesB.split(END)
-    return new_lines, cross_lines, rep_lines, end
-
-    # parts = data.split(CROSS)
-    # if len(parts) == 1:
-    #     return parts[0], "", "", ""
-    # else:
-    #     new_lines, other_linesA = parts
-    # parts = other_linesA.split(REP)
-    # if len(parts) == 1:
-    #     return new_lines, parts[0], "", ""
-    # else:
-    #     cross_lines, other_linesB = parts
-    # parts = other_linesB.split(END)
-    # if len(parts) == 1:
-    #     return new_lines, cross_lines, parts[0], ""
-    # else:
-    #     rep_lines, end = parts
-    #     return new_lines, cross_lines, rep_lines, end
-
-
-def _split_items(data: str) -> List[str]:
-    if data.startswith(NORMAL):
-        data = data[len(NORMAL):] # srtip NORMAL off if found
-
-    if not data:
-        return []
-    return data.split(NORMAL)
-
 def _to_item(data: str, ltype: Literal['new', 'cross', 'rep']) -> ListingItem:
     if ltype == 'rep':
         parts = data.split(r"\\") # similar to component split of parse_abs
@@ -0,0 +1,151 @@
+"""Coalesce concurrent identical lookups into one.
+
+When a paper is announced many requests for it arrive at once. Without
+coalescing each one runs the same metadata lookup, object store probes and
+maybe a genpdf build. With `coalesce()` the first request for an
+(operation, key) runs the lookup and the others that arrive while it is in
+flight wait for it and get its result, or its exception.
+
+This is within a worker process. Set `SINGLE_FLIGHT_LOCK_DIR` to also
+serialize identical lookups across the worker processes on a host with lock
+files. Results are not shared across processes, but a lookup that waited on
+the lock will usually find the caches warm. Only the outermost coalesced call
+on a thread takes a lock file. A nested one, like the "abs" lookup inside a
+"dissemination" one, runs under the outer lock, so a thread never waits on a
+lock file it holds itself and locks are not taken in varying orders.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import time
+from contextlib import contextmanager
+from threading import Event, Lock, local
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, Optional, TypeVar
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LOCK_STRIPES = 4096
+"""Number of lock files used by `file_lock()`.
+
+Keys are hashed onto the lock files so the number of files is bounded. Two
+keys may share a lock file, in which case they are run one after the other."""
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    """Runs at most one function at a time for each key.
+
+    Example
+    -------
+
+        flight: SingleFlight[DocMetadata] = SingleFlight()
+        docmeta = flight.do(("abs", "2101.00001v1"), lambda: get_abs("2101.00001v1"))
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Runs `fn`, or if `fn` is already running for `key` waits for it.
+
+        Returns the result of `fn` or raises its exception."""
+        with self._lock:
+            call = self._calls.get(key, None)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+@contextmanager
+def file_lock(lock_dir: str, key: Hashable, timeout: float) -> Iterator[bool]:
+    """Holds an exclusive lock file for `key` in `lock_dir`.
+
+    Waits up to `timeout` seconds for the lock. Yields `True` if the lock
+    was acquired and `False` if it timed out, in which case the caller goes
+    ahead without it."""
+    digest = hashlib.sha1(repr(key).encode("utf-8")).digest()
+    stripe = int.from_bytes(digest[:4], "big") % LOCK_STRIPES
+    path = os.path.join(lock_dir, f"{stripe}.lock")
+    with open(path, "a") as fh:
+        deadline = time.monotonic() + timeout
+        locked = False
+        while True:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                locked = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    logger.warning("Timed out waiting for lock %s for %s", path, key)
+                    break
+                time.sleep(0.01)
+        try:
+            yield locked
+        finally:
+            if locked:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+_single_flight: SingleFlight[Any] = SingleFlight()
+
+_held = local()
+# `_held.lock` is true on a thread while it is in a file locked coalesced call.
+
+
+def coalesce(operation: str, key: Hashable, fn: Callable[[], T]) -> T:
+    """Runs `fn` coalesced with concurrent calls for the same `operation` and `key`.
+
+    `key` is usually the paper id with version and the format, ex.
+    `coalesce("dissemination", ("2101.00001v1", "pdf"), fn)`.
+    """
+    full_key = (operation, key)
+    config = current_app.config if has_app_context() else {}
+    lock_dir = config.get("SINGLE_FLIGHT_LOCK_DIR", "")
+    if not lock_dir:
+        return _single_flight.do(full_key, fn)
+
+    timeout = float(config.get("SINGLE_FLIGHT_LOCK_TIMEOUT", 10))
+
+    def locked_fn() -> T:
+        if getattr(_held, "lock", False):
+            return fn()
+        with file_lock(lock_dir, full_key, timeout):
+            _held.lock = True
+            try:
+                return fn()
+            finally:
+                _held.lock = False
+    return _single_flight.do(full_key, locked_fn)
@@ -0,0 +1,158 @@
+"""Streaming files in HTTP responses.
+
+Iterating a file opened with `open("rb")` yields lines, which for PDFs and
+tarballs are arbitrary and often tiny chunks. The functions here stream in
+large blocks of `FILE_STREAM_BLOCK_SIZE`:
+
+- A file on the local file system is handed to the WSGI server's
+  `wsgi.file_wrapper` so it can use `sendfile`.
+- A range of a file in GCS is read with ranged GCS downloads of whole blocks,
+  see `BlobRangeReader`, rather than through a seek on a `BlobReader` which
+  buffers 40MB chunks.
+- Anything else is read in blocks from `FileObj.open()`.
+
+The size and throughput of each streamed response are recorded as
+OpenTelemetry histograms, `browse.file_stream.bytes` and
+`browse.file_stream.throughput`.
+"""
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
+
+from arxiv.files import FileObj
+from flask import current_app
+from google.cloud.storage import Blob
+from opentelemetry import metrics
+from werkzeug.wsgi import wrap_file
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+"""Default bytes per read when streaming a file."""
+
+meter = metrics.get_meter(__name__)
+stream_bytes = meter.create_histogram(
+    "browse.file_stream.bytes", unit="By",
+    description="Bytes sent in a streamed file response")
+stream_throughput = meter.create_histogram(
+    "browse.file_stream.throughput", unit="By/s",
+    description="Throughput of a streamed file response")
+
+
+def block_size() -> int:
+    """Bytes per read when streaming a file, from `FILE_STREAM_BLOCK_SIZE`."""
+    return max(4096, int(current_app.config.get("FILE_STREAM_BLOCK_SIZE", DEFAULT_BLOCK_SIZE)))
+
+
+def local_path(file: FileObj) -> Optional[Path]:
+    """`Path` of `file` if it is a plain file on the local file system."""
+    item = getattr(file, "item", None)
+    return item if isinstance(item, Path) else None
+
+
+def gcs_blob(file: FileObj) -> Optional[Blob]:
+    """GCS `Blob` of `file` if it is a plain object in GCS."""
+    blob = getattr(file, "blob", None)
+    return blob if isinstance(blob, Blob) else None
+
+
+def read_blocks(fh: BinaryIO, size: int) -> Iterator[bytes]:
+    """Reads `fh` in blocks of `size` bytes and closes it."""
+    with fh:
+        while True:
+            chunk = fh.read(size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def metered(chunks: Iterable[bytes], kind: str) -> Iterator[bytes]:
+    """Passes through `chunks` and records the bytes and throughput when done."""
+    start = time.perf_counter()
+    total = 0
+    try:
+        for chunk in chunks:
+            total += len(chunk)
+            yield chunk
+    finally:
+        elapsed = time.perf_counter() - start
+        attributes = {"kind": kind}
+        stream_bytes.record(total, attributes)
+        if total and elapsed > 0:
+            stream_throughput.record(total / elapsed, attributes)
+
+
+def file_body(file: FileObj, environ: Dict[str, Any]) -> Iterable[bytes]:
+    """Body for a response with all of `file`.
+
+    For a local file this is a `wsgi.file_wrapper`, which must be the response
+    body as is for the WSGI server to use `sendfile`, so it is not metered and
+    it needs `direct_passthrough`. Otherwise it is an iterator of blocks that
+    does not need a request context."""
+    path = local_path(file)
+    if path is not None:
+        return wrap_file(environ, path.open("rb"), block_size())
+    return metered(read_blocks(file.open("rb"), block_size()), "gcs" if gcs_blob(file) else "other")
+
+
+class BlobRangeReader:
+    """Minimal readable and seekable file over a GCS `Blob` for range responses.
+
+    Each refill of the buffer is one ranged download of at least `size` bytes
+    starting at the current position, so a range response of N bytes costs
+    about N / `size` GCS requests. With `end`, the end of the requested range,
+    refills are cut off there so nothing past the range is downloaded.
+    The bytes read and throughput are recorded on `close()`.
+    """
+
+    def __init__(self, blob: Blob, size: int, end: Optional[int] = None):
+        self.blob = blob
+        self.block = size
+        self.end = end
+        self.pos = 0
+        self.bytes_read = 0
+        self._buffer = b""
+        self._buffer_start = 0
+        self._start: Optional[float] = None
+
+    def seek(self, pos: int, whence: int = 0) -> int:
+        if whence != 0:
+            raise ValueError("Only absolute seek is supported")
+        self.pos = pos
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+    def read(self, size: int = -1) -> bytes:
+        if self._start is None:
+            self._start = time.perf_counter()
+        blob_size = self.blob.size or 0
+        remaining = blob_size - self.pos if size < 0 else min(size, blob_size - self.pos)
+        chunks = []
+        while remaining > 0:
+            if not self._buffer_start <= self.pos < self._buffer_start + len(self._buffer):
+                limit = blob_size if self.end is None or self.end <= self.pos \
+                    else min(blob_size, self.end)
+                end = min(limit, self.pos + max(remaining, self.block)) - 1
+                self._buffer = self.blob.download_as_bytes(start=self.pos, end=end,
+                                                          raw_download=True, checksum=None)
+                self._buffer_start = self.pos
+                if not self._buffer:
+                    break
+            offset = self.pos - self._buffer_start
+            chunk = self._buffer[offset:offset + remaining]
+            chunks.append(chunk)
+            self.pos += len(chunk)
+            remaining -= len(chunk)
+        out = b"".join(chunks)
+        self.bytes_read += len(out)
+        return out
+
+    def close(self) -> None:
+        self._buffer = b""
+        if self._start is not None:
+            elapsed = time.perf_counter() - self._start
+            attributes = {"kind": "gcs_range"}
+            stream_bytes.record(self.bytes_read, attributes)
+            if self.bytes_read and elapsed > 0:
+                stream_throughput.record(self.bytes_read / elapsed, attributes)
+            self._start = None
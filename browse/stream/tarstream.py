@@ -1,34 +1,102 @@
-"""Streamng tar files."""
-
-from io import BytesIO
+"""Streamng tar files.
+
+The tar is written into a `_RingBuffer` of a few fixed size slots, file data
+is read straight into a slot with `readinto()`, and each full slot is sent on
+as a chunk. With `compress` each chunk is gzipped. With more than one worker
+the chunks are compressed as independent gzip members on a thread pool, as
+pigz does, and sent in order. zlib releases the GIL so the members compress
+in parallel. A gzip file of several members is a valid gzip file.
+"""
+
+import gzip
+import os
 import tarfile
-from typing import Callable, Iterator, List
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Deque, Iterator, List, Optional
 
 from arxiv.files import FileObj
 
-BUFFER_SIZE = 16 * 1024  # bytes, similar to tarfile.copyfileobj()
+CHUNK_SIZE = 1024 * 1024
+"""Bytes of tar in each chunk, and so in each gzip member when compressing in parallel."""
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
 
-class _FileStream():
-    def __init__(self) -> None:
-        self.buffer = BytesIO()
-        self.offset = 0
 
-    def write(self, s: bytes) -> None:
-        self.buffer.write(s)
-        self.offset += len(s)
+def _get_executor() -> ThreadPoolExecutor:
+    """Gets the process wide executor used to compress chunks."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                               thread_name_prefix="tarstream")
+    return _executor
+
 
-    def tell(self) -> int:
-        return self.offset
+class _RingBuffer():
+    """Fixed size slots the tar is written into, used in turn.
 
-    def close(self) -> None:
-        self.buffer.close()
+    A slot is written again only after all the other slots have been, so a
+    chunk taken from a slot stays as is while up to `slots - 1` later chunks
+    are written."""
+
+    def __init__(self, slots: int, size: int) -> None:
+        self._slots = [bytearray(size) for _ in range(slots)]
+        self._index = 0
+        self.fill = 0
+        self.offset = 0
 
-    def pop(self) -> bytes:
-        data = self.buffer.getvalue()
-        self.buffer.close()
-        self.buffer = BytesIO()
-        return data
+    def space(self) -> memoryview:
+        """The unwritten part of the current slot."""
+        return memoryview(self._slots[self._index])[self.fill:]
+
+    def advance(self, n: int) -> Optional[memoryview]:
+        """Marks `n` bytes of `space()` as written, returns the chunk if the slot is full."""
+        self.fill += n
+        self.offset += n
+        return self.take() if self.fill == len(self._slots[self._index]) else None
+
+    def take(self) -> memoryview:
+        """Gets the written part of the current slot and moves to the next slot."""
+        chunk = memoryview(self._slots[self._index])[:self.fill]
+        self._index = (self._index + 1) % len(self._slots)
+        self.fill = 0
+        return chunk
+
+    def write(self, data: bytes) -> Iterator[memoryview]:
+        """Writes `data`, yields each slot it fills."""
+        view = memoryview(data)
+        while len(view):
+            space = self.space()
+            n = min(len(space), len(view))
+            space[:n] = view[:n]
+            view = view[n:]
+            chunk = self.advance(n)
+            if chunk is not None:
+                yield chunk
+
+    def copy(self, fp: object, size: int) -> Iterator[memoryview]:
+        """Reads `size` bytes of `fp` into the slots, yields each slot it fills."""
+        readinto = getattr(fp, "readinto", None)
+        remaining = size
+        while remaining:
+            space = self.space()[:remaining]
+            if readinto is not None:
+                n = readinto(space)
+            else:
+                blk = fp.read(len(space))  # type: ignore
+                n = len(blk)
+                space[:n] = blk
+            if not n:
+                raise OSError("unexpected end of data")
+            remaining -= n
+            chunk = self.advance(n)
+            if chunk is not None:
+                yield chunk
 
 
 def _to_tarinfo(fileobj: FileObj) -> tarfile.TarInfo:
@@ -38,42 +106,81 @@ def _to_tarinfo(fileobj: FileObj) -> tarfile.TarInfo:
     return tarinfo
 
 
+def _tar_chunks(files: List[FileObj],
+                to_tarinfo: Callable[[FileObj], tarfile.TarInfo],
+                ring: _RingBuffer) -> Iterator[memoryview]:
+    """Writes a tar of `files` to `ring` and yields its chunks, as `tarfile` in `w|` mode would."""
+    for fileobj in files:
+        tarinfo = to_tarinfo(fileobj)
+        yield from ring.write(tarinfo.tobuf(tarfile.DEFAULT_FORMAT, tarfile.ENCODING,
+                                            "surrogateescape"))
+        with fileobj.open('rb') as fp:
+            yield from ring.copy(fp, tarinfo.size)
+        remainder = tarinfo.size % tarfile.BLOCKSIZE
+        if remainder > 0:
+            yield from ring.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+
+    # taken from tarfile.TarFile.close()
+    yield from ring.write(tarfile.NUL * (tarfile.BLOCKSIZE * 2))
+    remainder = ring.offset % tarfile.RECORDSIZE
+    if remainder > 0:
+        yield from ring.write(tarfile.NUL * (tarfile.RECORDSIZE - remainder))
+    if ring.fill:
+        yield ring.take()
+
+
+def _gzip_member(chunk: memoryview, level: int) -> bytes:
+    return gzip.compress(chunk, compresslevel=level, mtime=0)
+
+
 def tar_stream_gen(files: List[FileObj],
-                   to_tarinfo: Callable[[FileObj], tarfile.TarInfo] = _to_tarinfo)\
+                   to_tarinfo: Callable[[FileObj], tarfile.TarInfo] = _to_tarinfo,
+                   compress: bool = True,
+                   workers: int = 0,
+                   level: int = 6,
+                   chunk_size: int = CHUNK_SIZE)\
         -> Iterator[bytes]:
     """Returns an `iterator[bytes]` over the bytes of a .tar made up of the
     items in `file_list`.
 
-    This will be gzipped."""
-    buffer = _FileStream()
-    tar = tarfile.TarFile.open('no_file_name',
-                               mode='w|gz',
-                               fileobj=buffer)  # type: ignore
-    if tar.fileobj is None:
-        raise Exception("Tar has None for fileobj")
-
-    for fileobj in files:
-        tarinfo = to_tarinfo(fileobj)
-        tar.addfile(tarinfo)
-        yield buffer.pop()
-
-        with fileobj.open('rb') as fp:
-            while True:
-                blk = fp.read(BUFFER_SIZE)
-                if len(blk) > 0:
-                    tar.fileobj.write(blk)
-                    yield buffer.pop()
-                if len(blk) < BUFFER_SIZE:
-                    # taken from tarfile.TarFile.addfile()
-                    blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
-                    if remainder > 0:
-                        tar.fileobj.write(
-                            tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
-                        yield buffer.pop()
-                        blocks += 1
-
-                    tar.offset += blocks * tarfile.BLOCKSIZE
-                    break
-
-    tar.close()
-    yield buffer.pop()
+    Parameters
+    ----------
+    compress: Gzip the tar. Use `False` to send a plain .tar when the files
+    are already compressed.
+
+    workers: Number of chunks to compress at once as independent gzip members.
+    0 for the number of CPUs, 1 to compress as one gzip member on the calling
+    thread.
+
+    level: gzip compression level.
+
+    chunk_size: Bytes of tar in each chunk.
+    """
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if not compress:
+        ring = _RingBuffer(1, chunk_size)
+        for chunk in _tar_chunks(files, to_tarinfo, ring):
+            yield bytes(chunk)
+        return
+
+    if workers == 1:
+        ring = _RingBuffer(1, chunk_size)
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in _tar_chunks(files, to_tarinfo, ring):
+            out = compressor.compress(chunk)
+            if out:
+                yield out
+        yield compressor.flush()
+        return
+
+    # One more slot than chunks in flight so the next chunk has a free slot
+    slots = workers + 1
+    ring = _RingBuffer(slots, chunk_size)
+    executor = _get_executor()
+    pending: Deque[Future] = deque()
+    for chunk in _tar_chunks(files, to_tarinfo, ring):
+        pending.append(executor.submit(_gzip_member, chunk, level))
+        while pending and (len(pending) >= slots or pending[0].done()):
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
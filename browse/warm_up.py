@@ -0,0 +1,150 @@
+"""Warm up of a new app before it takes traffic.
+
+Without this the first requests to a new worker pay for making the object
+store clients, the `ArticleStore` and its reasons file, the first DB
+connections and compiling the templates they use. On a scale out that is in
+the latency of user requests.
+
+`warm_up()` does these ahead of time, in `create_web_app()` when
+`WARM_UP_ON_START` is set, and logs how long each step took. The
+`/ready` route answers 503 until the warm up is done and all its steps
+worked, so a startup or readiness probe keeps traffic away until then.
+"""
+import logging
+import time
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, current_app
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+EXTENSION = "browse_warm_up"
+"""Key of the `WarmUp` of an app in `app.extensions`."""
+
+
+def _doc_service() -> None:
+    from browse.services.documents import get_doc_service
+    get_doc_service()
+
+
+def _listing_service() -> None:
+    from browse.services.listing import get_listing_service
+    get_listing_service()
+
+
+def _article_store() -> None:
+    from browse.services.dissemination import get_article_store
+    store = get_article_store()
+    store.is_deleted("0704.0001")
+
+
+def _db_pool() -> None:
+    if current_app.config.get("BROWSE_DISABLE_DATABASE"):
+        return
+    count = max(1, int(current_app.config.get("WARM_UP_DB_CONNECTIONS", 1)))
+    for engine in [getattr(current_app, "engine", None), getattr(current_app, "latexml_engine", None)]:
+        if engine is None:
+            continue
+        conns = [engine.connect() for _ in range(count)]
+        try:
+            for conn in conns:
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in conns:
+                conn.close()
+
+
+def _templates() -> None:
+    env = current_app.jinja_env
+    for name in env.list_templates(extensions=["html", "xml", "txt"]):
+        try:
+            env.get_template(name)
+        except Exception as ex:
+            # Not all templates can be compiled on their own, those are left
+            # for their first use.
+            logger.debug("Did not compile template %s: %s", name, ex)
+
+
+STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("doc_service", _doc_service),
+    ("listing_service", _listing_service),
+    ("article_store", _article_store),
+    ("db_pool", _db_pool),
+    ("templates", _templates),
+]
+"""Steps of the warm up, in the order they are run."""
+
+
+class WarmUp:
+    """State of the warm up of an app.
+
+    `timings` has the seconds taken by each step that was run and `failed` the
+    error of each step that did not work. Failed steps are tried again by
+    `ready()`."""
+
+    def __init__(self, app: Flask, steps: List[Tuple[str, Callable[[], None]]]):
+        self.app = app
+        self.steps = steps
+        self.timings: Dict[str, float] = {}
+        self.failed: Dict[str, str] = {}
+        self.done = False
+        self._lock = Lock()
+
+    def run(self, only: Optional[List[str]] = None) -> None:
+        """Runs the steps, or just those named in `only`, in an app context."""
+        with self.app.app_context():
+            for name, step in self.steps:
+                if only is not None and name not in only:
+                    continue
+                start = time.perf_counter()
+                try:
+                    step()
+                    self.failed.pop(name, None)
+                except Exception as ex:
+                    logger.warning("Warm up step %s failed: %s", name, ex)
+                    self.failed[name] = str(ex)
+                self.timings[name] = time.perf_counter() - start
+        self.done = True
+
+    def ready(self) -> bool:
+        """Whether the warm up is done and all its steps worked.
+
+        Failed steps are run again by one caller at a time."""
+        if not self.done:
+            return False
+        if self.failed and self._lock.acquire(blocking=False):
+            try:
+                self.run(list(self.failed))
+            finally:
+                self._lock.release()
+        return not self.failed
+
+
+def warm_up(app: Flask) -> WarmUp:
+    """Runs the warm up steps for `app` and logs the time of each."""
+    state = WarmUp(app, STEPS)
+    app.extensions[EXTENSION] = state
+    state.run()
+    log_timings("warm up", state.timings)
+    return state
+
+
+def log_timings(phase: str, timings: Dict[str, float]) -> None:
+    """Logs the seconds of each part of `phase` and the total."""
+    parts = ", ".join(f"{name}={secs:.3f}s" for name, secs in timings.items())
+    logger.info("Browse %s took %.3fs: %s", phase, sum(timings.values()), parts)
+
+
+def is_ready(app: Flask) -> Tuple[bool, Dict]:
+    """Gets if `app` is ready for traffic and details for the readiness route.
+
+    An app that was made without a warm up is ready."""
+    state: Optional[WarmUp] = app.extensions.get(EXTENSION)
+    if state is None:
+        return True, {"warm_up": "off"}
+    ready = state.ready()
+    return ready, {"warm_up": "done" if state.done else "running",
+                   "timings": {name: round(secs, 3) for name, secs in state.timings.items()},
+                   "failed": dict(state.failed)}
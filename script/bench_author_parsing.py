@@ -0,0 +1,73 @@
+"""
+Benchmark parsing the author lists of large collaboration papers.
+
+Run as
+
+   python script/bench_author_parsing.py [abs_file ...]
+
+With no files the collaboration papers in tests/data/abs_files are used.
+
+For each file this reports the time to make the author links, meta tag authors
+and BibTeX authors of an /abs page, as `queries_for_authors` and
+`parse_author_affil_utf` did without a cache, and with the cache of
+`browse.formatting.author_cache` once it is warm. It also reports a listing
+page of copies of all the files.
+"""
+
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from arxiv.authors import parse_author_affil_utf
+from arxiv.document.parse_abs import parse_abs_file
+from arxiv.files import LocalFileObj
+
+from browse.formatting import author_cache
+from browse.formatting.author_cache import authors_affils_utf
+from browse.formatting.search_authors import _queries_for_authors, queries_for_authors
+
+FIXTURES = ['1411/1411.4413', '1310/1310.8286', '1902/1902.05884', '1902/1902.11195']
+
+
+def uncached(raw: str) -> None:
+    _queries_for_authors(raw)
+    parse_author_affil_utf(raw)  # meta tags
+    parse_author_affil_utf(raw)  # bibtex
+
+
+def cached(raw: str) -> None:
+    queries_for_authors(raw)
+    authors_affils_utf(raw)
+    authors_affils_utf(raw)
+
+
+def bench(name: str, raws: list, repeat: int = 5) -> None:
+    for label, fn in [("uncached", uncached), ("cached", cached)]:
+        author_cache._cache = None
+        for raw in raws:  # warm up, fills the cache
+            fn(raw)
+        best = min(_time(fn, raws) for _ in range(repeat))
+        print(f"{name}\t{len(raws)} lists\t{label}\t{best * 1000:.2f}ms")
+
+
+def _time(fn, raws: list) -> float:  # type: ignore
+    start = perf_counter()
+    for raw in raws:
+        fn(raw)
+    return perf_counter() - start
+
+
+def main(paths: list) -> None:
+    if not paths:
+        root = Path(__file__).parent.parent / 'tests/data/abs_files/ftp/arxiv/papers'
+        paths = [str(root / f'{fixture}.abs') for fixture in FIXTURES]
+    raws = []
+    for path in paths:
+        raw = str(parse_abs_file(LocalFileObj(Path(path))).authors)
+        raws.append(raw)
+        bench(f"{Path(path).name} ({len(raw)} chars)", [raw])
+    bench("listing page", raws * 50)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+"""
+Benchmark the branding rewrite of latexml HTML papers.
+
+Run as
+
+   python script/bench_html_branding.py [latexml_html_file ...]
+
+Get real latexml outputs with script/get_test_article.py or from the latexml
+bucket. With no files a synthetic paper of about 20MB is used.
+
+For each file this reports the throughput of `BrandedHTMLRewriter` when fed
+line by line, as `HTMLFileTransform` did before, and when fed blocks of
+`BLOCK_SIZE`.
+"""
+
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from browse.services.html_processing.scaffold import BLOCK_SIZE, BrandedHTMLRewriter
+
+FRAGMENTS = {name: b'<!-- ' + name.encode() + b' -->' * 200
+             for name in ['head_mixins', 'header', 'callout_license', 'footer']}
+
+
+def synthetic_paper(size: int = 20 * 1024 * 1024) -> bytes:
+    head = (b'<!DOCTYPE html><html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            b'<link rel="stylesheet" href="ar5iv.css">\n</head>\n<body>\n'
+            b'<div class="ltx_page_main">\n<div class="ltx_page_content">\n')
+    para = (b'<p class="ltx_p">We show <math alttext="x^2" display="inline">'
+            b'<mi>x</mi><mn>2</mn></math> is bounded.</p>\n')
+    tail = (b'</div>\n<footer class="ltx_page_footer">\n<div>Generated by LaTeXML</div>\n'
+            b'</footer>\n</div>\n</body>\n</html>\n')
+    return head + para * (size // len(para)) + tail
+
+
+def by_lines(html: bytes) -> int:
+    rewriter = BrandedHTMLRewriter(FRAGMENTS)
+    total = sum(len(rewriter.feed(line)) for line in html.splitlines(keepends=True))
+    return total + len(rewriter.finish())
+
+
+def by_blocks(html: bytes) -> int:
+    rewriter = BrandedHTMLRewriter(FRAGMENTS)
+    total = sum(len(rewriter.feed(html[i:i + BLOCK_SIZE])) for i in range(0, len(html), BLOCK_SIZE))
+    return total + len(rewriter.finish())
+
+
+def bench(name: str, html: bytes, repeat: int = 5) -> None:
+    mb = len(html) / (1024 * 1024)
+    for label, fn in [("lines", by_lines), ("blocks", by_blocks)]:
+        best = min(_time(fn, html) for _ in range(repeat))
+        print(f"{name}\t{mb:.1f}MB\t{label}\t{best * 1000:.1f}ms\t{mb / best:.0f}MB/s")
+
+
+def _time(fn, html: bytes) -> float:  # type: ignore
+    start = perf_counter()
+    fn(html)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            bench(path, Path(path).read_bytes())
+    else:
+        bench("synthetic", synthetic_paper())
@@ -0,0 +1,107 @@
+"""
+Benchmark the throughput of the streaming tar generator.
+
+Run as
+
+   python script/bench_tarstream.py [MB]
+
+This makes files of about MB megabytes in total (default 64) of mixed text
+and random bytes in a temporary directory and streams a tar of them with the
+single threaded `tarfile` `w|gz` implementation `tar_stream_gen` had before,
+and with `tar_stream_gen` with one worker, with all the CPUs and uncompressed.
+It reports the time, MB/s of tar and size of the output of each.
+"""
+
+import os
+import random
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterator, List
+
+from arxiv.files import LocalFileObj
+
+from browse.stream.tarstream import _to_tarinfo, tar_stream_gen
+
+
+def legacy_tar_stream_gen(files: List[LocalFileObj]) -> Iterator[bytes]:
+    """`tar_stream_gen` as it was, a `w|gz` tarfile and a `BytesIO` popped per block."""
+    class _FileStream():
+        def __init__(self) -> None:
+            self.buffer = BytesIO()
+            self.offset = 0
+
+        def write(self, s: bytes) -> None:
+            self.buffer.write(s)
+            self.offset += len(s)
+
+        def tell(self) -> int:
+            return self.offset
+
+        def close(self) -> None:
+            self.buffer.close()
+
+        def pop(self) -> bytes:
+            data = self.buffer.getvalue()
+            self.buffer.close()
+            self.buffer = BytesIO()
+            return data
+
+    buffer = _FileStream()
+    tar = tarfile.TarFile.open('no_file_name', mode='w|gz', fileobj=buffer)  # type: ignore
+    for fileobj in files:
+        tarinfo = _to_tarinfo(fileobj)
+        tar.addfile(tarinfo)
+        yield buffer.pop()
+        with fileobj.open('rb') as fp:
+            while True:
+                blk = fp.read(16 * 1024)
+                if len(blk) > 0:
+                    tar.fileobj.write(blk)  # type: ignore
+                    yield buffer.pop()
+                if len(blk) < 16 * 1024:
+                    blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+                    if remainder > 0:
+                        tar.fileobj.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))  # type: ignore
+                        yield buffer.pop()
+                        blocks += 1
+                    tar.offset += blocks * tarfile.BLOCKSIZE
+                    break
+    tar.close()
+    yield buffer.pop()
+
+
+def make_files(root: Path, total_mb: int) -> List[LocalFileObj]:
+    rnd = random.Random(1)
+    words = [b"theorem", b"lemma", b"proof", b"\\begin{equation}", b"x_i", b"=", b"\n"]
+    files = []
+    for i in range(max(1, total_mb // 4)):
+        path = root / f"file{i}.{'tex' if i % 2 else 'bin'}"
+        if i % 2:
+            path.write_bytes(b" ".join(rnd.choice(words) for _ in range(550_000)))
+        else:
+            path.write_bytes(rnd.randbytes(4 * 1024 * 1024))
+        files.append(LocalFileObj(path))
+    return files
+
+
+def bench(name: str, gen: Callable[[], Iterator[bytes]], tar_bytes: int) -> None:
+    start = perf_counter()
+    size = sum(len(chunk) for chunk in gen())
+    elapsed = perf_counter() - start
+    print(f"{name:<16}{elapsed:8.2f}s{tar_bytes / elapsed / 1e6:10.1f} MB/s{size / 1e6:10.1f} MB out")
+
+
+if __name__ == "__main__":
+    total_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    with tempfile.TemporaryDirectory() as tmp:
+        files = make_files(Path(tmp), total_mb)
+        tar_bytes = sum(file.size for file in files)
+        print(f"{len(files)} files, {tar_bytes / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+        bench("legacy w|gz", lambda: legacy_tar_stream_gen(files), tar_bytes)
+        bench("1 worker", lambda: tar_stream_gen(files, workers=1), tar_bytes)
+        bench("all CPUs", lambda: tar_stream_gen(files), tar_bytes)
+        bench("uncompressed", lambda: tar_stream_gen(files, compress=False), tar_bytes)
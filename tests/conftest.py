@@ -112,6 +112,23 @@ def reset_packages():
     global_object_store._stores = {}
     from browse.services import dissemination
     dissemination._article_store = None
+    documents._doc_cache = None
+    from browse.services import html_processing
+    html_processing._page_cache = None
+    listing._month_cache = None
+    listing._new_cache = None
+    from browse.services.database import announcement_index
+    announcement_index._announcement_index = None
+    from browse.services.database import listings as db_listings
+    db_listings._page_boundaries = None
+    from browse.formatting import author_cache
+    author_cache._cache = None
+    from browse.services.database import institution_ip_index
+    institution_ip_index._index = None
+    from browse.services.dissemination import tar_index
+    tar_index._tar_index_cache = None
+    from browse.services.database import latexml_status
+    latexml_status._cache = None
 
 
 @pytest.fixture
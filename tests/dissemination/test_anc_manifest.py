@@ -0,0 +1,43 @@
+from browse.services.dissemination import get_article_store
+from browse.services.dissemination import source_store
+from browse.services.dissemination.anc_manifest import AncillaryManifests
+from browse.services.documents import get_doc_service
+
+FILES = [{"name": "data.csv", "size": 12}, {"name": "fig.m", "size": 345}]
+
+
+def test_manifests(tmp_path):
+    manifests = AncillaryManifests(str(tmp_path / "anc.db"))
+    assert manifests.lookup("ftp/arxiv/papers/1601/1601.04345.tar.gz", "abc") is None
+    manifests.record("ftp/arxiv/papers/1601/1601.04345.tar.gz", "abc", FILES)
+    assert manifests.lookup("ftp/arxiv/papers/1601/1601.04345.tar.gz", "abc") == FILES
+    assert manifests.lookup("ftp/arxiv/papers/1601/1601.04345.tar.gz", "def") is None, \
+        "a new source should not use the old list"
+    assert len(AncillaryManifests(manifests.path)) == 1
+
+
+def test_anc_files_listed_once(client_with_test_fs, mocker):
+    store = get_article_store()
+    assert store.source_store.anc_manifests is not None
+    docmeta = get_doc_service().get_abs("1601.04345")
+    listed = mocker.spy(source_store, "list_ancillary_files")
+
+    files = store.get_ancillary_files(docmeta)
+    assert [file["name"] for file in files] == [file["name"] for file in store.get_ancillary_files(docmeta)]
+    assert listed.call_count == 1
+
+    rv = client_with_test_fs.get("/src/1601.04345/anc")
+    assert rv.status_code == 200
+    assert "CDA_Derivative.m" in rv.data.decode("utf-8")
+    assert listed.call_count == 1
+
+
+def test_manifests_in_memory_bounded():
+    manifests = AncillaryManifests(maxsize=2)
+    for n in range(3):
+        manifests.record(f"ftp/arxiv/papers/1601/1601.0000{n}.tar.gz", "abc", FILES)
+    assert len(manifests) == 2
+    assert manifests.lookup("ftp/arxiv/papers/1601/1601.00000.tar.gz", "abc") is None, \
+        "the least recently used list should be dropped"
+    assert manifests.lookup("ftp/arxiv/papers/1601/1601.00002.tar.gz", "abc") == FILES
+    assert manifests.lookup("ftp/arxiv/papers/1601/1601.00002.tar.gz", "def") is None
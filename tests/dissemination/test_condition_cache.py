@@ -0,0 +1,49 @@
+from unittest import mock
+
+from arxiv.identifier import Identifier
+
+from browse.services.dissemination import get_article_store
+from browse.services.dissemination.condition_cache import ConditionCache, condition_key
+
+
+def test_condition_ttls():
+    now = [0.0]
+    cache = ConditionCache(10, stable_ttl=1000, transient_ttl=10)
+    cache._cache.clock = lambda: now[0]
+
+    wdr = condition_key("pdf", Identifier("1208.9999v3"))
+    cache.put(wdr, "WITHDRAWN", versioned=True)
+    unavailable = condition_key("pdf", Identifier("1208.9999v1"))
+    cache.put(unavailable, "UNAVAILABLE", versioned=True)
+    unversioned = condition_key("pdf", Identifier("1208.9999"))
+    cache.put(unversioned, "NOT_PDF", versioned=False)
+
+    now[0] = 11
+    assert cache.get(wdr) == "WITHDRAWN"
+    assert cache.get(unavailable) is None
+    assert cache.get(unversioned) is None
+    now[0] = 1001
+    assert cache.get(wdr) is None
+
+
+def test_no_source_cached(client_with_test_fs):
+    store = get_article_store()
+    assert store.condition_cache is not None
+    with mock.patch.object(store.source_store, "source_exists",
+                           wraps=store.source_store.source_exists) as source_exists:
+        resp = client_with_test_fs.get("/pdf/1208.9998v1")
+        assert resp.status_code == 404
+        assert source_exists.call_count == 1
+
+        resp = client_with_test_fs.get("/pdf/1208.9998v1")
+        assert resp.status_code == 404
+        assert source_exists.call_count == 1
+
+
+def test_not_found_not_cached():
+    cache = ConditionCache(10, stable_ttl=1000, transient_ttl=1000)
+    for condition in ["ARTICLE_NOT_FOUND", "VERSION_NOT_FOUND"]:
+        cache.put(condition_key("pdf", Identifier("1208.9999")), condition, versioned=False)
+        cache.put(condition_key("pdf", Identifier("1208.9999v2")), condition, versioned=True)
+    assert cache.get(condition_key("pdf", Identifier("1208.9999"))) is None
+    assert cache.get(condition_key("pdf", Identifier("1208.9999v2"))) is None
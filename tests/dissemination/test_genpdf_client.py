@@ -0,0 +1,89 @@
+import threading
+from unittest import mock
+
+import requests
+import requests_mock
+
+from browse.services.dissemination.genpdf_client import GenpdfClient
+
+API = "https://api.example.com"
+
+
+def test_redirect():
+    client = GenpdfClient(API, timeout=10, backoff=0)
+    with requests_mock.Mocker() as req_m:
+        req_m.get(f"{API}/pdf/0704.0002v1", status_code=302,
+                  headers={"location": "gs://fakebucket/fake.pdf"})
+        resp = client.request_pdf("0704.0002v1", {})
+    assert resp != "UNAVAILABLE"
+    assert resp.status_code == 302
+    assert "timeout=10" in req_m.last_request.url
+
+
+def test_connection_errors_unavailable():
+    client = GenpdfClient(API, timeout=10, retries=3, backoff=0)
+    with requests_mock.Mocker() as req_m:
+        req_m.get(f"{API}/pdf/0704.0002v1", exc=requests.ConnectionError)
+        assert client.request_pdf("0704.0002v1", {}) == "UNAVAILABLE"
+        assert req_m.call_count == 3
+
+
+def test_retry_on_start_up():
+    client = GenpdfClient(API, timeout=10, retries=3, backoff=0)
+    with requests_mock.Mocker() as req_m:
+        req_m.get(f"{API}/pdf/0704.0002v1",
+                  [{"status_code": 503}, {"status_code": 302, "headers": {"location": "gs://b/k.pdf"}}])
+        resp = client.request_pdf("0704.0002v1", {})
+        assert resp != "UNAVAILABLE" and resp.status_code == 302
+        assert req_m.call_count == 2
+
+
+def test_coalesce_same_id():
+    client = GenpdfClient(API, timeout=10)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow(ids, headers):
+        calls.append(ids)
+        started.set()
+        release.wait(5)
+        return "UNAVAILABLE"
+
+    results = []
+    with mock.patch.object(client, "_request", side_effect=slow):
+        leader = threading.Thread(target=lambda: results.append(client.request_pdf("0704.0002v1", {})))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(client.request_pdf("0704.0002v1", {})))
+                     for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+    assert calls == ["0704.0002v1"]
+    assert results == ["UNAVAILABLE"] * 4
+
+
+def test_no_free_slot_unavailable():
+    client = GenpdfClient(API, timeout=10, max_concurrency=1, slot_timeout=0.01, backoff=0)
+    client._slots.acquire()  # a build holds the only slot
+    with requests_mock.Mocker() as req_m:
+        req_m.get(f"{API}/pdf/0704.0002v1", status_code=302)
+        assert client.request_pdf("0704.0002v1", {}) == "UNAVAILABLE"
+        assert req_m.call_count == 0
+    client._slots.release()
+
+
+def test_duration_excludes_queue_wait():
+    client = GenpdfClient(API, timeout=10, backoff=0)
+    with requests_mock.Mocker() as req_m, \
+         mock.patch("browse.services.dissemination.genpdf_client.queue_wait") as queue_wait, \
+         mock.patch("browse.services.dissemination.genpdf_client.request_duration") as duration:
+        req_m.get(f"{API}/pdf/0704.0002v1", status_code=302)
+        client.request_pdf("0704.0002v1", {})
+    assert queue_wait.record.call_args.args[1] == {"acquired": "true"}
+    assert duration.record.call_args.args[1] == {"status": "302"}
+    assert client._slots.acquire(blocking=False), "the slot should be released"
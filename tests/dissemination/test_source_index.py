@@ -0,0 +1,99 @@
+import sqlite3
+
+from arxiv.files.object_store import LocalObjectStore
+from arxiv.identifier import Identifier
+
+from browse.services.dissemination.source_index import (
+    SourceLocation, SqliteSourceIndex, build_source_index, split_source_key)
+from browse.services.dissemination.source_store import SourceStore, src_path_prefix
+
+ABS_FILES = "tests/data/abs_files/"
+
+
+def test_split_source_key():
+    assert split_source_key("ftp/arxiv/papers/1208/1208.9999.gz") == ("ftp/arxiv/papers/1208/1208.9999", ".gz")
+    assert split_source_key("orig/cs/papers/0012/0012007v1.tar.gz") == ("orig/cs/papers/0012/0012007v1", ".tar.gz")
+    assert split_source_key("ftp/arxiv/papers/1208/1208.6335.pdf") == ("ftp/arxiv/papers/1208/1208.6335", ".pdf")
+    assert split_source_key("ftp/arxiv/papers/1208/1208.6335.abs") is None
+
+
+def test_sqlite_index(tmp_path):
+    index = SqliteSourceIndex(str(tmp_path / "src.db"))
+    assert index.lookup("ftp/arxiv/papers/1208/1208.9999") is None
+    loc = SourceLocation(".gz", 123, "abc")
+    index.record("ftp/arxiv/papers/1208/1208.9999", loc)
+    assert index.lookup("ftp/arxiv/papers/1208/1208.9999") == loc
+    assert len(index) == 1
+
+    index.record("ftp/arxiv/papers/1208/1208.9999", SourceLocation(".tar.gz", 456, "def"))
+    assert index.lookup("ftp/arxiv/papers/1208/1208.9999").ext == ".tar.gz"
+    assert len(index) == 1
+
+    index.remove("ftp/arxiv/papers/1208/1208.9999")
+    assert index.lookup("ftp/arxiv/papers/1208/1208.9999") is None
+
+    reopened = SqliteSourceIndex(str(tmp_path / "src.db"))
+    assert len(reopened) == 0
+
+
+def test_build_source_index(tmp_path):
+    index = SqliteSourceIndex(str(tmp_path / "src.db"))
+    count = build_source_index(index, LocalObjectStore(ABS_FILES), ["ftp/arxiv/papers/1208/"])
+    assert count == len(index)
+    assert index.lookup("ftp/arxiv/papers/1208/1208.9999").ext == ".gz"
+    assert index.lookup("ftp/arxiv/papers/1208/1208.6335").ext == ".pdf"
+    assert index.lookup("ftp/arxiv/papers/1208/1208.9998") is None
+
+
+def test_source_store_records_on_list(tmp_path):
+    index = SqliteSourceIndex(str(tmp_path / "src.db"))
+    store = SourceStore(LocalObjectStore(ABS_FILES), index)
+    arxiv_id = Identifier("1208.9999")
+    prefix = src_path_prefix(arxiv_id, True)
+    assert index.lookup(prefix) is None
+
+    src = store.get_src(arxiv_id, True)
+    assert src is not None and src.name.endswith("1208.9999.gz")
+    assert index.lookup(prefix) == SourceLocation(".gz", src.size, src.etag)
+
+    again = store.get_src(arxiv_id, True)
+    assert again is not None and again.name == src.name
+
+
+def test_source_store_stale_index(tmp_path):
+    index = SqliteSourceIndex(str(tmp_path / "src.db"))
+    store = SourceStore(LocalObjectStore(ABS_FILES), index)
+    arxiv_id = Identifier("1208.9999")
+    prefix = src_path_prefix(arxiv_id, True)
+    index.record(prefix, SourceLocation(".tar.gz", 1, "stale"))
+
+    src = store.get_src(arxiv_id, True)
+    assert src is not None and src.name.endswith("1208.9999.gz")
+    assert index.lookup(prefix).ext == ".gz"
+
+
+def test_source_store_no_source(tmp_path):
+    index = SqliteSourceIndex(str(tmp_path / "src.db"))
+    store = SourceStore(LocalObjectStore(ABS_FILES), index)
+    assert store.get_src(Identifier("1208.9998"), True) is None
+    assert len(index) == 0
+
+
+def test_source_store_refreshes_changed_source(tmp_path):
+    index = SqliteSourceIndex(str(tmp_path / "src.db"))
+    store = SourceStore(LocalObjectStore(ABS_FILES), index)
+    arxiv_id = Identifier("1208.9999")
+    prefix = src_path_prefix(arxiv_id, True)
+    index.record(prefix, SourceLocation(".gz", 1, "old"))
+
+    src = store.get_src(arxiv_id, True)
+    assert src is not None and src.name.endswith("1208.9999.gz")
+    assert index.lookup(prefix) == SourceLocation(".gz", src.size, src.etag)
+
+
+def test_source_store_index_write_errors(tmp_path, mocker):
+    index = SqliteSourceIndex(str(tmp_path / "src.db"))
+    mocker.patch.object(index, "record_many", side_effect=sqlite3.OperationalError("database is locked"))
+    store = SourceStore(LocalObjectStore(ABS_FILES), index)
+    src = store.get_src(Identifier("1208.9999"), True)
+    assert src is not None and src.name.endswith("1208.9999.gz")
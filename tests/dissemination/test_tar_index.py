@@ -0,0 +1,99 @@
+import gzip
+import io
+import random
+import tarfile
+
+from arxiv.files.object_store import LocalObjectStore
+
+from browse.services.dissemination import tar_index
+from browse.services.dissemination.tar_index import TarIndexCache
+
+FILES = {
+    'anc/random.bin': random.Random(1).randbytes(300_000),
+    'anc/text.txt': b'hello world\n' * 20_000,
+    'main.tex': b'\\documentclass{article}',
+    'anc/late.bin': random.Random(2).randbytes(500_000),
+}
+
+
+def _tarball(tmp_path, members=1):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tar:
+        for name, data in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    raw = buf.getvalue()
+    step = -(-len(raw) // members)
+    (tmp_path / 'src.tar.gz').write_bytes(
+        b''.join(gzip.compress(raw[i:i + step]) for i in range(0, len(raw), step)))
+    return LocalObjectStore(str(tmp_path)).to_obj('src.tar.gz')
+
+
+def test_member_reads_and_ranges(tmp_path):
+    for members in [1, 4]:
+        src = _tarball(tmp_path, members)
+        cache = TarIndexCache(4, 64 * 1024)
+        index = cache.index(src)
+        assert len(index.checkpoints) > 4
+        rnd = random.Random(3)
+        for name, data in FILES.items():
+            with cache.open_member(src, index, index.members[name]) as reader:
+                assert reader.read() == data
+                for _ in range(10):
+                    start = rnd.randrange(len(data))
+                    end = rnd.randrange(start, len(data) + 1)
+                    reader.seek(start)
+                    assert reader.read(end - start) == data[start:end]
+        assert 'anc/missing.txt' not in index.members
+
+
+def test_late_range_starts_at_checkpoint(tmp_path, mocker):
+    src = _tarball(tmp_path)
+    cache = TarIndexCache(4, 64 * 1024)
+    index = cache.index(src)
+    member = index.members['anc/late.bin']
+    inflater = mocker.spy(tar_index._Inflater, 'skip_to')
+    with cache.open_member(src, index, member) as reader:
+        reader.seek(member.size - 10)
+        assert reader.read() == FILES['anc/late.bin'][-10:]
+    start = index.checkpoint_before(member.offset + member.size - 10)
+    assert start.uncompressed > member.offset
+    assert inflater.call_args.args[1] - start.uncompressed < 64 * 1024 + tar_index.MAX_OUT
+
+
+def test_saved_members(tmp_path, mocker):
+    src = _tarball(tmp_path)
+    TarIndexCache(4, 64 * 1024, str(tmp_path / 'members.db')).index(src)
+    build = mocker.spy(tar_index, 'build_tar_index')
+    cache = TarIndexCache(4, 64 * 1024, str(tmp_path / 'members.db'))
+    assert cache.saved_member(src, 'main.tex')[1].size == len(FILES['main.tex'])
+    assert cache.saved_member(src, 'anc/missing.txt') == (True, None)
+    build.assert_not_called()
+
+
+def test_get_builds_in_background(tmp_path):
+    src = _tarball(tmp_path)
+    cache = TarIndexCache(4, 64 * 1024)
+    assert cache.get(src) is None, "the index should not be built by the caller"
+    for future in list(cache._building.values()):
+        future.result()
+    index = cache.get(src)
+    assert index is not None
+    assert index.members['main.tex'].size == len(FILES['main.tex'])
+
+
+def test_anc_file_with_index(client_with_test_fs):
+    for _ in range(2):  # before and after the index is built
+        rv = client_with_test_fs.get('/src/1601.04345v2/anc/Kepler_E_of_f_e.m')
+        assert rv.status_code == 200
+        assert int(rv.headers["Content-Length"]) == 178
+        assert tar_index._tar_index_cache is not None
+        for future in list(tar_index._tar_index_cache._building.values()):
+            future.result()
+    assert len(tar_index._tar_index_cache._indexes._data) == 1
+    assert client_with_test_fs.get('/src/1601.04345v2/anc/bogus').status_code == 404
+    rv = client_with_test_fs.get('/src/1601.04345v2/anc/Quadrupole_Pout_Oscillation_jz_maxmin.m',
+                                 headers={'Range': 'bytes=0-7'})
+    assert rv.status_code == 206
+    assert rv.data == b"function"
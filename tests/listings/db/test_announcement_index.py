@@ -0,0 +1,70 @@
+from datetime import date
+
+from browse.services.database import listings
+from browse.services.database.announcement_index import Announcement, AnnouncementIndex, announcement_page
+from browse.services.listing import get_listing_service
+
+
+def test_index_record_and_rows(tmp_path):
+    index = AnnouncementIndex(str(tmp_path / 'announcements.db'))
+    rows = [(10, 'new'), (11, 'cross'), (12, 'rep')]
+    index.record('new', 'math', '2011-02-03',
+                 Announcement(date(2011, 2, 3), len(rows), 1, 1, 1), rows)
+    found = index.lookup('new', 'math', '2011-02-03')
+    assert found == Announcement(date(2011, 2, 3), 3, 1, 1, 1)
+    assert index.rows('new', 'math', '2011-02-03', 1, 5) == rows[1:]
+    assert index.lookup('new', 'math.CO', '2011-02-03') is None
+
+    index.record('new', 'math', '2011-02-04', Announcement(date(2011, 2, 4), 0), [])
+    assert index.lookup('new', 'math', '2011-02-03') is None, "older mailings should be removed"
+    assert AnnouncementIndex(index.path).lookup('new', 'math', '2011-02-04') is not None
+
+
+def test_announcement_page_builds_once(mocker):
+    index = AnnouncementIndex()
+    rows = [(doc_id, 'new') for doc_id in range(10)]
+    build = mocker.Mock(return_value=(Announcement(date(2011, 2, 1), len(rows), 10,
+                                                   pubdates=[(date(2011, 2, 1), 10)]), rows))
+    first = announcement_page(index, 'recent', 'math', '2011-02-01', build, 0, 4)
+    second = announcement_page(index, 'recent', 'math', '2011-02-01', build, 4, 4)
+    assert build.call_count == 1
+    assert first[1] == rows[0:4] and second[1] == rows[4:8]
+    assert first[0] == second[0]
+
+
+def test_listings_from_index(app_with_db, mocker):
+    app = app_with_db
+    with app.app_context():
+        ls = get_listing_service()
+        new = ls.list_new_articles("math", 0, 30)
+        recent = ls.list_pastweek_articles("math", 0, 30)
+        build_new = mocker.spy(listings, '_new_announcement')
+        build_recent = mocker.spy(listings, '_recent_announcement')
+
+        page1 = ls.list_new_articles("math", 0, 1)
+        page2 = ls.list_new_articles("math", 1, 29)
+        assert [item.id for item in page1.listings + page2.listings] == [item.id for item in new.listings]
+        assert (page2.new_count, page2.cross_count, page2.rep_count) == \
+            (new.new_count, new.cross_count, new.rep_count)
+        assert page2.announced == new.announced
+
+        again = ls.list_pastweek_articles("math", 0, 30)
+        assert [item.id for item in again.listings] == [item.id for item in recent.listings]
+        assert again.pubdates == recent.pubdates
+        assert again.count == recent.count
+
+        build_new.assert_not_called()
+        build_recent.assert_not_called()
+
+
+def test_index_keeps_recent_mailings():
+    index = AnnouncementIndex()
+    for day in range(1, 6):
+        index.record('catchup', 'math', f'2011-02-0{day}', Announcement(date(2011, 2, day), 0), [], keep=3)
+    assert len(index) == 3
+    assert index.lookup('catchup', 'math', '2011-02-02') is None
+    assert index.lookup('catchup', 'math', '2011-02-03') is not None
+
+    index.record('catchup', 'math', '2011-02-05', Announcement(date(2011, 2, 5), 0), [], keep=3)
+    assert len(index) == 3, "rebuilding a mailing should not remove others"
+    assert index.lookup('catchup', 'math', '2011-02-03') is not None
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from browse.services.database.listings import _entries_into_monthly_listing_items
+from browse.services.database.listings import PageBoundaries, _entries_into_monthly_listing_items, get_page_boundaries
 from browse.services.listing import get_listing_service
 from arxiv.db.models import Metadata
 
@@ -167,6 +167,41 @@ def test_listings_for_year(app_with_db):
         assert items.pubdates[0][0].year==2009
         assert any(item.id=="0906.3421" and item.listingType=="new" for item in items.listings)
 
+def test_keyset_pagination(app_with_db):
+    app = app_with_db
+    with app.app_context():
+        ls=get_listing_service()
+        full=ls.list_articles_by_month("math", 2009, 6, 0,25)
+        assert full.count>2
+        get_page_boundaries().clear()
+
+        ids=[]
+        for skip in range(0, full.count, 2):
+            page=ls.list_articles_by_month("math", 2009, 6, skip,2)
+            assert page.count==full.count
+            ids+=[item.id for item in page.listings]
+        assert ids==[item.id for item in full.listings]
+        assert get_page_boundaries().nearest(("math", 2009, 6), 3)[0]==2
+
+        #a page between recorded boundaries starts from the nearest one before it
+        page=ls.list_articles_by_month("math", 2009, 6, 3,25)
+        assert [item.id for item in page.listings]==ids[3:]
+
+def test_page_boundaries_record():
+    boundaries=PageBoundaries(10)
+    key=("math", 2009, 6)
+    boundaries.record(key, 10, 2, (1, "0906.0002"))
+    before=boundaries._cache.get(key)
+    boundaries.record(key, 10, 4, (1, "0906.0004"))
+    assert dict(before[1])=={2: (1, "0906.0002")}, "recorded cursors should not be changed in place"
+    assert boundaries.nearest(key, 5)==(4, (1, "0906.0004"))
+    assert boundaries.nearest(key, 3)==(2, (1, "0906.0002"))
+
+    #a new count drops the old cursors
+    boundaries.record(key, 11, 4, (1, "0906.0003"))
+    assert boundaries.nearest(key, 3) is None
+    assert boundaries.agrees(key, 11)
+
 def test_month_listing_page( client_with_db_listings):
     client = client_with_db_listings
 
@@ -0,0 +1,162 @@
+import os
+import shutil
+
+from arxiv.files.object_store import LocalObjectStore
+
+from browse.services.listing import Listing
+from browse.services.listing.fs_listings import FsListingFilesService
+from browse.services.listing import month_cache
+from browse.services.listing.month_cache import ListingFileCache, MonthCache, listing_bytes
+from browse.services.listing.parse_listing_file import compile_month, get_updates_from_list_file
+from browse.services.listing.parse_listing_pastweek import compile_pastweek
+from browse.services.listing.parse_new_listing_file import compile_new_listing
+
+from tests import path_of_for_test
+LISTING_FILES = path_of_for_test('data/abs_files/ftp')
+
+ASTRO_LISTS = "ftp/astro-ph/listings"
+
+
+def _month_file(tmp_path, abs_path, yymm='0905'):
+    shutil.copy(abs_path / ASTRO_LISTS / yymm, tmp_path / yymm)
+    return LocalObjectStore(str(tmp_path)).to_obj(yymm)
+
+
+def test_compiled_month_matches_parse(abs_path):
+    file = abs_path / ASTRO_LISTS / '9204'
+    compiled = compile_month(file.read_bytes())
+    assert compiled.new_count == 6
+    assert compiled.cross_count == 0
+    assert compiled.listing_offsets('astro-ph') == (0, 1, 2, 3, 4, 5)
+
+    parsed = get_updates_from_list_file(1992, 4, file, "month", 'astro-ph', compiled)
+    assert isinstance(parsed, Listing)
+    assert [item.id for item in parsed.listings] == [item.id for item in compiled.items]
+    assert parsed.listings[0].article.title
+    assert compiled.offsets('astro-ph') is compiled.offsets('astro-ph'), "offsets should be kept"
+
+
+def test_month_cache_reparses_when_updated(tmp_path, abs_path):
+    file = _month_file(tmp_path, abs_path)
+    cache = MonthCache(10)
+    first = cache.get(file)
+    assert cache.get(file) is first
+
+    stat = os.stat(tmp_path / '0905')
+    os.utime(tmp_path / '0905', (stat.st_atime, stat.st_mtime + 60))
+    file = LocalObjectStore(str(tmp_path)).to_obj('0905')
+    second = cache.get(file)
+    assert second is not first
+    assert second.items == first.items
+
+
+def test_month_cache_dir(tmp_path, abs_path, mocker):
+    file = _month_file(tmp_path, abs_path)
+    cache_dir = tmp_path / 'cache'
+    compiled = MonthCache(10, cache_dir=str(cache_dir)).get(file)
+    assert list(cache_dir.glob('*.json'))
+
+    compile = mocker.patch('browse.services.listing.month_cache.compile_month')
+    loaded = MonthCache(10, cache_dir=str(cache_dir)).get(file)
+    compile.assert_not_called()
+    assert loaded.items == compiled.items
+    assert (loaded.new_count, loaded.cross_count) == (compiled.new_count, compiled.cross_count)
+
+
+def test_service_with_month_cache():
+    plain = FsListingFilesService(LISTING_FILES)
+    cached = FsListingFilesService(LISTING_FILES, MonthCache(24))
+    for archiveOrCategory in ['astro-ph', 'astro-ph.CO']:
+        # a page that spans the first two months
+        skip = plain.list_articles_by_month(archiveOrCategory, 18, 1, 0, 1).count - 10
+        expected = plain.list_articles_by_year(archiveOrCategory, 18, skip, 25)
+        assert len(expected.listings) == 25
+        for _ in range(2):
+            resp = cached.list_articles_by_year(archiveOrCategory, 18, skip, 25)
+            assert resp.count == expected.count
+            assert resp.pubdates == expected.pubdates
+            assert [item.id for item in resp.listings] == [item.id for item in expected.listings]
+
+    assert cached.monthly_counts('astro-ph', 18) == plain.monthly_counts('astro-ph', 18)
+
+
+def test_year_from_cached_months(tmp_path, abs_path, mocker):
+    listings = tmp_path / 'astro-ph' / 'listings'
+    listings.mkdir(parents=True)
+    for yymm in ['1801', '1802', '1803']:
+        shutil.copy(abs_path / ASTRO_LISTS / yymm, listings / yymm)
+    service = FsListingFilesService(str(tmp_path), MonthCache(24))
+    compile = mocker.spy(month_cache, 'compile_month')
+
+    resp = service.list_articles_by_year('astro-ph', 18, 0, 10)
+    assert len(resp.pubdates) == 3
+    assert resp.count == sum(count for _, count in resp.pubdates)
+    assert compile.call_count == 3
+
+    counts = service.monthly_counts('astro-ph', 2018)
+    assert [month.month for month in counts.by_month] == [1, 2, 3]
+    assert counts.new_count + counts.cross_count == resp.count
+    assert service.list_articles_by_year('astro-ph', 18, 0, 10).count == resp.count
+    assert compile.call_count == 3, "year pages should be made from the cached months"
+
+    stat = os.stat(listings / '1803')
+    os.utime(listings / '1803', (stat.st_atime, stat.st_mtime + 60))
+    assert service.list_articles_by_year('astro-ph', 18, 0, 10).count == resp.count
+    assert compile.call_count == 4, "only the updated month should be parsed again"
+
+
+def test_new_listing_cache(tmp_path, abs_path, mocker):
+    shutil.copy(abs_path / ASTRO_LISTS / 'new', tmp_path / 'new')
+    file = LocalObjectStore(str(tmp_path)).to_obj('new')
+    cache = ListingFileCache(10)
+    compile = mocker.Mock(side_effect=compile_new_listing)
+    first = cache.get(file, compile)
+    assert cache.get(file, compile) is first
+    assert compile.call_count == 1
+
+    stat = os.stat(tmp_path / 'new')
+    os.utime(tmp_path / 'new', (stat.st_atime, stat.st_mtime + 60))
+    file = LocalObjectStore(str(tmp_path)).to_obj('new')
+    assert cache.get(file, compile) is not first
+    assert compile.call_count == 2
+
+
+def test_service_with_new_cache():
+    plain = FsListingFilesService(LISTING_FILES)
+    cached = FsListingFilesService(LISTING_FILES, new_cache=ListingFileCache(10))
+    for archiveOrCategory in ['astro-ph', 'astro-ph.GA']:
+        expected = plain.list_new_articles(archiveOrCategory, 10, 5)
+        for _ in range(2):
+            resp = cached.list_new_articles(archiveOrCategory, 10, 5)
+            assert [item.id for item in resp.listings] == [item.id for item in expected.listings]
+            assert resp.new_count == expected.new_count
+
+        expected = plain.list_pastweek_articles(archiveOrCategory, 10, 5)
+        for _ in range(2):
+            resp = cached.list_pastweek_articles(archiveOrCategory, 10, 5)
+            assert [item.id for item in resp.listings] == [item.id for item in expected.listings]
+            assert resp.count == expected.count
+
+
+def test_new_listing_cache_bytes(tmp_path, abs_path):
+    shutil.copy(abs_path / ASTRO_LISTS / 'new', tmp_path / 'new')
+    shutil.copy(abs_path / ASTRO_LISTS / 'pastweek', tmp_path / 'pastweek')
+    store = LocalObjectStore(str(tmp_path))
+    new = compile_new_listing((tmp_path / 'new').read_bytes())
+    pastweek = compile_pastweek((tmp_path / 'pastweek').read_bytes())
+    assert listing_bytes(new) > 0 and listing_bytes(pastweek) > 0
+    # room for either but not both
+    cache = ListingFileCache(max(listing_bytes(new), listing_bytes(pastweek)), weigher=listing_bytes)
+    first = cache.get(store.to_obj('new'), compile_new_listing)
+    assert cache.get(store.to_obj('new'), compile_new_listing) is first
+    cache.get(store.to_obj('pastweek'), compile_pastweek)
+    assert cache.get(store.to_obj('new'), compile_new_listing) is not first, \
+        "new should have been evicted to stay under the max bytes"
+
+
+def test_new_listing_drops_parsed_text(abs_path):
+    new = compile_new_listing((abs_path / ASTRO_LISTS / 'new').read_bytes())
+    shown = list(new.items(0, 2))
+    assert new.items_text[0] is None and new.items_text[1] is None
+    assert new.items_text[2] is not None
+    assert [item.id for item in new.items(0, 2)] == [item.id for item in shown]
@@ -37,3 +37,13 @@ def test_parse_new_math_oa(abs_path):
         assert item.article.title
         if item.listingType in ['cross','new']:
             assert item.article.abstract
+
+
+def test_parse_new_window(abs_path):
+    file = abs_path / ASTRO_LISTS / "new"
+    full = parse_new_listing_file(file)
+    window = parse_new_listing_file(file, skip=20, show=10)
+    assert [item.id for item in window.listings] == [item.id for item in full.listings[20:30]]
+    assert [item.listingType for item in window.listings] == [item.listingType for item in full.listings[20:30]]
+    assert (window.new_count, window.cross_count, window.rep_count) == \
+        (full.new_count, full.cross_count, full.rep_count)
@@ -12,3 +12,12 @@ def test_parse_pastweek(abs_path):
         assert parsed.listings
         assert parsed.count
         assert parsed.expires
+
+
+def test_parse_pastweek_window(abs_path):
+    file = abs_path / ASTRO_LISTS / "pastweek"
+    full = parse_listing_pastweek(file)
+    window = parse_listing_pastweek(file, skip=50, show=25)
+    assert [item.id for item in window.listings] == [item.id for item in full.listings[50:75]]
+    assert window.count == full.count
+    assert window.pubdates == full.pubdates
@@ -0,0 +1,90 @@
+"""Tests for browse.services.cache."""
+from browse.services.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a is now most recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=100)
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_counters():
+    cache = LRUCache(maxsize=10)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("x")
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_disabled():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+def test_pop_matching():
+    cache = LRUCache(maxsize=10)
+    cache.put(("x", 1), 1)
+    cache.put(("x", 2), 2)
+    cache.put(("y", 1), 3)
+    assert cache.pop_matching(lambda key: key[0] == "x") == 2
+    assert cache.get(("y", 1)) == 3
+    assert cache.pop(("y", 1)) == 3
+    assert len(cache) == 0
+
+
+def test_weigher():
+    cache = LRUCache(maxsize=10, weigher=len)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.put("c", b"1234")
+    assert cache.get("a") is None, "should evict down to the max weight"
+    assert cache.stats()["weight"] == 8
+    cache.put("b", b"12")
+    assert cache.stats()["weight"] == 6
+    cache.put("big", b"12345678901")
+    assert cache.get("big") is None, "too heavy to cache"
+    assert cache.get("b") == b"12"
+    cache.pop("b")
+    assert cache.stats()["weight"] == 4
+    cache.clear()
+    assert cache.stats()["weight"] == 0
+
+
+def test_valid():
+    cache = LRUCache(maxsize=10)
+    cache.put("a", 1)
+    assert cache.get("a", valid=lambda value: value == 1) == 1
+    assert cache.get("a", valid=lambda value: value == 2) is None
+    assert len(cache) == 0, "an invalid value should be removed"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
@@ -6,7 +6,8 @@ from werkzeug.exceptions import BadRequest
 from bs4 import BeautifulSoup
 
 from browse.controllers.catchup_page import _process_catchup_params, GROUPS, ARCHIVES, CATEGORIES, catchup_index_for_types, catchup_paging
-from browse.services.database.catchup import get_catchup_data
+from browse.services.database.announcement_index import get_announcement_index
+from browse.services.database.catchup import date_to_mail_id, get_catchup_data
 from browse.services.database.listings import process_requested_subject
 from tests.listings.db.test_db_listing_new import validate_new_listing
 
@@ -239,6 +240,19 @@ def test_get_catchup_no_data(app_with_db):
     assert listing.announced == date(2011,2,4)
     assert len(listing.listings)==0
 
+def test_get_catchup_unwritten_day_not_indexed(app_with_db):
+    unwritten=date(year=2030, month=1, day=2)
+    app = app_with_db
+    with app.app_context():
+        listing=get_catchup_data(ARCHIVES['math'], unwritten, False, 1)
+        assert len(listing.listings)==0
+        index=get_announcement_index()
+        assert index.lookup("catchup", "math", date_to_mail_id(unwritten)) is None, \
+            "a mailing that is not written may still change so it should not be kept"
+
+        get_catchup_data(ARCHIVES['math'], date(year=2011, month=2, day=3), False, 1)
+        assert index.lookup("catchup", "math", "110203") is not None
+
 def test_get_catchup_data_grp_physics(app_with_db):
     test_date=date(year=2011, month=2, day=3)
     app = app_with_db
@@ -167,6 +167,13 @@ class TestBrowseDatabaseService(TestCase):
             f'Correct count of pings returned for paper {test_paper_id}'
         )
 
+    def test_trackback_ping_summary(self) -> None:
+        """Test the count and latest date of trackback pings are got together."""
+        count, latest = database.get_trackback_ping_summary('0808.4142')
+        self.assertEqual(count, database.count_trackback_pings('0808.4142'))
+        self.assertEqual(latest, database.get_trackback_ping_latest_date('0808.4142'))
+        self.assertEqual(database.get_trackback_ping_summary('9912.99999'), (0, None))
+
     def test_recent_trackback_pings(self) -> None:
         """Test if recent trackbacks can be retrieved."""
         tbs: List = database.\
@@ -232,6 +239,8 @@ class TestBrowseDatabaseService(TestCase):
             database.get_paper_trackback_pings('0704.0361'), [])
         self.assertEqual(
             database.count_trackback_pings('0704.0361'), 0)
+        self.assertEqual(
+            database.get_trackback_ping_summary('0704.0361'), (0, None))
         self.assertEqual(
             database.count_all_trackback_pings(), 0)
         self.assertEqual(
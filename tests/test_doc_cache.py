@@ -0,0 +1,64 @@
+"""Tests for the process wide DocMetadata cache."""
+from unittest import mock
+
+from arxiv.document.parse_abs import parse_abs_file
+from arxiv.files.object_store import LocalObjectStore
+
+from browse.services.documents.doc_cache import DocMetadataCache
+from browse.services.documents.fs_implementation.fs_abs import FsDocMetadataService
+from tests.test_fs_abs_parser import ABS_FILES
+
+
+def test_fs_doc_cache_parses_once():
+    cache = DocMetadataCache(100, 60)
+    service = FsDocMetadataService(LocalObjectStore(ABS_FILES), cache)
+    with mock.patch('browse.services.documents.fs_implementation.fs_abs.parse_abs_file',
+                    wraps=parse_abs_file) as parse:
+        first = service.get_abs('0704.0001')
+        second = service.get_abs('0704.0001')
+        assert parse.call_count == 1
+    assert first.arxiv_id == second.arxiv_id == '0704.0001'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_fs_doc_cache_versions_are_separate():
+    cache = DocMetadataCache(100, 60)
+    service = FsDocMetadataService(LocalObjectStore(ABS_FILES), cache)
+    latest = service.get_abs('0704.0615')
+    v1 = service.get_abs('0704.0615v1')
+    assert latest.version != v1.version
+    assert v1.version == 1
+    assert service.get_abs('0704.0615v1').version == 1
+
+
+def test_doc_cache_freshness():
+    cache = DocMetadataCache(100, 60)
+    cache.put('0704.0001', None, 't1', 'docmeta')
+    assert cache.get('0704.0001', None, 't1') == 'docmeta'
+    assert cache.get('0704.0001', None, 't2') is None
+    assert cache.get('0704.0001', None, 't1') is None  # stale entry was dropped
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_doc_cache_invalidate():
+    cache = DocMetadataCache(100, 60)
+    cache.put('0704.0001', None, 't', 'a')
+    cache.put('0704.0001', 1, 't', 'b')
+    cache.put('0704.0002', None, 't', 'c')
+    assert cache.invalidate('0704.0001') == 2
+    assert cache.get('0704.0002', None, 't') == 'c'
+
+
+def test_db_doc_cache_hit_has_no_query(app_with_db):
+    from browse.services.documents.db_implementation import db_abs
+    cache = DocMetadataCache(100, 60)
+    with app_with_db.app_context():
+        service = db_abs.DbDocMetadataService(cache)
+        first = service.get_abs('0906.2112')
+        with mock.patch.object(db_abs, 'Session') as session:
+            second = service.get_abs('0906.2112')
+            assert not session.mock_calls, "a cached paper should not query the DB"
+    assert second.arxiv_id_v == first.arxiv_id_v
+    assert cache.stats()['hits'] == 1
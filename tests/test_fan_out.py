@@ -0,0 +1,93 @@
+"""Tests for browse.services.fan_out."""
+import threading
+import time
+
+from flask import Flask, current_app
+
+from browse.services.fan_out import Lookup, fan_out, server_timing
+
+
+def _app(workers=4):
+    app = Flask("test_fan_out")
+    app.config["FAN_OUT_MAX_WORKERS"] = workers
+    return app
+
+
+def test_fan_out_runs_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def wait_for_others():
+        barrier.wait()
+        return threading.current_thread().name
+
+    with _app().app_context():
+        results, timings = fan_out({name: Lookup(wait_for_others) for name in "abc"},
+                                   timeout=5)
+    assert set(results.keys()) == {"a", "b", "c"}
+    assert all(name.startswith("fan_out") for name in results.values())
+    assert set(timings.keys()) == {"a", "b", "c"}
+
+
+def test_fan_out_timeout_uses_default():
+    with _app().app_context():
+        start = time.perf_counter()
+        results, timings = fan_out({"slow": Lookup(lambda: time.sleep(2) or 1, default=0, timeout=0.1),
+                                    "fast": Lookup(lambda: 2)},
+                                   timeout=5)
+        assert time.perf_counter() - start < 1.5
+    assert results == {"slow": 0, "fast": 2}
+    assert timings["slow"] >= 0.1
+
+
+def test_fan_out_exception_uses_default():
+    def boom():
+        raise ValueError("boom")
+
+    with _app().app_context():
+        results, _ = fan_out({"bad": Lookup(boom, default=[]), "good": Lookup(lambda: 1)}, timeout=1)
+    assert results == {"bad": [], "good": 1}
+
+
+def test_fan_out_has_app_context():
+    with _app().app_context():
+        results, _ = fan_out({"cfg": Lookup(lambda: current_app.config["FAN_OUT_MAX_WORKERS"])},
+                             timeout=1)
+    assert results["cfg"] == 4
+
+
+def test_fan_out_serial():
+    with _app(workers=0).app_context():
+        results, timings = fan_out({"a": Lookup(lambda: threading.current_thread().name)}, timeout=1)
+    assert results["a"] == threading.current_thread().name
+    assert "a" in timings
+
+
+def test_server_timing():
+    assert server_timing({"b": 0.002, "a": 0.0105}) == "a;dur=10.5, b;dur=2.0"
+
+
+def test_fan_out_skips_lookups_with_abandoned_calls():
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(5)
+        return 1
+
+    app = _app()
+    app.config["FAN_OUT_MAX_ABANDONED"] = 1
+    with app.app_context():
+        results, _ = fan_out({"hung": Lookup(hung, default=0)}, timeout=0.05)
+        assert results == {"hung": 0}
+        results, timings = fan_out({"hung": Lookup(hung, default=0), "ok": Lookup(lambda: 2)},
+                                   timeout=1)
+        assert results == {"hung": 0, "ok": 2}
+        assert len(calls) == 1, "lookup with an abandoned call should not be run"
+        assert timings["hung"] == 0.0
+
+        release.set()
+        time.sleep(0.1)
+        results, _ = fan_out({"hung": Lookup(hung, default=0)}, timeout=1)
+        assert results == {"hung": 1}
+        assert len(calls) == 2
@@ -0,0 +1,56 @@
+from io import BytesIO
+
+from browse.stream.file_stream import BlobRangeReader, metered, read_blocks
+
+
+class FakeBlob:
+    """Just enough of a GCS `Blob` for `BlobRangeReader`."""
+    def __init__(self, data: bytes):
+        self.data = data
+        self.size = len(data)
+        self.downloads = []
+
+    def download_as_bytes(self, start=None, end=None, raw_download=False, checksum="auto"):
+        self.downloads.append((start, end))
+        return self.data[start:end + 1]
+
+
+def test_read_blocks():
+    data = bytes(range(256)) * 100
+    chunks = list(read_blocks(BytesIO(data), 4096))
+    assert b"".join(chunks) == data
+    assert all(len(chunk) == 4096 for chunk in chunks[:-1])
+
+
+def test_metered():
+    assert list(metered(iter([b"abc", b"de"]), "test")) == [b"abc", b"de"]
+
+
+def test_blob_range_reader():
+    data = bytes(range(256)) * 100
+    blob = FakeBlob(data)
+    reader = BlobRangeReader(blob, 8192)
+    reader.seek(1000)
+    out = b""
+    for _ in range(5):
+        out += reader.read(4096)
+    assert out == data[1000:1000 + 5 * 4096]
+    assert len(blob.downloads) == 3  # 8192 bytes per download
+
+    reader.seek(len(data) - 10)
+    assert reader.read(4096) == data[-10:]
+    assert reader.read(4096) == b""
+
+    reader.seek(0)
+    assert reader.read() == data
+    reader.close()
+    assert reader.bytes_read == 5 * 4096 + 10 + len(data)
+
+
+def test_blob_range_reader_range_end():
+    data = bytes(range(256)) * 100
+    blob = FakeBlob(data)
+    reader = BlobRangeReader(blob, 8192, end=1100)
+    reader.seek(1000)
+    assert reader.read(100) == data[1000:1100]
+    assert blob.downloads[0] == (1000, 1099), "should not download past the end of the range"
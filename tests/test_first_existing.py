@@ -0,0 +1,51 @@
+import threading
+
+from flask import Flask
+
+from arxiv.files.object_store import LocalObjectStore
+
+from browse.services.global_object_store import first_existing
+
+ABS_FILES = "tests/data/abs_files/"
+
+
+def test_first_existing():
+    store = LocalObjectStore(ABS_FILES)
+    pdf = store.to_obj("ftp/arxiv/papers/1208/1208.6335.pdf")
+    gz = store.to_obj("ftp/arxiv/papers/1208/1208.9999.gz")
+    missing = store.to_obj("ftp/arxiv/papers/1208/1208.9998.pdf")
+
+    for workers in [16, 0]:
+        app = Flask(__name__)
+        app.config["FAN_OUT_MAX_WORKERS"] = workers
+        with app.app_context():
+            assert first_existing([pdf, gz]) is pdf
+            assert first_existing([gz, pdf]) is gz
+            assert first_existing([missing, gz]) is gz
+            assert first_existing([None, missing, pdf]) is pdf
+            assert first_existing([missing, None]) is None
+            assert first_existing([]) is None
+
+
+class _SlowStore:
+    """Store whose `to_obj()` is a round-trip, as with GS."""
+
+    def __init__(self, store, barrier):
+        self.store = store
+        self.barrier = barrier
+
+    def to_obj(self, key):
+        self.barrier.wait()
+        return self.store.to_obj(key)
+
+
+def test_first_existing_makes_objs_concurrently():
+    barrier = threading.Barrier(2, timeout=2)
+    store = _SlowStore(LocalObjectStore(ABS_FILES), barrier)
+    app = Flask(__name__)
+    app.config["FAN_OUT_MAX_WORKERS"] = 16
+    with app.app_context():
+        # Each to_obj() waits for the other, done one after the other this would time out
+        found = first_existing([lambda: store.to_obj("ftp/arxiv/papers/1208/1208.9998.pdf"),
+                                lambda: store.to_obj("ftp/arxiv/papers/1208/1208.6335.pdf")])
+    assert found is not None and found.name.endswith("1208.6335.pdf")
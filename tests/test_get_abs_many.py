@@ -0,0 +1,76 @@
+"""Tests for DocMetadataService.get_abs_many."""
+import threading
+import time
+
+import pytest
+from arxiv.document.exceptions import AbsNotFoundException
+from arxiv.files.object_store import LocalObjectStore
+from flask import Flask, current_app
+
+from browse.services.documents import get_doc_service
+from browse.services.documents.fs_implementation.fs_abs import FsDocMetadataService
+from tests.test_fs_abs_parser import ABS_FILES
+
+IDS = ['0704.0001', '0704.0615v1', '0704.0002', '0704.0001', '0704.9999']
+
+
+def _check_many(service):
+    found = service.get_abs_many(IDS)
+    assert list(found) == ['0704.0001', '0704.0615v1', '0704.0002', '0704.9999']
+    for id in ['0704.0001', '0704.0615v1', '0704.0002']:
+        expected = service.get_abs(id)
+        assert found[id].arxiv_id_v == expected.arxiv_id_v
+        assert found[id].title == expected.title
+    assert found['0704.0615v1'].version == 1
+    assert isinstance(found['0704.9999'], AbsNotFoundException)
+
+
+def test_fs_get_abs_many():
+    app = Flask("test_get_abs_many")
+    for workers in [4, 0]:
+        app.config["FAN_OUT_MAX_WORKERS"] = workers
+        with app.app_context():
+            _check_many(FsDocMetadataService(LocalObjectStore(ABS_FILES)))
+
+
+def test_fs_get_abs_many_bounded(mocker):
+    app = Flask("test_get_abs_many")
+    app.config["FAN_OUT_MAX_WORKERS"] = 8
+    app.config["ABS_MANY_MAX_IN_FLIGHT"] = 2
+    service = FsDocMetadataService(LocalObjectStore(ABS_FILES))
+    lock = threading.Lock()
+    running = [0, 0]  # now, max
+
+    def get_abs(id):
+        assert current_app.config["ABS_MANY_MAX_IN_FLIGHT"] == 2, "should run in the app context"
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return id
+
+    mocker.patch.object(service, "get_abs", side_effect=get_abs)
+    ids = [f"0704.{n:04}" for n in range(1, 11)]
+    with app.app_context():
+        assert service.get_abs_many(ids) == {id: id for id in ids}
+    assert running[1] <= 2
+
+
+def test_fs_get_abs_many_raises_unexpected(mocker):
+    app = Flask("test_get_abs_many")
+    app.config["FAN_OUT_MAX_WORKERS"] = 4
+    service = FsDocMetadataService(LocalObjectStore(ABS_FILES))
+    mocker.patch.object(service, "get_abs", side_effect=OSError("store is down"))
+    with app.app_context():
+        with pytest.raises(OSError):
+            service.get_abs_many(['0704.0001', '0704.0002'])
+
+
+def test_db_get_abs_many(app_with_db):
+    with app_with_db.app_context():
+        service = get_doc_service()
+        found = service.get_abs_many(['0906.2112', '0906.2112', '0704.9999'])
+        assert found['0906.2112'].arxiv_id_v == service.get_abs('0906.2112').arxiv_id_v
+        assert isinstance(found['0704.9999'], AbsNotFoundException)
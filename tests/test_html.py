@@ -141,3 +141,31 @@ def test_html_headers(client_with_test_fs):
     assert "paper-id-cs/9904010" in head
     assert "html-native" in head
     assert "html-latexml" not in head
+
+
+def test_html_manifest_cached(client_with_test_fs, mocker):
+    """The file listing of a native HTML paper is done once for the landing page and its files."""
+    from browse.services.dissemination import get_article_store
+    store = get_article_store()
+    assert store.html_manifests is not None
+    listing = mocker.spy(store.cache_store, "list")
+
+    for path in ["/html/cs/9904010", "/html/cs/9904010v1", "/html/cs/9904010/report.htm",
+                 "/html/cs/9904010/graph1.gif"]:
+        assert client_with_test_fs.get(path).status_code == 200
+    assert client_with_test_fs.get("/html/cs/9904010/shouldnotexist.html").status_code == 404
+    assert listing.call_count == 1
+
+    manifest = store.html_manifests.get("cs/9904010v1", None, "", lambda: [])
+    assert manifest.files == [], "a different modified time should list again"
+
+
+def test_html_manifest_empty_not_cached(mocker):
+    from datetime import datetime
+    from browse.services.dissemination.html_manifest import HtmlManifestCache
+    manifests = HtmlManifestCache(10)
+    modified = datetime(2024, 3, 1)
+    list_files = mocker.Mock(return_value=[])
+    assert manifests.get("2403.10561v1", modified, "", list_files).files == []
+    assert manifests.get("2403.10561v1", modified, "", list_files).files == []
+    assert list_files.call_count == 2, "an empty manifest should be listed again"
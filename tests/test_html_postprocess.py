@@ -16,3 +16,51 @@ def test_post_process_html(app_with_test_fs):
         assert b"/abs/0705.0001" in pphtml
         assert b"""[<a href="/pdf/0705.0001" title="Download PDF" id="pdf-0705.0001" aria-labelledby="pdf-0705.0001">pdf</a>, <a href="/format/0705.0001" title="Other formats" id="oth-0705.0001" aria-labelledby="oth-0705.0001">other</a>]\n""" \
                in pphtml
+
+
+def test_post_process_html_batch(app_with_test_fs, mocker):
+    """All the directives are resolved once, before the lines are transformed."""
+    from browse.services import html_processing
+    with app_with_test_fs.test_request_context():
+        resolve = mocker.spy(html_processing, "resolve_directives")
+        html = (b"<h1>Proceedings</h1>\n"
+                b"LIST:0705.0001\n"
+                b"ABS:0704.0001\n"
+                b"LIST:0705.0001\n"
+                b"LIST:arXiv:2401.00907\n")
+        pphtml = post_process_html(html)
+        assert resolve.call_count == 1
+        assert set(resolve.spy_return.keys()) == {"0705.0001", "0704.0001", "arXiv:2401.00907"}
+        assert pphtml.count(b"/abs/0705.0001") >= 2
+        assert b"/abs/0704.0001" in pphtml
+        assert b"LIST:arXiv:2401.00907\n" in pphtml
+        assert pphtml.startswith(b"<h1>Proceedings</h1>\n")
+
+
+def test_post_processed_page_cache(client_with_test_fs, mocker):
+    from browse.services import html_processing
+    process = mocker.spy(html_processing, "post_process_html")
+    resp = client_with_test_fs.get("/html/2403.10561")
+    assert resp.status_code == 200
+    resp = client_with_test_fs.get("/html/2403.10561v1")
+    assert resp.status_code == 200 and b"Human-Centric" in resp.data
+    assert process.call_count == 1
+
+
+def test_post_processed_html_without_directives(app_with_test_fs, mocker, tmp_path):
+    """A file without directives is sent as is and only scanned once."""
+    from arxiv.files.object_store import LocalObjectStore
+    from browse.services import html_processing
+    html = b"<html><body>\n<p>LIST:0705.0001 is not at the start of a line</p>\n</body></html>\n"
+    (tmp_path / "paper.html").write_bytes(html)
+    fileobj = LocalObjectStore(str(tmp_path)).to_obj("paper.html")
+    process = mocker.spy(html_processing, "post_process_html")
+    with app_with_test_fs.test_request_context():
+        page = html_processing.PostProcessedHTML(fileobj)
+        assert page.size == len(html)
+        with page.open('rb') as fh:
+            assert fh.read() == html
+        assert process.call_count == 0
+        scan = mocker.spy(html_processing, "has_directives")
+        assert html_processing.PostProcessedHTML(fileobj).size == len(html)
+        assert scan.call_count == 0, "the scan should be cached"
@@ -0,0 +1,75 @@
+from browse.services.html_processing.scaffold import BrandedHTMLRewriter
+
+FRAGMENTS = {
+    'head_mixins': b'[HEAD_MIXINS]',
+    'header': b'[HEADER]',
+    'callout_license': b'[LICENSE]',
+    'footer': b'[FOOTER]',
+}
+
+LATEXML_HTML = b"""<!DOCTYPE html><html lang="en">
+<head>
+<meta charset="utf-8">
+<link rel="stylesheet" href="https://arxiv.org/static/browse/0.3.4/css/ar5iv.css">
+</head>
+<body>
+<div class="ltx_page_main">
+<div class="ltx_page_content">
+<article class="ltx_document">
+<p>Lots of math &lt;footer is not a footer</p>
+</article>
+</div>
+<footer class="ltx_page_footer">
+<div class="ltx_page_logo">Generated by LaTeXML</div>
+</footer>
+</div>
+</body>
+</html>
+"""
+
+EXPECTED = b"""<!DOCTYPE html><html lang="en">
+<head>
+<meta charset="utf-8">
+<link rel="stylesheet" href="https://arxiv.org/static/browse/0.3.4/css/ar5iv.css">
+[HEAD_MIXINS]</head>
+<body>
+[HEADER]<div class="ltx_page_main">
+[LICENSE]<div class="ltx_page_content">
+<article class="ltx_document">
+<p>Lots of math &lt;footer is not a footer</p>
+</article>
+</div>
+</div>
+[FOOTER]</body>
+</html>
+"""
+
+
+def _rewrite(html: bytes, block_size: int) -> bytes:
+    rewriter = BrandedHTMLRewriter(FRAGMENTS)
+    out = [rewriter.feed(html[i:i + block_size]) for i in range(0, len(html), block_size)]
+    out.append(rewriter.finish())
+    return b''.join(out)
+
+
+def test_branding_any_block_size():
+    for block_size in [1, 2, 7, 64, len(LATEXML_HTML)]:
+        assert _rewrite(LATEXML_HTML, block_size) == EXPECTED, f"block size {block_size}"
+
+
+def test_branding_lines():
+    rewriter = BrandedHTMLRewriter(FRAGMENTS)
+    out = b''.join(rewriter.feed(line) for line in LATEXML_HTML.splitlines(keepends=True))
+    assert out + rewriter.finish() == EXPECTED
+    assert rewriter.state == 'body_end'
+
+
+def test_no_trailing_newline():
+    html = LATEXML_HTML.rstrip(b'\n')
+    assert _rewrite(html, 1024) == EXPECTED.rstrip(b'\n')
+
+
+def test_legacy_html_not_rewritten():
+    html = LATEXML_HTML.replace(
+        b'</head>', b'<script src="https://arxiv.org/static/browse/0.3.4/js/addons_new.js"></script>\n</head>')
+    assert _rewrite(html, 16) == html
@@ -0,0 +1,67 @@
+"""Tests for the in-process institution IP index."""
+import ipaddress
+
+import pytest
+
+from browse.services import database
+from browse.services.database import institution_ip_index
+from browse.services.database.institution_ip_index import InstitutionIPIndex
+
+
+def _ip(ip):
+    return int(ipaddress.ip_address(ip))
+
+
+RANGES = [
+    (3, 'Cornell University', _ip('128.84.0.0'), _ip('128.84.255.255'), False),
+    (3, 'Cornell University', _ip('128.84.10.1'), _ip('128.84.10.10'), True),
+    (4, 'Other University', _ip('128.84.10.5'), _ip('128.84.10.20'), False),
+    (5, 'Excluded Only', _ip('10.0.0.0'), _ip('10.0.0.255'), True),
+    (6, 'IPv6 University', _ip('2001:db8::'), _ip('2001:db8::ffff'), False),
+]
+
+
+def test_lookup():
+    index = InstitutionIPIndex(RANGES)
+    assert index.lookup('128.84.0.0') == (3, 'Cornell University')
+    assert index.lookup('128.84.255.255') == (3, 'Cornell University')
+    assert index.lookup('128.84.10.1') is None
+    assert index.lookup('128.84.10.5') == (4, 'Other University')
+    assert index.lookup('128.84.10.11') == (3, 'Cornell University'), "lowest id should be used"
+    assert index.lookup('128.84.10.21') == (3, 'Cornell University')
+    assert index.lookup('128.85.0.0') is None
+    assert index.lookup('10.0.0.1') is None
+    assert index.lookup('0.0.0.0') is None
+    assert index.lookup('2001:db8::1') == (6, 'IPv6 University')
+    assert index.lookup('2001:db9::1') is None
+    assert index.lookup('::ffff:128.84.0.1') == (3, 'Cornell University')
+    assert index.lookup('::8054:1') is None, "IPv6 should not match IPv4 ranges"
+    with pytest.raises(ValueError):
+        index.lookup('notanip')
+
+
+def test_matches_db_query(app_with_db):
+    with app_with_db.app_context():
+        ips = ['128.84.0.0', '128.84.10.1', '128.84.10.5', '128.84.12.34', '128.85.12.34']
+        indexed = [database.get_institution(ip) for ip in ips]
+        assert institution_ip_index._index is not None
+        app_with_db.config['INSTITUTION_IP_INDEX_TTL'] = 0
+        assert indexed == [database.get_institution(ip) for ip in ips]
+
+
+def test_refresh(app_with_db, mocker):
+    with app_with_db.app_context():
+        first = institution_ip_index.get_institution_index()
+        assert institution_ip_index.get_institution_index() is first
+
+        mocker.patch.object(institution_ip_index, 'load_institution_ip_index',
+                            side_effect=RuntimeError('DB down'))
+        institution_ip_index._loaded -= app_with_db.config['INSTITUTION_IP_INDEX_TTL'] + 1
+        assert institution_ip_index.get_institution_index() is first, \
+            "the old index should be kept when a refresh fails"
+
+        mocker.patch.object(institution_ip_index, 'load_institution_ip_index',
+                            return_value=InstitutionIPIndex(RANGES))
+        assert institution_ip_index.get_institution_index() is first, "refreshed too soon"
+        institution_ip_index._loaded -= app_with_db.config['INSTITUTION_IP_INDEX_TTL'] + 1
+        assert institution_ip_index.get_institution_index() is not first
@@ -0,0 +1,52 @@
+"""Tests for the in-process LaTeXML status cache."""
+from datetime import datetime, timezone
+
+from browse.services import database
+from browse.services.database import latexml_status
+
+
+class _Listed:
+    def __init__(self, arxiv_id, version):
+        self.arxiv_id = arxiv_id
+        self.version = version
+
+    def highest_version(self):
+        return self.version
+
+
+def test_matches_db_query(app_with_db):
+    with app_with_db.app_context():
+        lookups = [('0906.2112', 3), ('0906.2112', 1), ('0906.5132', 4), ('2310.08262', 1)]
+        listed = [_Listed(*key) for key in lookups]
+        cached = ([database.get_latexml_status_for_document(*key) for key in lookups],
+                  [database.get_latexml_publish_dt(*key) for key in lookups],
+                  database.get_latexml_statuses_for_listings(listed))
+        assert latexml_status._cache is not None
+        app_with_db.config['LATEXML_STATUS_CACHE_SIZE'] = 0
+        assert cached == ([database.get_latexml_status_for_document(*key) for key in lookups],
+                          [database.get_latexml_publish_dt(*key) for key in lookups],
+                          database.get_latexml_statuses_for_listings(listed))
+        assert cached[0] == [1, None, 1, 1]
+        assert cached[1][0] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert cached[2] == {('0906.2112', 3): 1, ('0906.5132', 4): 1, ('2310.08262', 1): 1}
+
+
+def test_one_query_per_miss(app_with_db, mocker):
+    with app_with_db.app_context():
+        load = mocker.spy(latexml_status, 'load_latexml_records')
+        assert database.get_latexml_status_for_document('0906.2112', 3) == 1
+        assert database.get_latexml_publish_dt('0906.2112', 3) == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert load.call_count == 1, "abs page lookups should share one query"
+
+        listed = [_Listed('0906.2112', 3), _Listed('2310.08262', 1), _Listed('1234.5678', 1)]
+        database.get_latexml_statuses_for_listings(listed)
+        assert load.call_count == 2
+        assert list(load.call_args.args[0]) == [('2310.08262', 1), ('1234.5678', 1)], \
+            "only the missing papers should be queried"
+        database.get_latexml_statuses_for_listings(listed)
+        assert database.get_latexml_status_for_document('1234.5678', 1) is None
+        assert load.call_count == 2, "papers without a row should be cached too"
+
+        stats = latexml_status.get_latexml_status_cache().stats()
+        assert stats['misses'] == 3
+        assert stats['hit_rate'] == stats['hits'] / (stats['hits'] + stats['misses'])
@@ -61,8 +61,9 @@ def test_repec_item_format(client_with_test_fs):
     provides the app context get_doc_service() needs and has this paper.
     """
     from browse.controllers import repec
+    from browse.services.documents import get_doc_service
 
-    out = repec._item("1607.08199")
+    out = repec._item("1607.08199", get_doc_service().get_abs("1607.08199"))
     assert out is not None
     lines = out.splitlines()
 
@@ -83,8 +84,9 @@ def test_repec_item_format(client_with_test_fs):
 def test_repec_item_abstract_wrapping(client_with_test_fs):
     """Abstract wraps at 80 columns with 2-space-indented continuation lines."""
     from browse.controllers import repec
+    from browse.services.documents import get_doc_service
 
-    out = repec._item("1607.08199")
+    out = repec._item("1607.08199", get_doc_service().get_abs("1607.08199"))
     lines = out.splitlines()
 
     abs_idx = next(i for i, ln in enumerate(lines) if ln.startswith("Abstract:"))
@@ -102,3 +104,11 @@ def test_repec_item_abstract_wrapping(client_with_test_fs):
     for ln in cont:
         assert ln.startswith("  "), "continuation lines indented by two spaces"
         assert len(ln) <= 80, f"line exceeds 80 columns: {ln!r}"
+
+
+def test_repec_item_bad_metadata():
+    """A paper get_abs_many returned an exception for is left out."""
+    from arxiv.document.exceptions import AbsNotFoundException
+    from browse.controllers import repec
+
+    assert repec._item("0704.0001", AbsNotFoundException("0704.0001")) is None
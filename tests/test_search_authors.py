@@ -6,6 +6,7 @@ from pathlib import Path
 from arxiv.authors import split_authors
 from arxiv.document.parse_abs import parse_abs_file
 from arxiv.files import LocalFileObj
+from browse.formatting import author_cache
 from browse.formatting.search_authors import queries_for_authors, split_long_author_list
 from tests import path_of_for_test
 
@@ -98,3 +99,22 @@ class TestAuthorLinkCreation(TestCase):
             len(alst[1]), 0, "Back list on 1902.05884 should be empty")
         self.assertEqual(
             alst[2], 0, "Back list size on 1902.05884 should be empty")
+
+
+class TestAuthorCache(TestCase):
+
+    def setUp(self):
+        author_cache._cache = None
+
+    def test_parsed_once(self):
+        f1 = path_of_for_test('data/abs_files/ftp/arxiv/papers/1411/1411.4413.abs')
+        raw = str(parse_abs_file(LocalFileObj(Path(f1))).authors)
+        first = queries_for_authors(raw)
+        self.assertEqual(author_cache.get_author_cache().stats()['misses'], 1)
+        first.clear()
+        self.assertTrue(queries_for_authors(raw), "callers get copies of the cached list")
+        self.assertEqual(author_cache.get_author_cache().stats()['misses'], 1)
+
+        affils = author_cache.authors_affils_utf(raw)
+        affils[0].append('changed')
+        self.assertNotIn('changed', author_cache.authors_affils_utf(raw)[0])
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from browse.services.single_flight import SingleFlight, coalesce, file_lock
+
+
+def _run_concurrently(flight, key, fn, n):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as ex:
+            errors.append(ex)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    threads, results, errors = _run_concurrently(flight, "k", slow, 5)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+    assert not errors
+    assert flight.coalesced == 4
+
+
+def test_shares_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fails():
+        release.wait(5)
+        raise FileNotFoundError("nope")
+
+    threads, results, errors = _run_concurrently(flight, "k", fails, 3)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert not results
+    assert len(errors) == 3 and all(isinstance(ex, FileNotFoundError) for ex in errors)
+
+
+def test_sequential_calls_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+    assert flight.do("k", lambda: calls.append(1) or 1) == 1
+    assert flight.do("k", lambda: calls.append(1) or 2) == 2
+    assert len(calls) == 2
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: int("x"))
+    assert flight.do("k", lambda: 3) == 3
+
+
+def test_file_lock(tmp_path):
+    with file_lock(str(tmp_path), ("abs", "2101.00001v1"), timeout=1) as locked:
+        assert locked
+        with file_lock(str(tmp_path), ("abs", "2101.00001v1"), timeout=0.05) as again:
+            assert not again
+    with file_lock(str(tmp_path), ("abs", "2101.00001v1"), timeout=1) as locked:
+        assert locked
+
+
+def test_coalesce_with_lock_dir(tmp_path):
+    app = Flask(__name__)
+    app.config["SINGLE_FLIGHT_LOCK_DIR"] = str(tmp_path)
+    with app.app_context():
+        assert coalesce("abs", "2101.00001v1", lambda: "docmeta") == "docmeta"
+    assert list(tmp_path.iterdir())
+    assert coalesce("abs", "2101.00001v1", lambda: "no app") == "no app"
+
+
+def test_nested_coalesce_takes_one_lock(tmp_path, monkeypatch):
+    from browse.services import single_flight
+    monkeypatch.setattr(single_flight, "LOCK_STRIPES", 1)  # every key on the same lock file
+    app = Flask(__name__)
+    app.config["SINGLE_FLIGHT_LOCK_DIR"] = str(tmp_path)
+    app.config["SINGLE_FLIGHT_LOCK_TIMEOUT"] = 5
+    with app.app_context():
+        start = time.monotonic()
+        result = coalesce("dissemination", ("2101.00001v1", "pdf"),
+                          lambda: coalesce("abs", "2101.00001v1", lambda: "docmeta"))
+        assert result == "docmeta"
+        assert time.monotonic() - start < 1, "nested call should not wait on the outer lock"
+        with file_lock(str(tmp_path), "other", timeout=0.05) as locked:
+            assert locked, "lock should be released"
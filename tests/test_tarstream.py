@@ -70,3 +70,35 @@ You should see the Greek word 'kosme':       "κόσμε"
     assert members[0].size == fileobj.size
     assert member_data
     assert type(member_data[0]) == str and member_data[0] == data
+
+
+def _files():
+    import random
+    rnd = random.Random(1)
+    return [MockStringFileObj("a.txt", "x" * 300_001),
+            MockStringFileObj("empty.txt", ""),
+            MockStringFileObj("b.txt", "".join(rnd.choice("abc\n") for _ in range(200_000)))]
+
+
+def _members(data: bytes, mode: str):
+    with tarfile.open(fileobj=io.BytesIO(data), mode=mode) as tar:
+        return {member.name: tar.extractfile(member).read() for member in tar.getmembers()}
+
+
+def test_tar_stream_options():
+    files = _files()
+    expected = {fileobj.name: fileobj.open("rb").read() for fileobj in files}
+    for workers in [1, 3]:
+        data = b"".join(tar_stream_gen(files, workers=workers, chunk_size=64 * 1024))
+        assert _members(data, "r:gz") == expected
+
+    data = b"".join(tar_stream_gen(files, compress=False, chunk_size=64 * 1024))
+    assert len(data) % tarfile.RECORDSIZE == 0
+    assert _members(data, "r:") == expected
+
+
+def test_parallel_gzip_members():
+    files = _files()
+    chunks = list(tar_stream_gen(files, workers=4, chunk_size=64 * 1024))
+    assert len(chunks) > 4
+    assert all(chunk[:2] == b"\x1f\x8b" for chunk in chunks), "each chunk should be a gzip member"
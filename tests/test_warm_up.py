@@ -0,0 +1,44 @@
+"""Tests for the warm up and the readiness route."""
+from browse.factory import create_web_app
+from browse import warm_up
+from tests.conftest import test_config
+
+
+def _conf(loaded_db_copy, **kwargs):
+    conf = test_config()
+    conf.update({"CLASSIC_DB_URI": loaded_db_copy[0], "LATEXML_DB_URI": loaded_db_copy[1]})
+    conf.update(kwargs)
+    return conf
+
+
+def test_ready_without_warm_up(loaded_db_copy, reset_packages):
+    app = create_web_app(**_conf(loaded_db_copy))
+    resp = app.test_client().get('/ready')
+    assert resp.status_code == 200
+    assert resp.json == {"warm_up": "off"}
+    assert 'no-store' in resp.headers['Cache-Control']
+
+
+def test_warm_up_on_start(loaded_db_copy, reset_packages):
+    app = create_web_app(**_conf(loaded_db_copy, WARM_UP_ON_START=True))
+    from browse.services import dissemination
+    assert dissemination._article_store is not None
+    assert app.jinja_env.cache, "templates should be compiled"
+
+    resp = app.test_client().get('/ready')
+    assert resp.status_code == 200
+    assert set(resp.json['timings']) == {name for name, _ in warm_up.STEPS}
+    assert resp.json['failed'] == {}
+
+
+def test_not_ready_until_failed_step_works(loaded_db_copy, reset_packages, mocker):
+    broken = mocker.Mock(side_effect=[RuntimeError("no bucket"), RuntimeError("no bucket"), None])
+    mocker.patch.object(warm_up, 'STEPS', [("article_store", broken)])
+    app = create_web_app(**_conf(loaded_db_copy, WARM_UP_ON_START=True))
+    client = app.test_client()
+
+    resp = client.get('/ready')
+    assert resp.status_code == 503
+    assert "no bucket" in resp.json['failed']['article_store']
+    assert client.get('/ready').status_code == 200
+    assert broken.call_count == 3
@@ -10,6 +10,14 @@ logger = logging.getLogger(__file__)
 # Double underscores excludes this from * imports.
 __flask_app__ = None
 
+# When warming up is asked for in the OS environment, build and warm up the
+# app as the module is imported, before the server gives the worker any
+# requests. Otherwise the app is made on the first request so that Apache
+# SetEnv values in the environ can be used.
+if os.environ.get("WARM_UP_ON_START", "").lower() in ("1", "true", "yes", "on"):
+    from browse.factory import create_web_app
+    __flask_app__ = create_web_app()
+
 
 def application(environ, start_response):
     """WSGI application, called once for each HTTP request.